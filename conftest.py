@@ -0,0 +1 @@
+pytest_plugins = ["palenso.utils.nplusone_pytest"]
@@ -0,0 +1,188 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from sentry_sdk import capture_exception
+
+from palenso.analytics.ingest import ingest
+from palenso.utils.ip_address import get_client_ip
+from palenso.utils.metrics import REGISTRY
+
+EVENTS = REGISTRY.counter(
+    "palenso_analytics_events_total",
+    "Activity events by outcome: flushed from a worker's buffer, dropped "
+    "because the buffer was full, or kept for a retry after a failed flush",
+    ("outcome",),
+)
+
+
+class DatabaseSink:
+    """Each worker writes its own batches, used without Redis"""
+
+    def write(self, events):
+        close_old_connections()
+        try:
+            return ingest(events)
+        finally:
+            close_old_connections()
+
+    def drain(self, batch_size):
+        return 0
+
+
+class RedisSink:
+    """Workers queue their batches in a Redis list and the flush_activity
+    task writes them, so only the scheduler writes to the database"""
+
+    KEY = "analytics:events"
+
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+
+    def write(self, events):
+        self.client.rpush(self.KEY, *[json.dumps(event) for event in events])
+        return 0
+
+    def drain(self, batch_size):
+        """Write the queued events, ``batch_size`` per transaction; returns
+        how many were written"""
+        written = 0
+        while True:
+            pipeline = self.client.pipeline()
+            pipeline.lrange(self.KEY, 0, batch_size - 1)
+            pipeline.ltrim(self.KEY, batch_size, -1)
+            items, _ = pipeline.execute()
+            if not items:
+                return written
+            try:
+                written += ingest([tuple(json.loads(item)) for item in items])
+            except Exception:
+                # Back at the head of the queue for the next run
+                self.client.lpush(self.KEY, *reversed(items))
+                raise
+
+
+class ActivityBuffer:
+    """Events recorded on the request path, held in this process until a
+    background thread hands them to the sink every
+    ``ANALYTICS_FLUSH_INTERVAL`` seconds, or sooner once
+    ``ANALYTICS_FLUSH_SIZE`` are waiting
+
+    Recording is an append to a deque, with no I/O. Events still buffered
+    when a worker is killed are lost, which analytics can afford.
+    """
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.events = deque()
+        self.wakeup = threading.Event()
+        self.lock = threading.Lock()
+        self.pid = None
+
+    def record(self, target_type, target_id, action, visitor):
+        if self.pid != os.getpid():
+            self.start()
+        events = self.events
+        if len(events) >= settings.ANALYTICS_BUFFER_LIMIT:
+            EVENTS.inc(outcome="dropped")
+            return
+        events.append((time.time(), target_type, str(target_id), action, visitor))
+        if len(events) >= settings.ANALYTICS_FLUSH_SIZE:
+            self.wakeup.set()
+
+    def start(self):
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            if self.pid is None:
+                atexit.register(self.flush)
+            else:
+                # A forked worker inherits the parent's events but not its
+                # thread; the parent flushes them
+                self.events.clear()
+            self.pid = os.getpid()
+            threading.Thread(target=self.run, name="analytics-flush", daemon=True).start()
+
+    def run(self):
+        while True:
+            self.wakeup.wait(settings.ANALYTICS_FLUSH_INTERVAL)
+            self.wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """Hand the waiting events to the sink in batches; returns how many
+        it wrote to the database"""
+        written = 0
+        while self.events:
+            batch = []
+            try:
+                while len(batch) < settings.ANALYTICS_FLUSH_SIZE:
+                    batch.append(self.events.popleft())
+            except IndexError:
+                pass
+            try:
+                written += self.sink.write(batch)
+            except Exception as e:
+                capture_exception(e)
+                # Retried at the next flush, bounded by ANALYTICS_BUFFER_LIMIT
+                self.events.extendleft(reversed(batch))
+                EVENTS.inc(len(batch), outcome="retried")
+                break
+            EVENTS.inc(len(batch), outcome="flushed")
+        return written
+
+
+_buffer = None
+
+
+def get_buffer():
+    """Buffer handing batches to Redis when ``ANALYTICS_REDIS_URL`` is set,
+    to the database otherwise"""
+    global _buffer
+    if _buffer is None:
+        if settings.ANALYTICS_REDIS_URL:
+            sink = RedisSink(settings.ANALYTICS_REDIS_URL)
+        else:
+            sink = DatabaseSink()
+        _buffer = ActivityBuffer(sink)
+    return _buffer
+
+
+def record(target_type, target_id, action, visitor):
+    get_buffer().record(target_type, target_id, action, visitor)
+
+
+def visitor_key(request):
+    """The user's id, or for anonymous visitors a keyed hash of the client
+    IP and user agent, which tells them apart without storing either"""
+    if request.user.is_authenticated:
+        return str(request.user.pk)
+    raw = f"{get_client_ip(request)}|{request.META.get('HTTP_USER_AGENT', '')}"
+    digest = hashlib.blake2b(
+        raw.encode(), key=settings.SECRET_KEY.encode()[:64], digest_size=16
+    ).hexdigest()
+    return f"anon:{digest}"
+
+
+def record_view(request, target_type, target_id):
+    """Count a view of a job or event; never fails the request"""
+    try:
+        record(target_type, target_id, "view", visitor_key(request))
+    except Exception as e:
+        capture_exception(e)
+
+
+def flush_activity():
+    """Write this process's buffer and the batches other workers queued in
+    Redis; returns how many events were written"""
+    buffer = get_buffer()
+    return buffer.flush() + buffer.sink.drain(settings.BGTASKS_BATCH_SIZE)
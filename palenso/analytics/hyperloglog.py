@@ -0,0 +1,53 @@
+import hashlib
+import math
+import zlib
+
+# 4096 registers: about 1.6% standard error, and a few bytes stored for a
+# target with few visitors since the registers are compressed
+PRECISION = 12
+
+
+def _hash(value):
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    """Approximate count of distinct strings in fixed memory
+
+    Two sketches merge by keeping the larger of each register, so the
+    visitors of several hours or days are counted without storing them.
+    """
+
+    def __init__(self, registers=None, precision=PRECISION):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(registers) if registers else bytearray(self.size)
+
+    @classmethod
+    def from_bytes(cls, data, precision=PRECISION):
+        return cls(zlib.decompress(data) if data else None, precision)
+
+    def to_bytes(self):
+        return zlib.compress(bytes(self.registers))
+
+    def add(self, value):
+        x = _hash(value)
+        bits = 64 - self.precision
+        index = x >> bits
+        # Position of the first set bit in the remaining bits
+        rank = bits - (x & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, other):
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self):
+        size = self.size
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if zeros and estimate <= 2.5 * size:
+            # Linear counting is more accurate for small cardinalities
+            estimate = size * math.log(size / zeros)
+        return round(estimate)
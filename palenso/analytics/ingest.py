@@ -0,0 +1,125 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from palenso.analytics.hyperloglog import HyperLogLog
+from palenso.db.models import ActivityEvent, ActivityRollup
+
+# Rollup rows locked and read per query
+ROLLUP_CHUNK_SIZE = 500
+# Writers in other workers may create the same new rollup rows
+MAX_ATTEMPTS = 3
+
+
+def hour_bucket(moment):
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def day_bucket(moment):
+    """Midnight of ``moment``'s day in ``TIME_ZONE``"""
+    return timezone.localtime(moment).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+BUCKETS = {"hour": hour_bucket, "day": day_bucket}
+
+
+def aggregate(events):
+    """``{(granularity, bucket, target type, target id, action): [count,
+    sketch]}`` of buffered ``(timestamp, target type, target id, action,
+    visitor)`` events"""
+    groups = {}
+    for timestamp, target_type, target_id, action, visitor in events:
+        moment = datetime.fromtimestamp(timestamp, dt_timezone.utc)
+        for granularity, bucket in BUCKETS.items():
+            key = (granularity, bucket(moment), target_type, target_id, action)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = [0, HyperLogLog()]
+            group[0] += 1
+            group[1].add(visitor)
+    return groups
+
+
+def _rollup_key(rollup):
+    return (
+        rollup.granularity,
+        rollup.bucket,
+        rollup.target_type,
+        str(rollup.target_id),
+        rollup.action,
+    )
+
+
+def merge_rollups(groups):
+    """Add aggregated groups to their rollup rows, creating missing ones;
+    run inside a transaction"""
+    # Locking in key order keeps concurrent writers from deadlocking
+    keys = sorted(groups)
+    changed, created = [], []
+    for start in range(0, len(keys), ROLLUP_CHUNK_SIZE):
+        chunk = keys[start : start + ROLLUP_CHUNK_SIZE]
+        existing = {
+            _rollup_key(rollup): rollup
+            for rollup in ActivityRollup.objects.select_for_update()
+            .filter(
+                granularity__in={key[0] for key in chunk},
+                bucket__in={key[1] for key in chunk},
+                target_id__in={key[3] for key in chunk},
+            )
+            .order_by("pk")
+        }
+        for key in chunk:
+            count, sketch = groups[key]
+            rollup = existing.get(key)
+            if rollup is None:
+                granularity, bucket, target_type, target_id, action = key
+                rollup = ActivityRollup(
+                    granularity=granularity,
+                    bucket=bucket,
+                    target_type=target_type,
+                    target_id=target_id,
+                    action=action,
+                )
+                created.append(rollup)
+            else:
+                sketch.update(HyperLogLog.from_bytes(rollup.visitors))
+                changed.append(rollup)
+            rollup.count += count
+            rollup.unique_visitors = sketch.count()
+            rollup.visitors = sketch.to_bytes()
+    ActivityRollup.objects.bulk_update(
+        changed, ["count", "unique_visitors", "visitors"], batch_size=ROLLUP_CHUNK_SIZE
+    )
+    ActivityRollup.objects.bulk_create(created, batch_size=ROLLUP_CHUNK_SIZE)
+
+
+def ingest(events):
+    """Write buffered events and add them to the hourly and daily rollups
+    in one transaction; returns how many were written"""
+    if not events:
+        return 0
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            with transaction.atomic():
+                ActivityEvent.objects.bulk_create(
+                    [
+                        ActivityEvent(
+                            occurred_at=datetime.fromtimestamp(timestamp, dt_timezone.utc),
+                            target_type=target_type,
+                            target_id=target_id,
+                            action=action,
+                            visitor=visitor,
+                        )
+                        for timestamp, target_type, target_id, action, visitor in events
+                    ],
+                    batch_size=settings.BGTASKS_BATCH_SIZE,
+                )
+                # Per attempt, since merging changes the aggregated sketches
+                merge_rollups(aggregate(events))
+            return len(events)
+        except IntegrityError:
+            # Another worker created one of the new rollup rows first
+            if attempt == MAX_ATTEMPTS - 1:
+                raise
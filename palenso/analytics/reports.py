@@ -0,0 +1,62 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from palenso.analytics.hyperloglog import HyperLogLog
+from palenso.db.models import ActivityRollup
+from palenso.db.models.analytics import ACTION_CHOICES
+
+
+# Days reported when no range is given, and the longest range served
+DEFAULT_DAYS = 30
+MAX_DAYS = 366
+
+
+def parse_days(params):
+    """``(start, end)`` dates from ``?start=`` and ``?end=`` (YYYY-MM-DD,
+    both included), ending today and spanning ``DEFAULT_DAYS`` by default;
+    ValueError when invalid"""
+    end = parse_date(params.get("end", "")) if params.get("end") else timezone.localdate()
+    if params.get("start"):
+        start = parse_date(params["start"])
+    else:
+        start = end - timedelta(days=DEFAULT_DAYS - 1) if end else None
+    if start is None or end is None:
+        raise ValueError("start and end must be dates as YYYY-MM-DD")
+    if start > end or (end - start).days >= MAX_DAYS:
+        raise ValueError(f"start must be before end and at most {MAX_DAYS} days apart")
+    return start, end
+
+
+def day_range(start, end):
+    """Aware datetimes bounding the local days ``start`` to ``end``"""
+    tz = timezone.get_current_timezone()
+    return (
+        timezone.make_aware(datetime.combine(start, time.min), tz),
+        timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz),
+    )
+
+
+def activity_summary(target_type, target_id, start, end):
+    """Events and unique visitors per action for one job or event over the
+    days ``start`` to ``end``, merged from the daily rollups"""
+    since, until = day_range(start, end)
+    totals = {action: {"count": 0, "unique": 0} for action, _ in ACTION_CHOICES}
+    sketches = {}
+    for action, count, visitors in ActivityRollup.objects.filter(
+        target_type=target_type,
+        target_id=target_id,
+        granularity="day",
+        bucket__gte=since,
+        bucket__lt=until,
+    ).values_list("action", "count", "visitors"):
+        totals[action]["count"] += count
+        sketch = HyperLogLog.from_bytes(visitors)
+        if action in sketches:
+            sketches[action].update(sketch)
+        else:
+            sketches[action] = sketch
+    for action, sketch in sketches.items():
+        totals[action]["unique"] = sketch.count()
+    return totals
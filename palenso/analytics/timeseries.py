@@ -0,0 +1,194 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from palenso.analytics.reports import day_range
+from palenso.db.models import (
+    ActivityRollup,
+    Event,
+    EventRegistration,
+    Job,
+    JobApplication,
+    JobMetricDay,
+    RoleMetricDay,
+    SavedJob,
+    User,
+)
+from palenso.db.models.job import Interview, Offer
+
+# metric: (model, timestamp field, job lookup, company lookup, filters)
+JOB_METRICS = {
+    "applications": (JobApplication, "created_at", "job_id", "job__company_id", {}),
+    "interviews": (
+        Interview,
+        "created_at",
+        "application__job_id",
+        "application__job__company_id",
+        {},
+    ),
+    "offers": (Offer, "created_at", "application__job_id", "application__job__company_id", {}),
+    "saves": (SavedJob, "created_at", "job_id", "job__company_id", {}),
+}
+
+# metric: (model, timestamp field, role lookup, filters)
+ROLE_METRICS = {
+    # Placeholder users of anonymous event registrations did not sign up
+    "signups": (User, "date_joined", "role", {"is_managed": False}),
+    "applications": (JobApplication, "created_at", "applicant__role", {}),
+    "events": (Event, "created_at", "organizer__role", {}),
+    "registrations": (EventRegistration, "created_at", "participant__role", {}),
+}
+
+# Start of the bucket a day is merged into
+INTERVALS = {
+    "day": lambda day: day,
+    "week": lambda day: day - timedelta(days=day.weekday()),
+    "month": lambda day: day.replace(day=1),
+}
+
+
+def _day_counts(model, field, lookups, filters, since, until):
+    return (
+        model.objects.filter(**filters, **{f"{field}__gte": since, f"{field}__lt": until})
+        .annotate(bucket_day=TruncDate(field, tzinfo=timezone.get_current_timezone()))
+        .values("bucket_day", *lookups)
+        .annotate(total=Count("pk"))
+        .order_by()
+    )
+
+
+def rebuild_days(start, end):
+    """Recount the buckets of the local days ``start`` to ``end`` from the
+    source tables, replacing what they held, in one transaction; returns
+    ``(job buckets, role buckets)`` written"""
+    since, until = day_range(start, end)
+    job_rows = [
+        JobMetricDay(
+            day=row["bucket_day"],
+            company_id=row[company],
+            job_id=row[job],
+            metric=metric,
+            count=row["total"],
+        )
+        for metric, (model, field, job, company, filters) in JOB_METRICS.items()
+        for row in _day_counts(model, field, (job, company), filters, since, until)
+    ]
+    role_rows = [
+        RoleMetricDay(day=row["bucket_day"], role=row[role], metric=metric, count=row["total"])
+        for metric, (model, field, role, filters) in ROLE_METRICS.items()
+        for row in _day_counts(model, field, (role,), filters, since, until)
+    ]
+    with transaction.atomic():
+        JobMetricDay.objects.filter(day__gte=start, day__lte=end).delete()
+        RoleMetricDay.objects.filter(day__gte=start, day__lte=end).delete()
+        JobMetricDay.objects.bulk_create(job_rows, batch_size=settings.BGTASKS_BATCH_SIZE)
+        RoleMetricDay.objects.bulk_create(role_rows, batch_size=settings.BGTASKS_BATCH_SIZE)
+    return len(job_rows), len(role_rows)
+
+
+def refresh_recent():
+    """Recount the last ``METRICS_REFRESH_DAYS`` days, today included"""
+    today = timezone.localdate()
+    return rebuild_days(today - timedelta(days=settings.METRICS_REFRESH_DAYS - 1), today)
+
+
+def first_day():
+    """Local day of the oldest source row, None when there are none"""
+    firsts = [
+        model.objects.aggregate(first=Min(field))["first"]
+        for model, field, *_ in [*JOB_METRICS.values(), *ROLE_METRICS.values()]
+    ]
+    firsts = [first for first in firsts if first is not None]
+    return timezone.localdate(min(firsts)) if firsts else None
+
+
+def backfill(start=None, end=None, chunk_days=None, pause=None):
+    """Rebuild the buckets from ``start`` (the oldest source row by default)
+    to ``end`` (today), newest first, ``chunk_days`` per transaction with a
+    pause in between; yields ``(chunk start, chunk end, buckets written)``"""
+    start = start or first_day()
+    end = end or timezone.localdate()
+    chunk_days = chunk_days or settings.METRICS_BACKFILL_CHUNK_DAYS
+    pause = settings.BGTASKS_BATCH_PAUSE if pause is None else pause
+    if start is None:
+        return
+    chunk_end = end
+    while chunk_end >= start:
+        chunk_start = max(start, chunk_end - timedelta(days=chunk_days - 1))
+        yield chunk_start, chunk_end, sum(rebuild_days(chunk_start, chunk_end))
+        chunk_end = chunk_start - timedelta(days=1)
+        if chunk_end >= start:
+            time.sleep(pause)
+
+
+def merge_buckets(rows, metrics, start, end, interval):
+    """``{metric: {"total": n, "series": [{"date": ..., "count": n}]}}``
+    from ``(metric, day, count)`` rows, merged into ``interval`` buckets
+    over every day from ``start`` to ``end``, empty buckets included"""
+    to_bucket = INTERVALS[interval]
+    buckets = []
+    day = start
+    while day <= end:
+        bucket = to_bucket(day)
+        if not buckets or buckets[-1] != bucket:
+            buckets.append(bucket)
+        day += timedelta(days=1)
+
+    counts = {metric: dict.fromkeys(buckets, 0) for metric in metrics}
+    for metric, day, count in rows:
+        counts[metric][to_bucket(day)] += count
+    return {
+        metric: {
+            "total": sum(series.values()),
+            "series": [{"date": bucket, "count": count} for bucket, count in series.items()],
+        }
+        for metric, series in counts.items()
+    }
+
+
+def job_series(company_id, start, end, interval="day", job_id=None):
+    """Job metrics and views of a company's jobs, or of one of them, from
+    the daily buckets"""
+    buckets = JobMetricDay.objects.filter(company_id=company_id, day__gte=start, day__lte=end)
+    jobs = Job.objects.filter(company_id=company_id).values("pk")
+    if job_id is not None:
+        buckets = buckets.filter(job_id=job_id)
+        jobs = jobs.filter(pk=job_id)
+    rows = list(buckets.values_list("metric", "day").annotate(total=Sum("count")).order_by())
+
+    since, until = day_range(start, end)
+    views = (
+        ActivityRollup.objects.filter(
+            target_type="job",
+            target_id__in=jobs,
+            action="view",
+            granularity="day",
+            bucket__gte=since,
+            bucket__lt=until,
+        )
+        .values_list("bucket")
+        .annotate(total=Sum("count"))
+        .order_by()
+    )
+    rows.extend(("views", timezone.localdate(bucket), total) for bucket, total in views)
+    return merge_buckets(rows, [*JOB_METRICS, "views"], start, end, interval)
+
+
+def role_series(start, end, interval="day", role=None):
+    """``{role: metrics}`` from the daily role buckets"""
+    buckets = RoleMetricDay.objects.filter(day__gte=start, day__lte=end)
+    if role is not None:
+        buckets = buckets.filter(role=role)
+    roles = [role] if role is not None else [value for value, _ in User.ROLE_CHOICES]
+    rows = {bucket_role: [] for bucket_role in roles}
+    for bucket_role, metric, day, count in buckets.values_list("role", "metric", "day", "count"):
+        rows.setdefault(bucket_role, []).append((metric, day, count))
+    return {
+        bucket_role: merge_buckets(role_rows, ROLE_METRICS, start, end, interval)
+        for bucket_role, role_rows in rows.items()
+    }
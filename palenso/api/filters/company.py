@@ -1,10 +1,11 @@
 from django_filters import rest_framework as filters
 from django.db.models import Q
 
+from palenso.api.filters.geo import NearFilterSet
 from palenso.db.models.company import Company
 
 
-class CompanyFilter(filters.FilterSet):
+class CompanyFilter(NearFilterSet):
     name = filters.CharFilter(lookup_expr="icontains")
     location = filters.CharFilter(method="filter_location")
     founded_year = filters.DateFromToRangeFilter()
@@ -28,6 +29,8 @@ class CompanyFilter(filters.FilterSet):
             "country",
             "state",
             "city",
+            "near",
+            "radius",
         ]
 
     def filter_location(self, queryset, name, value):
@@ -1,10 +1,13 @@
 from django_filters import rest_framework as filters
 from django.db.models import Q
 
+from palenso.api.filters.geo import NearFilterSet
 from palenso.db.models.event import Event
+from palenso.utils.facets import Facet
+from palenso.utils.taxonomy import filter_by_terms
 
 
-class EventFilter(filters.FilterSet):
+class EventFilter(NearFilterSet):
     title = filters.CharFilter(lookup_expr="icontains")
     event_type = filters.CharFilter(lookup_expr="iexact")
     location = filters.CharFilter(lookup_expr="icontains")
@@ -17,6 +20,8 @@ class EventFilter(filters.FilterSet):
     registration_fee_min = filters.NumberFilter(field_name="registration_fee", lookup_expr="gte")
     registration_fee_max = filters.NumberFilter(field_name="registration_fee", lookup_expr="lte")
     company_name = filters.CharFilter(field_name="company__name", lookup_expr="icontains")
+    # Comma separated; events must carry every tag
+    tags = filters.CharFilter(method="filter_tags")
 
     class Meta:
         model = Event
@@ -31,4 +36,18 @@ class EventFilter(filters.FilterSet):
             "registration_fee_min",
             "registration_fee_max",
             "company_name",
+            "tags",
+            "near",
+            "radius",
         ]
+
+    def filter_tags(self, queryset, name, value):
+        return filter_by_terms(queryset, "event", value)
+
+
+EVENT_FACETS = [
+    Facet("event_type", "event_type"),
+    Facet("is_virtual", "is_virtual"),
+    Facet("is_registration_required", "is_registration_required"),
+    Facet("tags", "tag_links__term__name", multi_valued=True, limit=20),
+]
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django_filters import rest_framework as filters
+
+from palenso.utils.geo import filter_within, resolve_point
+
+
+class NearFilterSet(filters.FilterSet):
+    """``?near=<place or lat,lon>&radius=<km>`` for models with latitude
+    and longitude columns; places the gazetteer does not know match no
+    rows"""
+
+    near = filters.CharFilter(method="filter_near")
+    radius = filters.NumberFilter(method="filter_radius")
+
+    def filter_near(self, queryset, name, value):
+        point = resolve_point(value)
+        if point is None:
+            return queryset.none()
+        radius = self.form.cleaned_data.get("radius") or settings.GEO_DEFAULT_RADIUS_KM
+        radius = min(max(float(radius), 0), settings.GEO_MAX_RADIUS_KM)
+        return filter_within(queryset, *point, radius)
+
+    def filter_radius(self, queryset, name, value):
+        # Applied by filter_near
+        return queryset
@@ -1,10 +1,15 @@
+from django.conf import settings
 from django_filters import rest_framework as filters
 from django.db.models import Q
 
+from palenso.api.filters.geo import NearFilterSet
 from palenso.db.models.job import Job
+from palenso.utils.currency import get_rate, to_base
+from palenso.utils.facets import Facet
+from palenso.utils.taxonomy import filter_by_terms
 
 
-class JobFilter(filters.FilterSet):
+class JobFilter(NearFilterSet):
     location = filters.CharFilter(lookup_expr="icontains")
     job_type = filters.CharFilter(lookup_expr="iexact")
     experience_level = filters.CharFilter(lookup_expr="iexact")
@@ -12,10 +17,15 @@ class JobFilter(filters.FilterSet):
     is_active = filters.BooleanFilter()
     is_featured = filters.BooleanFilter()
     category = filters.CharFilter(lookup_expr="icontains")
-    salary_min = filters.NumberFilter(field_name="salary_min", lookup_expr="gte")
-    salary_max = filters.NumberFilter(field_name="salary_max", lookup_expr="lte")
+    # Compared in the base currency, converted from ?currency= when given
+    salary_min = filters.NumberFilter(method="filter_salary_min")
+    salary_max = filters.NumberFilter(method="filter_salary_max")
+    currency = filters.CharFilter(method="filter_currency")
     company_name = filters.CharFilter(field_name="company__name", lookup_expr="icontains")
     company_industry = filters.CharFilter(field_name="company__industry", lookup_expr="icontains")
+    # Comma separated; jobs must list every skill, required or preferred
+    skills = filters.CharFilter(method="filter_skills")
+    required_skills = filters.CharFilter(method="filter_required_skills")
 
     class Meta:
         model = Job
@@ -28,6 +38,53 @@ class JobFilter(filters.FilterSet):
             "category",
             "salary_min",
             "salary_max",
+            "currency",
             "company_name",
             "company_industry",
+            "skills",
+            "required_skills",
+            "near",
+            "radius",
         ]
+
+    def _base_salary(self, value):
+        currency = self.form.cleaned_data.get("currency") or settings.BASE_CURRENCY
+        return to_base(value, get_rate(currency))
+
+    def filter_salary_min(self, queryset, name, value):
+        value = self._base_salary(value)
+        if value is None:
+            return queryset.none()
+        return queryset.filter(salary_min_base__gte=value)
+
+    def filter_salary_max(self, queryset, name, value):
+        value = self._base_salary(value)
+        if value is None:
+            return queryset.none()
+        return queryset.filter(salary_max_base__lte=value)
+
+    def filter_currency(self, queryset, name, value):
+        # Applied by the salary filters
+        return queryset
+
+    def filter_skills(self, queryset, name, value):
+        return filter_by_terms(queryset, "job", value)
+
+    def filter_required_skills(self, queryset, name, value):
+        return filter_by_terms(queryset, "job", value, is_required=True)
+
+
+JOB_FACETS = [
+    Facet("job_type", "job_type"),
+    Facet("experience_level", "experience_level"),
+    Facet("is_remote", "is_remote"),
+    Facet("category", "category", limit=20),
+    Facet("company_industry", "company__industry", limit=20),
+    Facet(
+        "skills",
+        "skill_links__term__name",
+        filters=("skills", "required_skills"),
+        multi_valued=True,
+        limit=20,
+    ),
+]
@@ -0,0 +1,20 @@
+from django.db.models import F
+from rest_framework import filters as rest_filters
+
+
+class NullsLastOrderingFilter(rest_filters.OrderingFilter):
+    """``?ordering=`` with empty values last in either direction, so rows
+    without a salary do not lead a sort by pay"""
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            return queryset
+        return queryset.order_by(
+            *(
+                F(field[1:]).desc(nulls_last=True)
+                if field.startswith("-")
+                else F(field).asc(nulls_last=True)
+                for field in ordering
+            )
+        )
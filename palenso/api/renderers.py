@@ -0,0 +1,79 @@
+import decimal
+
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements/base.txt
+    orjson = None
+
+
+class JSONEncoder(encoders.JSONEncoder):
+    """DRF's encoder, but Decimals are written as strings
+
+    Serializers already emit DecimalField values as strings. Raw Decimals only
+    reach the renderer from row projections, and this keeps their output
+    identical to what the serializer would have produced.
+    """
+
+    def default(self, obj):
+        if isinstance(obj, decimal.Decimal):
+            return format(obj, "f")
+        return super().default(obj)
+
+
+def _orjson_default(obj):
+    if isinstance(obj, decimal.Decimal):
+        return format(obj, "f")
+    if isinstance(obj, Promise):
+        return force_str(obj)
+    return JSONEncoder().default(obj)
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """JSONRenderer that encodes with orjson
+
+    orjson writes UUID, datetime, date and time natively and only calls back
+    into Python for Decimal and lazy strings. Indented output (for example
+    ``Accept: application/json; indent=4``) and anything orjson refuses are
+    handed to the stock renderer.
+    """
+
+    encoder_class = JSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_orjson_default, option=orjson.OPT_UTC_Z)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same as the stock renderer: keep the output a strict javascript subset
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
+
+
+class EventStreamRenderer(renderers.BaseRenderer):
+    """Accepts ``Accept: text/event-stream`` in content negotiation
+
+    Event streams are StreamingHttpResponses that bypass renderers, so this
+    only renders error bodies, as JSON.
+    """
+
+    media_type = "text/event-stream"
+    format = "event-stream"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return FastJSONRenderer().render(data)
@@ -0,0 +1,250 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+
+from palenso.utils.instrumentation import timed_serialization
+
+
+class RowProjection:
+    """Builds serializer-shaped dicts straight from ``values_list()`` rows
+
+    Produced by ``DynamicFieldsModelSerializer.get_row_projection``. Values
+    are left as native Python types (UUID, Decimal, datetime) for the
+    renderer to encode, which skips DRF's per-field ``to_representation``.
+    """
+
+    def __init__(self, lookups, annotations, template, converters):
+        self.lookups = lookups
+        self.annotations = annotations
+        self.template = template
+        self.converters = converters
+
+    def apply(self, queryset):
+        if self.annotations:
+            queryset = queryset.annotate(**self.annotations)
+        return queryset.values_list(*self.lookups)
+
+    @timed_serialization
+    def rows(self, rows):
+        converters = self.converters
+        template = self.template
+        result = []
+        for row in rows:
+            if converters:
+                row = list(row)
+                for index, convert in converters:
+                    if row[index] is not None:
+                        row[index] = convert(row[index])
+            result.append(self._build(template, row))
+        return result
+
+    def _build(self, template, row):
+        item = {}
+        for name, spec in template:
+            if isinstance(spec, int):
+                item[name] = row[spec]
+            elif row[spec[0]] is None:
+                # A null foreign key renders as null, like the nested serializer
+                item[name] = None
+            else:
+                item[name] = self._build(spec[1], row)
+        return item
+
+
+class DynamicFieldsModelSerializer(serializers.ModelSerializer):
+    """ModelSerializer whose output can be narrowed per request
+
+    Subclasses declare named field profiles on ``Meta.profiles``. A profile
+    maps to a list of field names, or ``None`` for every field. Nested
+    serializers can be narrowed too, through ``Meta.nested_profiles``
+    (``{"card": {"company": "card"}}``).
+
+    Properties and dotted sources need the columns they read to be listed in
+    ``Meta.field_dependencies`` so ``setup_queryset`` can trim the SQL with
+    ``only()``. If a selected field cannot be resolved to columns, the
+    queryset is left untrimmed so no deferred-field query is issued per row.
+
+    ``Meta.field_projections`` maps computed fields to a callable taking a
+    lookup prefix and returning an ORM expression, which lets
+    ``get_row_projection`` serve them from ``values_list()`` as well.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        profile = kwargs.pop("profile", None)
+        super().__init__(*args, **kwargs)
+        self.restrict(fields=fields, profile=profile)
+
+    def restrict(self, fields=None, profile=None):
+        profiles = getattr(self.Meta, "profiles", {})
+        nested_profiles = getattr(self.Meta, "nested_profiles", {}).get(profile, {})
+
+        selected = None
+        nested_fields = {}
+        if fields:
+            selected = []
+            for name in fields:
+                # "company.name" keeps "company" and narrows the nested serializer
+                head, _, rest = name.partition(".")
+                selected.append(head)
+                if rest:
+                    nested_fields.setdefault(head, []).append(rest)
+        elif profile in profiles:
+            selected = profiles[profile]
+
+        if selected is not None:
+            for name in set(self.fields) - set(selected):
+                self.fields.pop(name)
+
+        for name, field in self.fields.items():
+            if not isinstance(field, DynamicFieldsModelSerializer):
+                continue
+            if name in nested_fields:
+                field.restrict(fields=nested_fields[name])
+            elif name in nested_profiles:
+                field.restrict(profile=nested_profiles[name])
+
+    @classmethod
+    def fields_from_request(cls, request):
+        """Read ``?profile=`` and ``?fields=`` into serializer kwargs"""
+        fields = request.GET.get("fields")
+        profile = request.GET.get("profile")
+        return {
+            "fields": [name.strip() for name in fields.split(",") if name.strip()]
+            if fields
+            else None,
+            "profile": profile if profile in getattr(cls.Meta, "profiles", {}) else None,
+        }
+
+    @classmethod
+    def setup_queryset(cls, queryset, fields=None, profile=None):
+        """Apply select_related()/only() for the fields that will be rendered"""
+        lookups = cls(fields=fields, profile=profile).get_lookups()
+        if lookups is None:
+            return queryset
+
+        columns, related = lookups
+        related.update(column.rsplit("__", 1)[0] for column in columns if "__" in column)
+        if related:
+            queryset = queryset.select_related(*sorted(related))
+        return queryset.only(*columns)
+
+    def get_lookups(self, prefix=""):
+        """Return ``(columns, related)`` needed to render the selected fields,
+        or None if they cannot be determined"""
+        model = self.Meta.model
+        dependencies = getattr(self.Meta, "field_dependencies", {})
+        columns = {prefix + model._meta.pk.name}
+        related = set()
+
+        for name, field in self.fields.items():
+            if field.write_only:
+                continue
+            if name in dependencies:
+                columns.update(prefix + lookup for lookup in dependencies[name])
+                continue
+            if field.source == "*":
+                return None
+
+            head = field.source.split(".")[0]
+            try:
+                model_field = model._meta.get_field(head)
+            except FieldDoesNotExist:
+                return None
+
+            if not model_field.concrete:
+                # Reverse relations and m2m are loaded by their own queries
+                continue
+
+            columns.add(prefix + head)
+            if isinstance(field, DynamicFieldsModelSerializer):
+                nested = field.get_lookups(prefix=f"{prefix}{head}__")
+                if nested is None:
+                    # Fall back to loading the whole related row
+                    related.add(prefix + head)
+                    continue
+                columns.update(nested[0])
+                related.update(nested[1])
+            elif "." in field.source:
+                return None
+
+        # Traversed relations must be selected themselves
+        for column in list(columns):
+            parts = column.split("__")
+            for depth in range(1, len(parts)):
+                columns.add("__".join(parts[:depth]))
+        return columns, related
+
+    @classmethod
+    def get_row_projection(cls, fields=None, profile=None):
+        """Return a RowProjection for the selected fields, or None when some
+        field can only be produced by the serializer"""
+        plan = cls(fields=fields, profile=profile).get_projection_plan()
+        if plan is None:
+            return None
+        return RowProjection(*plan)
+
+    def get_projection_plan(self, prefix="", lookups=None, annotations=None, converters=None):
+        lookups = [] if lookups is None else lookups
+        annotations = {} if annotations is None else annotations
+        converters = [] if converters is None else converters
+
+        model = self.Meta.model
+        projections = getattr(self.Meta, "field_projections", {})
+
+        # The primary key always comes first so a null relation can be spotted
+        template = []
+        pk_index = len(lookups)
+        lookups.append(prefix + model._meta.pk.name)
+
+        for name, field in self.fields.items():
+            if field.write_only:
+                continue
+
+            if name in projections:
+                alias = "{}{}_projection".format(prefix.replace("__", "_"), name)
+                annotations[alias] = projections[name](prefix)
+                template.append((name, len(lookups)))
+                lookups.append(alias)
+                continue
+
+            if "." in field.source or field.source == "*":
+                return None
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                return None
+            if not model_field.concrete:
+                return None
+
+            if isinstance(field, DynamicFieldsModelSerializer):
+                start = len(lookups)
+                nested = field.get_projection_plan(
+                    prefix=f"{prefix}{field.source}__",
+                    lookups=lookups,
+                    annotations=annotations,
+                    converters=converters,
+                )
+                if nested is None:
+                    return None
+                template.append((name, (start, nested[2])))
+                continue
+
+            if isinstance(field, serializers.BaseSerializer):
+                return None
+            if model_field.is_relation and not isinstance(field, PrimaryKeyRelatedField):
+                return None
+
+            if model_field.primary_key:
+                template.append((name, pk_index))
+                continue
+
+            if isinstance(model_field, models.DateTimeField):
+                # Match DRF, which renders datetimes in the current timezone
+                converters.append((len(lookups), timezone.localtime))
+            template.append((name, len(lookups)))
+            lookups.append(prefix + field.source)
+
+        return lookups, annotations, template, converters
@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from palenso.db.models.company import Company
+from palenso.api.serializers.base import DynamicFieldsModelSerializer
 
 
-class CompanySerializer(serializers.ModelSerializer):
+class CompanySerializer(DynamicFieldsModelSerializer):
     """Serializer for Company model"""
     employer_name = serializers.CharField(source="employer.get_full_name", read_only=True)
 
@@ -11,7 +12,16 @@ class CompanySerializer(serializers.ModelSerializer):
         fields = [
             "id", "employer", "employer_name", "name", "description", "industry",
             "company_size", "founded_year", "website", "email", "phone", "country",
-            "state", "city", "address", "logo_url", "banner_image_url", "linkedin",
-            "twitter", "facebook", "is_verified", "is_active", "created_at", "updated_at"
+            "state", "city", "address", "latitude", "longitude", "logo_url",
+            "banner_image_url", "linkedin", "twitter", "facebook", "is_verified",
+            "is_active", "created_at", "updated_at"
         ]
-        read_only_fields = ["id", "employer", "created_at", "updated_at"]
+        read_only_fields = ["id", "employer", "latitude", "longitude", "created_at", "updated_at"]
+        profiles = {
+            "card": ["id", "name", "industry", "city", "country", "logo_url", "is_verified"],
+            "detail": None,
+            "admin": None,
+        }
+        field_dependencies = {
+            "employer_name": ["employer__first_name", "employer__last_name"],
+        }
@@ -1,11 +1,37 @@
+from django.db.models import BooleanField, Case, CharField, F, Value, When
+from django.db.models.functions import Concat
+from django.utils import timezone
 from rest_framework import serializers
 from palenso.db.models.event import Event, EventRegistration
 from palenso.db.models.user import User
+from palenso.api.serializers.base import DynamicFieldsModelSerializer
 from palenso.api.serializers.company import CompanySerializer
 import uuid
 
 
-class EventSerializer(serializers.ModelSerializer):
+def organizer_name_projection(prefix):
+    """SQL equivalent of organizer.get_full_name()"""
+    return Concat(
+        F(f"{prefix}organizer__first_name"),
+        Value(" "),
+        F(f"{prefix}organizer__last_name"),
+        output_field=CharField(),
+    )
+
+
+def is_registration_open_projection(prefix):
+    """SQL equivalent of Event.is_registration_open"""
+    return Case(
+        When(
+            **{f"{prefix}registration_deadline__lte": timezone.now()},
+            then=Value(False),
+        ),
+        default=Value(True),
+        output_field=BooleanField(),
+    )
+
+
+class EventSerializer(DynamicFieldsModelSerializer):
     """Serializer for Event model"""
     company = CompanySerializer(read_only=True)
     company_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
@@ -21,15 +47,38 @@ class EventSerializer(serializers.ModelSerializer):
         fields = [
             "id", "organizer", "organizer_name", "organizer_email", "organizer_phone", "company", "company_id", "title",
             "description", "event_type", "start_date", "end_date", "registration_deadline",
-            "location", "is_virtual", "virtual_meeting_url", "max_participants",
+            "location", "latitude", "longitude", "is_virtual", "virtual_meeting_url", "max_participants",
             "is_registration_required", "registration_fee", "banner_image_url",
             "tags", "requirements", "is_active", "is_featured", "registration_count",
             "is_registration_open", "is_full", "created_at", "updated_at"
         ]
         read_only_fields = [
             "id", "organizer", "organizer_email", "organizer_phone", "created_at", "updated_at", "registration_count",
-            "is_registration_open", "is_full"
+            "is_registration_open", "is_full", "latitude", "longitude"
         ]
+        profiles = {
+            "card": [
+                "id", "title", "event_type", "company", "organizer_name", "start_date",
+                "end_date", "registration_deadline", "location", "is_virtual",
+                "max_participants", "registration_fee", "banner_image_url",
+                "is_featured", "is_registration_open",
+            ],
+            "detail": None,
+            "admin": None,
+        }
+        nested_profiles = {"card": {"company": "card"}}
+        field_dependencies = {
+            "organizer_name": ["organizer__first_name", "organizer__last_name"],
+            "organizer_email": ["organizer__email"],
+            "organizer_phone": ["organizer__mobile_number"],
+            "registration_count": [],
+            "is_registration_open": ["registration_deadline"],
+            "is_full": ["max_participants"],
+        }
+        field_projections = {
+            "organizer_name": organizer_name_projection,
+            "is_registration_open": is_registration_open_projection,
+        }
 
 
 class EventRegistrationSerializer(serializers.ModelSerializer):
@@ -140,3 +189,16 @@ class AnonymousEventRegistrationSerializer(serializers.ModelSerializer):
         )
         
         return registration
+
+
+class EventRegistrationBulkStatusSerializer(serializers.Serializer):
+    """Validates a bulk check-in / attendance update request"""
+
+    MAX_REGISTRATIONS = 5000
+
+    status = serializers.ChoiceField(choices=["attended", "no_show"])
+    registration_ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        max_length=MAX_REGISTRATIONS,
+    )
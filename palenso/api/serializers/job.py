@@ -1,9 +1,26 @@
+from django.db.models import BooleanField, Case, Value, When
+from django.utils import timezone
 from rest_framework import serializers
 from palenso.db.models.job import Job, JobApplication, SavedJob, Interview, Offer
+from palenso.db.models.search import SavedSearch
+from palenso.api.serializers.base import DynamicFieldsModelSerializer
 from palenso.api.serializers.company import CompanySerializer
+from palenso.utils.saved_search import SavedSearchError, normalize_query
 
 
-class JobSerializer(serializers.ModelSerializer):
+def is_expired_projection(prefix):
+    """SQL equivalent of Job.is_expired"""
+    return Case(
+        When(
+            **{f"{prefix}application_deadline__lt": timezone.now().date()},
+            then=Value(True),
+        ),
+        default=Value(False),
+        output_field=BooleanField(),
+    )
+
+
+class JobSerializer(DynamicFieldsModelSerializer):
     """Serializer for Job model"""
     company = CompanySerializer(read_only=True)
     application_count = serializers.ReadOnlyField()
@@ -11,8 +28,33 @@ class JobSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Job
-        fields = "__all__"
-        read_only_fields = ["id", "created_at", "updated_at", "application_count", "is_expired"]
+        # search_matched is bookkeeping for saved search alerts
+        exclude = ["search_matched"]
+        read_only_fields = [
+            "id", "created_at", "updated_at", "application_count", "is_expired",
+            "latitude", "longitude", "salary_min_base", "salary_max_base",
+        ]
+        profiles = {
+            "card": [
+                "id", "title", "company", "job_type", "experience_level", "location",
+                "is_remote", "salary_min", "salary_max", "salary_currency", "category",
+                "application_deadline", "is_expired", "is_featured", "created_at",
+            ],
+            "detail": [
+                "id", "title", "company", "description", "requirements", "responsibilities",
+                "job_type", "experience_level", "location", "is_remote", "salary_min",
+                "salary_max", "salary_currency", "required_skills", "preferred_skills",
+                "category", "application_deadline", "max_applications", "is_active",
+                "is_featured", "application_count", "is_expired", "created_at", "updated_at",
+            ],
+            "admin": None,
+        }
+        nested_profiles = {"card": {"company": "card"}}
+        field_dependencies = {
+            "application_count": [],
+            "is_expired": ["application_deadline"],
+        }
+        field_projections = {"is_expired": is_expired_projection}
 
 
 class JobApplicationSerializer(serializers.ModelSerializer):
@@ -28,7 +70,7 @@ class JobApplicationSerializer(serializers.ModelSerializer):
 class SavedJobSerializer(serializers.ModelSerializer):
     """Serializer for SavedJob model"""
     job = JobSerializer(read_only=True)
-    job_id = serializers.IntegerField(write_only=True)
+    job_id = serializers.UUIDField(write_only=True)
     student_name = serializers.CharField(source="student.get_full_name", read_only=True)
 
     class Meta:
@@ -39,10 +81,26 @@ class SavedJobSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "student", "saved_at"]
 
 
+class SavedSearchSerializer(serializers.ModelSerializer):
+    """Serializer for SavedSearch model; ``query`` takes /api/jobs filter
+    parameters and returns them normalized"""
+
+    class Meta:
+        model = SavedSearch
+        fields = ["id", "name", "query", "alerts_enabled", "created_at", "updated_at"]
+        read_only_fields = ["id", "created_at", "updated_at"]
+
+    def validate_query(self, value):
+        try:
+            return normalize_query(value)
+        except SavedSearchError as e:
+            raise serializers.ValidationError(e.args[0]["query"])
+
+
 class InterviewSerializer(serializers.ModelSerializer):
     """Serializer for Interview model"""
     application = JobApplicationSerializer(read_only=True)
-    application_id = serializers.IntegerField(write_only=True)
+    application_id = serializers.UUIDField(write_only=True)
     interviewer_name = serializers.CharField(source="interviewer.get_full_name", read_only=True)
     candidate_name = serializers.CharField(source="application.applicant.get_full_name", read_only=True)
 
@@ -69,7 +127,8 @@ class OfferSerializer(serializers.ModelSerializer):
         fields = [
             "id", "application", "application_id", "offered_by", "offered_by_name",
             "candidate_name", "position_title", "salary_amount", "salary_currency",
-            "job_type", "start_date", "offer_deadline", "benefits", "terms_conditions",
-            "status", "response_date", "response_notes", "created_at", "updated_at"
+            "salary_amount_base", "job_type", "start_date", "offer_deadline", "benefits",
+            "terms_conditions", "status", "response_date", "response_notes", "created_at",
+            "updated_at"
         ]
-        read_only_fields = ["id", "created_at", "updated_at"]
+        read_only_fields = ["id", "salary_amount_base", "created_at", "updated_at"]
@@ -0,0 +1,20 @@
+from rest_framework import serializers
+
+from palenso.db.models import Notification
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    """Serializer for Notification model"""
+
+    class Meta:
+        model = Notification
+        fields = ["id", "kind", "title", "body", "data", "is_read", "read_at", "created_at"]
+        read_only_fields = fields
+
+
+class MarkNotificationsReadSerializer(serializers.Serializer):
+    """Notification ids to mark read; all unread ones when omitted"""
+
+    ids = serializers.ListField(
+        child=serializers.UUIDField(), required=False, allow_empty=False, max_length=500
+    )
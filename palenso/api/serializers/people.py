@@ -1,9 +1,10 @@
 from rest_framework.serializers import ModelSerializer
 
+from palenso.api.serializers.base import DynamicFieldsModelSerializer
 from palenso.db.models import User
 
 
-class UserSerializer(ModelSerializer):
+class UserSerializer(DynamicFieldsModelSerializer):
     """Serializer for user"""
 
     class Meta:
@@ -0,0 +1,70 @@
+import hashlib
+
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+from palenso.utils.ip_address import get_client_ip
+from palenso.utils.ratelimit import DECISIONS, get_limiter
+
+
+class AuthRateThrottle(BaseThrottle):
+    """Per client IP and per email or mobile number limits for unauthenticated
+    endpoints, configured per ``throttle_scope`` in ``RATE_LIMITS``
+
+    Both keys are checked on every request, so a single address cannot
+    spray many accounts and many addresses cannot hammer one account. A
+    request is counted against every key only when all of them allow it.
+    A key may have a list of rates with different windows, e.g. a burst
+    limit per minute and a cap per hour.
+    """
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def get_keys(self, request, view):
+        keys = [("ip", get_client_ip(request) or "unknown")]
+        try:
+            identifier = request.data.get("email") or request.data.get("mobile_number")
+        except AttributeError:
+            # A JSON body that is not an object
+            identifier = None
+        if identifier:
+            # Hashed so emails and numbers are not stored in Redis
+            normalized = str(identifier).strip().lower().encode()
+            keys.append(("identifier", hashlib.sha256(normalized).hexdigest()))
+        return keys
+
+    def allow_request(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        rates = settings.RATE_LIMITS.get(scope) if scope else None
+        if not rates:
+            return True
+
+        limits, key_types = [], []
+        for key_type, value in self.get_keys(request, view):
+            key_rates = rates.get(key_type) or ()
+            if isinstance(key_rates, str):
+                key_rates = [key_rates]
+            for rate in key_rates:
+                # The limiter keys counters by window length as well
+                limits.append((f"{scope}:{key_type}:{value}", rate))
+                key_types.append(key_type)
+        if not limits:
+            return True
+
+        # A rejected request counts against none of the keys, so requests
+        # rejected for their IP cannot use up an account's limit
+        allowed, waits = get_limiter().hit_all(limits)
+        rejected = {key_type for key_type, wait in zip(key_types, waits) if wait}
+        for key_type in dict.fromkeys(key_types):
+            DECISIONS.inc(
+                scope=scope,
+                key=key_type,
+                decision="rejected" if key_type in rejected else "allowed",
+            )
+        if not allowed:
+            self.wait_seconds = max(waits)
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 
 # Create your urls here.
@@ -7,10 +8,12 @@ from palenso.api.views.authentication import (
     SignUpEndpoint,
     SignOutEndpoint,
     ForgotPasswordEndpoint,
+    AsyncForgotPasswordEndpoint,
     ResetPasswordEndpoint,
     ChangePasswordEndpoint,
     CheckMediumAvailabilityEndpoint,
     RequestMediumVerificationEndpoint,
+    AsyncRequestMediumVerificationEndpoint,
     VerifyMediumEndpoint,
     CheckUserExistenceEndpoint
 )
@@ -32,10 +35,14 @@ from palenso.api.views.company import (
 from palenso.api.views.job import (
     JobListCreateEndpoint, 
     JobDetailEndpoint,
+    JobFacetsEndpoint,
     JobApplicationListCreateEndpoint,
     JobApplicationDetailEndpoint,
+    JobApplicationExportEndpoint,
     SavedJobListCreateEndpoint,
     SavedJobDetailEndpoint,
+    SavedSearchListCreateEndpoint,
+    SavedSearchDetailEndpoint,
     InterviewListCreateEndpoint,
     InterviewDetailEndpoint,
     OfferListCreateEndpoint,
@@ -45,13 +52,47 @@ from palenso.api.views.job import (
 from palenso.api.views.event import (
     EventListCreateEndpoint, 
     EventDetailEndpoint,
+    EventFacetsEndpoint,
     EventRegistrationListCreateEndpoint,
     EventRegistrationDetailEndpoint,
+    EventRegistrationBulkStatusEndpoint,
+    EventRegistrationExportEndpoint,
 )
 
-from palenso.api.views.media import UploadMediaEndpoint
+from palenso.api.views.media import AsyncUploadMediaEndpoint, UploadMediaEndpoint
 
-from palenso.api.views.dashboard import DashboardAnalyticsEndpoint, DashboardInfoEndpoint
+from palenso.api.views.dashboard import (
+    DashboardAnalyticsEndpoint,
+    DashboardInfoEndpoint,
+    DashboardSeriesEndpoint,
+)
+
+from palenso.api.views.metrics import MetricsEndpoint
+
+from palenso.api.views.autocomplete import AutocompleteEndpoint
+
+from palenso.api.views.analytics import EventActivityEndpoint, JobActivityEndpoint
+
+from palenso.api.views.notification import (
+    NotificationDetailEndpoint,
+    NotificationListEndpoint,
+    NotificationMarkReadEndpoint,
+    NotificationUnreadCountEndpoint,
+)
+
+from palenso.api.views.status_events import (
+    AsyncStatusEventsEndpoint,
+    StatusEventsEndpoint,
+    StatusEventStreamEndpoint,
+)
+
+# Endpoints waiting on SMTP, Twilio, S3 or status events get async views
+# under ASGI
+if settings.ASYNC_VIEWS:
+    UploadMediaEndpoint = AsyncUploadMediaEndpoint
+    ForgotPasswordEndpoint = AsyncForgotPasswordEndpoint
+    RequestMediumVerificationEndpoint = AsyncRequestMediumVerificationEndpoint
+    StatusEventsEndpoint = AsyncStatusEventsEndpoint
 
 urlpatterns = [
     # media
@@ -100,13 +141,19 @@ urlpatterns = [
     path("companies/<uuid:company_id>", CompanyProfileDetailEndpoint.as_view()),
     # job
     path("jobs", JobListCreateEndpoint.as_view()),
+    path("jobs/facets", JobFacetsEndpoint.as_view()),
     path("jobs/<uuid:job_id>", JobDetailEndpoint.as_view()),
+    path("jobs/<uuid:target_id>/activity", JobActivityEndpoint.as_view()),
     # job applications
     path("job-applications", JobApplicationListCreateEndpoint.as_view()),
+    path("job-applications/export", JobApplicationExportEndpoint.as_view()),
     path("job-applications/<uuid:application_id>", JobApplicationDetailEndpoint.as_view()),
     # saved jobs
     path("saved-jobs", SavedJobListCreateEndpoint.as_view()),
     path("saved-jobs/<uuid:saved_job_id>", SavedJobDetailEndpoint.as_view()),
+    # saved searches
+    path("saved-searches", SavedSearchListCreateEndpoint.as_view()),
+    path("saved-searches/<uuid:saved_search_id>", SavedSearchDetailEndpoint.as_view()),
     # interviews
     path("interviews", InterviewListCreateEndpoint.as_view()),
     path("interviews/<uuid:interview_id>", InterviewDetailEndpoint.as_view()),
@@ -115,12 +162,29 @@ urlpatterns = [
     path("offers/<uuid:offer_id>", OfferDetailEndpoint.as_view()),
     # event
     path("events", EventListCreateEndpoint.as_view()),
+    path("events/facets", EventFacetsEndpoint.as_view()),
     path("events/<uuid:event_id>", EventDetailEndpoint.as_view()),
+    path("events/<uuid:target_id>/activity", EventActivityEndpoint.as_view()),
     # event registrations
     path("event-registrations", EventRegistrationListCreateEndpoint.as_view()),
+    path("event-registrations/bulk-status", EventRegistrationBulkStatusEndpoint.as_view()),
+    path("event-registrations/export", EventRegistrationExportEndpoint.as_view()),
     path("event-registrations/<uuid:registration_id>", EventRegistrationDetailEndpoint.as_view()),
     # analytics
     path("dashboard-analytics", DashboardAnalyticsEndpoint.as_view()),
+    path("dashboard-analytics/series", DashboardSeriesEndpoint.as_view()),
     # dashboard
     path("dashboard-info", DashboardInfoEndpoint.as_view()),
+    # metrics
+    path("metrics", MetricsEndpoint.as_view()),
+    # status events
+    path("status-events", StatusEventsEndpoint.as_view()),
+    path("status-events/stream", StatusEventStreamEndpoint.as_view()),
+    # notifications
+    path("notifications", NotificationListEndpoint.as_view()),
+    path("notifications/unread-count", NotificationUnreadCountEndpoint.as_view()),
+    path("notifications/read", NotificationMarkReadEndpoint.as_view()),
+    path("notifications/<uuid:notification_id>", NotificationDetailEndpoint.as_view()),
+    # autocomplete
+    path("autocomplete/<str:source>", AutocompleteEndpoint.as_view()),
 ]
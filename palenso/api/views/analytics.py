@@ -0,0 +1,69 @@
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from sentry_sdk import capture_exception
+
+from palenso.analytics.reports import activity_summary, parse_days
+from palenso.db.models.event import Event
+from palenso.db.models.job import Job
+
+
+class ActivityEndpoint(APIView):
+    """Views, saves, applications or registrations of one job or event
+    between ``?start=`` and ``?end=``, with approximate unique visitors;
+    activity reaches these numbers within a minute or so"""
+
+    permission_classes = [IsAuthenticated]
+    target_type = None
+
+    def get_owner_id(self, target_id):
+        raise NotImplementedError(f"{type(self).__name__} must implement get_owner_id()")
+
+    def get(self, request, target_id):
+        try:
+            owner_id = self.get_owner_id(target_id)
+            if owner_id is None:
+                return Response(
+                    {"error": f"Sorry, {self.target_type} not found."},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            if request.user.role != "admin" and request.user.pk != owner_id:
+                return Response("Restricted", status=status.HTTP_403_FORBIDDEN)
+            try:
+                start, end = parse_days(request.query_params)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            return Response(
+                {
+                    "start": start,
+                    "end": end,
+                    "activity": activity_summary(self.target_type, target_id, start, end),
+                },
+                status=status.HTTP_200_OK,
+            )
+        except Exception as e:
+            capture_exception(e)
+            return Response(
+                {"message": "Something went wrong"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class JobActivityEndpoint(ActivityEndpoint):
+    target_type = "job"
+
+    def get_owner_id(self, target_id):
+        return (
+            Job.objects.filter(pk=target_id)
+            .values_list("company__employer_id", flat=True)
+            .first()
+        )
+
+
+class EventActivityEndpoint(ActivityEndpoint):
+    target_type = "event"
+
+    def get_owner_id(self, target_id):
+        return Event.objects.filter(pk=target_id).values_list("organizer_id", flat=True).first()
@@ -16,15 +16,17 @@ from sentry_sdk import capture_exception, capture_message
 
 from palenso.db.models import User
 from palenso.api.serializers.people import UserInfoSerializer, UserSerializer
+from palenso.api.throttles import AuthRateThrottle
+from palenso.api.views.base import AsyncUpstreamEndpoint, UpstreamEndpoint
 from palenso.utils.auth_utils import (
     create_token,
-    generate_otp,
     get_valid_token,
     mark_token_as_used,
     send_email_verification,
     send_mobile_otp,
     send_password_reset_email,
 )
+from palenso.utils.verification import issue_code, normalize_address, verify_code
 
 
 PHONE_NUMBER_REGEX_PATTERN = ".*?(\(?\d{3}\D{0,3}\d{3}\D{0,3}\d{4}).*?"
@@ -57,6 +59,8 @@ def get_tokens_for_user(user):
 
 class SignInEndpoint(APIView):
     permission_classes = (AllowAny,)
+    throttle_classes = (AuthRateThrottle,)
+    throttle_scope = "signin"
 
     def post(self, request):
         try:
@@ -132,12 +136,13 @@ class SignInEndpoint(APIView):
             )
 
 
-# @ratelimit(key="ip", rate="5/h", block=True)
 class SignUpEndpoint(APIView):
 
     permission_classes = [
         AllowAny,
     ]
+    throttle_classes = (AuthRateThrottle,)
+    throttle_scope = "signup"
 
     def post(self, request):
         try:
@@ -179,12 +184,7 @@ class SignUpEndpoint(APIView):
             user.save()
 
             # Generate new verification code
-            otp = generate_otp()
-            token = create_token(
-                user, "email_verification", expires_in_hours=1 / 6
-            )  # 10 minutes
-            token.token = otp
-            token.save()
+            otp = issue_code(user, "email", user.email)
             send_email_verification(user, otp)
 
             serialized_user = UserInfoSerializer(user).data
@@ -308,56 +308,64 @@ class SignOutEndpoint(APIView):
             )
 
 
-class ForgotPasswordEndpoint(APIView):
+class ForgotPasswordEndpoint(UpstreamEndpoint):
     permission_classes = (AllowAny,)
+    throttle_classes = (AuthRateThrottle,)
+    throttle_scope = "forgot_password"
 
-    def post(self, request):
-        try:
+    def prepare(self, request):
+        email = request.data.get("email", False)
+        mobile_number = request.data.get("mobile_number", False)
 
-            email = request.data.get("email", False)
-            mobile_number = request.data.get("mobile_number", False)
+        if not email and not mobile_number:
+            return Response(
+                {"error": "Please provide a valid email or mobile number"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-            if not email and not mobile_number:
-                return Response(
-                    {"error": "Please provide a valid email or mobile number"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+        if email and not check_valid_email_address(email):
+            return Response(
+                {"error": "Please provide a valid email"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-            if email and not check_valid_email_address(email):
-                return Response(
-                    {"error": "Please provide a valid email"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+        if mobile_number and not check_valid_phone_number(mobile_number):
+            return Response(
+                {"error": "Please provide a valid mobile number"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-            if mobile_number and not check_valid_phone_number(mobile_number):
-                return Response(
-                    {"error": "Please provide a valid mobile number"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+        if email:
+            user = User.objects.get(email=email)
 
-            if email:
-                user = User.objects.get(email=email)
+        if mobile_number:
+            user = User.objects.get(mobile_number=mobile_number)
 
-            if mobile_number:
-                user = User.objects.get(mobile_number=mobile_number)
+        # Create password reset token
+        token = create_token(user, "forgot_password", expires_in_hours=1)  # 1 hour
+        return {"user": user, "token": token}
 
-            # Create password reset token
-            token = create_token(user, "forgot_password", expires_in_hours=1)  # 1 hour
-            send_password_reset_email(user, token)
+    def deliver(self, context):
+        send_password_reset_email(context["user"], context["token"])
 
-            return Response(
-                {"message": "Password reset email sent successfully."},
-                status=status.HTTP_200_OK,
-            )
+    def complete(self, request, context):
+        return Response(
+            {"message": "Password reset email sent successfully."},
+            status=status.HTTP_200_OK,
+        )
 
-        except Exception as e:
-            capture_exception(e)
-            return Response(
-                {
-                    "error": "Something went wrong. Please try again later or contact the support team."
-                },
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+    def handle_failure(self, e):
+        capture_exception(e)
+        return Response(
+            {
+                "error": "Something went wrong. Please try again later or contact the support team."
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+
+class AsyncForgotPasswordEndpoint(AsyncUpstreamEndpoint, ForgotPasswordEndpoint):
+    pass
 
 
 class ResetPasswordEndpoint(APIView):
@@ -519,109 +527,116 @@ class CheckMediumAvailabilityEndpoint(APIView):
             )
 
 
-class RequestMediumVerificationEndpoint(APIView):
+class RequestMediumVerificationEndpoint(UpstreamEndpoint):
     permission_classes = (AllowAny,)
+    throttle_classes = (AuthRateThrottle,)
+    throttle_scope = "request_verification"
 
-    def post(self, request):
-        try:
-            email = request.data.get("email", False)
-            mobile_number = request.data.get("mobile_number", False)
-            user_id = request.data.get("user_id", False)
+    def prepare(self, request):
+        email = request.data.get("email", False)
+        mobile_number = request.data.get("mobile_number", False)
+        user_id = request.data.get("user_id", False)
 
-            if not email and not mobile_number:
-                return Response(
-                    {"error": "Please provide a valid email or mobile number"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+        if not email and not mobile_number:
+            return Response(
+                {"error": "Please provide a valid email or mobile number"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-            if email and not check_valid_email_address(email):
-                return Response(
-                    {"error": "Please provide a valid email"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+        if email and not check_valid_email_address(email):
+            return Response(
+                {"error": "Please provide a valid email"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-            if mobile_number and not check_valid_phone_number(mobile_number):
+        if mobile_number and not check_valid_phone_number(mobile_number):
+            return Response(
+                {"error": "Please provide a valid mobile number"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if not user_id:
+            return Response(
+                {"error": "Please provide a valid user"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if email:
+            user = User.objects.get(pk=user_id)
+            if user.is_email_verified:
                 return Response(
-                    {"error": "Please provide a valid mobile number"},
+                    {"error": "Email is already verified."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            if email and user_id:
-                user = User.objects.get(pk=user_id)
-                if user.is_email_verified:
-                    return Response(
-                        {"error": "Email is already verified."},
-                        status=status.HTTP_400_BAD_REQUEST,
-                    )
+            # Generate new verification code; the address is written to the
+            # user by VerifyMediumEndpoint once the code is confirmed, and
+            # only set here, unsaved, for sending
+            otp = issue_code(user, "email", email)
+            user.email = email
+            return {
+                "send": send_email_verification,
+                "user": user,
+                "otp": otp,
+                "message": "Verification email sent successfully.",
+            }
 
-                user.is_email_verified = False
-                user.email = email
-                user.save()
+        user = User.objects.get(pk=user_id)
+        if user.is_mobile_verified:
+            return Response(
+                {"error": "Mobile number is already verified."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-                # Generate new verification code
-                otp = generate_otp()
-                token = create_token(
-                    user, "email_verification", expires_in_hours=1 / 6
-                )  # 10 minutes
-                token.token = otp
-                token.save()
-                send_email_verification(user, otp)
+        # Generate new OTP, written to the user once confirmed like the email
+        otp = issue_code(user, "mobile", mobile_number)
+        user.mobile_number = mobile_number
+        return {
+            "send": send_mobile_otp,
+            "user": user,
+            "otp": otp,
+            "message": "OTP sent successfully.",
+        }
 
-                return Response(
-                    {"message": "Verification email sent successfully."},
-                    status=status.HTTP_200_OK,
-                )
-
-            if mobile_number and user_id:
-                user = User.objects.get(pk=user_id)
-                if user.is_mobile_verified:
-                    return Response(
-                        {"error": "Mobile number is already verified."},
-                        status=status.HTTP_400_BAD_REQUEST,
-                    )
+    def deliver(self, context):
+        context["send"](context["user"], context["otp"])
 
-                user.mobile_number = mobile_number
-                user.is_mobile_verified = False
-                user.save()
+    def complete(self, request, context):
+        return Response({"message": context["message"]}, status=status.HTTP_200_OK)
 
-                # Generate new OTP
-                otp = generate_otp()
-                token = create_token(
-                    user, "otp_verification", expires_in_hours=1 / 6
-                )  # 10 minutes
-                token.token = otp
-                token.save()
-                send_mobile_otp(user, otp)
-
-                return Response(
-                    {"message": "OTP sent successfully."},
-                    status=status.HTTP_200_OK,
-                )
-        except User.DoesNotExist:
+    def handle_failure(self, e):
+        if isinstance(e, User.DoesNotExist):
             return Response(
                 {"error": "Sorry, User not found. Please try again."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        except Exception as e:
-            print("Request Verification", e)
-            capture_exception(e)
-            return Response(
-                {
-                    "error": "Something went wrong. Please try again later or contact the support team."
-                },
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        capture_exception(e)
+        return Response(
+            {
+                "error": "Something went wrong. Please try again later or contact the support team."
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+
+class AsyncRequestMediumVerificationEndpoint(
+    AsyncUpstreamEndpoint, RequestMediumVerificationEndpoint
+):
+    pass
 
 
 class VerifyMediumEndpoint(APIView):
     permission_classes = (AllowAny,)
+    throttle_classes = (AuthRateThrottle,)
+    throttle_scope = "verify_medium"
 
     def post(self, request):
         try:
             email = request.data.get("email", False)
             mobile_number = request.data.get("mobile_number", False)
             code = request.data.get("code", False)
+            user_id = request.data.get("user_id", False)
 
             if not email and not mobile_number:
                 return Response(
@@ -647,32 +662,35 @@ class VerifyMediumEndpoint(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            if email:
-                user = User.objects.get(email=email)
-                token = get_valid_token(code, "email_verification")
-                user.is_email_verified = True
-
-            if mobile_number:
-                user = User.objects.get(mobile_number=mobile_number)
-                token = get_valid_token(code, "otp_verification")
-                user.is_mobile_verified = True
+            channel = "mobile" if mobile_number else "email"
+            address = normalize_address(channel, mobile_number or email)
+            if user_id:
+                # A new address is not the user's until this succeeds
+                user = User.objects.get(pk=user_id)
+            elif channel == "mobile":
+                user = User.objects.get(mobile_number=address)
+            else:
+                user = User.objects.get(email=address)
 
-            if not token or token.user != user:
+            if not verify_code(user, channel, address, code):
                 return Response(
                     {"error": "Invalid or expired verification code."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
+            if channel == "mobile":
+                user.mobile_number = address
+                user.is_mobile_verified = True
+            else:
+                user.email = address
+                user.is_email_verified = True
             user.save()
 
-            mark_token_as_used(token)
-
             return Response(
                 {"message": "Verified successfully."},
                 status=status.HTTP_200_OK,
             )
         except Exception as e:
-            print(e)
             capture_exception(e)
             return Response(
                 {
@@ -684,6 +702,8 @@ class VerifyMediumEndpoint(APIView):
 
 class CheckUserExistenceEndpoint(APIView):
     permission_classes = (AllowAny,)
+    throttle_classes = (AuthRateThrottle,)
+    throttle_scope = "check_user"
 
     def post(self, request):
         try:
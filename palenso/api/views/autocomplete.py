@@ -0,0 +1,46 @@
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from sentry_sdk import capture_exception
+
+from palenso.utils.autocomplete import SOURCES, PrefixIndex, get_autocomplete
+
+
+class AutocompleteEndpoint(APIView):
+    """Top values of a source starting with ``?q=``, most common first"""
+
+    permission_classes = [AllowAny]
+
+    def get(self, request, source):
+        try:
+            if source not in SOURCES:
+                return Response(
+                    {"error": f"Unknown source, expected one of {', '.join(SOURCES)}"},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            try:
+                limit = int(request.query_params.get("limit", 10))
+            except ValueError:
+                return Response(
+                    {"error": "limit must be a number"}, status=status.HTTP_400_BAD_REQUEST
+                )
+            limit = max(1, min(limit, PrefixIndex.TOP))
+
+            suggestions = get_autocomplete().suggest(
+                source, request.query_params.get("q", ""), limit
+            )
+            return Response(
+                {
+                    "suggestions": [
+                        {"value": value, "count": count} for value, count in suggestions
+                    ]
+                },
+                status=status.HTTP_200_OK,
+            )
+        except Exception as e:
+            capture_exception(e)
+            return Response(
+                {"message": "Something went wrong"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
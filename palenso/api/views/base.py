@@ -0,0 +1,146 @@
+import asyncio
+import functools
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.decorators import classonlymethod
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from sentry_sdk import capture_exception
+
+
+_upstream_executor = None
+
+
+def upstream_executor():
+    """Thread pool for blocking upstream calls made from async views, sized
+    by ``UPSTREAM_THREADS`` per process"""
+    global _upstream_executor
+    if _upstream_executor is None:
+        _upstream_executor = ThreadPoolExecutor(
+            max_workers=settings.UPSTREAM_THREADS, thread_name_prefix="upstream"
+        )
+    return _upstream_executor
+
+
+class AsyncAPIView(APIView):
+    """APIView whose handlers may be coroutines
+
+    DRF dispatches synchronously, so this runs DRF's request setup
+    (parsing, authentication, permissions, throttling), exception handling
+    and response finalization through ``sync_to_async`` and awaits the
+    handler in between. Handlers must not touch the ORM directly; wrap that
+    work in ``sync_to_async``. Under WSGI Django runs the view through
+    ``async_to_sync``, so it still works, without the concurrency gain.
+    """
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+
+        # Django only awaits views that are coroutine functions
+        async def async_view(*args, **kwargs):
+            return await view(*args, **kwargs)
+
+        functools.update_wrapper(async_view, view)
+        return async_view
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.prepare_request)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if asyncio.iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+
+        except Exception as exc:
+            response = await sync_to_async(self.handle_exception)(exc)
+
+        self.response = await sync_to_async(self.finalize_response)(
+            request, response, *args, **kwargs
+        )
+        return self.response
+
+    def prepare_request(self, request, *args, **kwargs):
+        self.initial(request, *args, **kwargs)
+        # Parse the body here so handlers read request.data without blocking
+        request.data
+
+
+class UpstreamEndpoint(APIView, ABC):
+    """Endpoint whose POST spends most of its time waiting on one blocking
+    upstream call (SMTP, Twilio, object storage)
+
+    Subclasses split the work into ``prepare`` (validation and ORM work,
+    returning a context or an early ``Response``), ``deliver`` (the upstream
+    call only) and ``complete`` (the success response), so the sync view and
+    its async variant share the same logic.
+    """
+
+    def post(self, request):
+        try:
+            context = self.prepare(request)
+            if isinstance(context, Response):
+                return context
+            self.deliver(context)
+            return self.complete(request, context)
+        except Exception as e:
+            return self.handle_failure(e)
+
+    @abstractmethod
+    def prepare(self, request):
+        """Validate and do the ORM work; a context for ``deliver`` or an
+        early ``Response``"""
+
+    @abstractmethod
+    def deliver(self, context):
+        """Make the upstream call"""
+
+    @abstractmethod
+    def complete(self, request, context):
+        """The success response"""
+
+    def handle_failure(self, e):
+        capture_exception(e)
+        return Response(
+            {"message": "Something went wrong"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+class AsyncUpstreamEndpoint(AsyncAPIView):
+    """Async variant of an ``UpstreamEndpoint``, listed before it in the bases
+
+    ``prepare`` and ``complete`` run on the request's sync thread like any
+    ORM code. ``deliver`` runs on the upstream executor, which bounds how
+    many calls wait on SMTP, Twilio or S3 at once instead of growing one
+    thread per waiting request.
+    """
+
+    async def post(self, request):
+        try:
+            context = await sync_to_async(self.prepare)(request)
+            if isinstance(context, Response):
+                return context
+            await asyncio.get_running_loop().run_in_executor(
+                upstream_executor(), self.deliver, context
+            )
+            return await sync_to_async(self.complete)(request, context)
+        except Exception as e:
+            return await sync_to_async(self.handle_failure)(e)
@@ -39,9 +39,12 @@ class CompanyProfileListCreateEndpoint(APIView):
 
     def get(self, request):
         try:
-            queryset = Company.objects.all()
+            field_kwargs = CompanySerializer.fields_from_request(request)
+            queryset = CompanySerializer.setup_queryset(
+                Company.objects.all(), **field_kwargs
+            )
             filtered_queryset = self.filter_queryset(request, queryset)
-            serializer = CompanySerializer(filtered_queryset, many=True)
+            serializer = CompanySerializer(filtered_queryset, many=True, **field_kwargs)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Exception as e:
             capture_exception(e)
@@ -74,8 +77,11 @@ class CompanyProfileDetailEndpoint(APIView):
         
     def get(self, request, company_id):
         try:
-            queryset = Company.objects.get(pk=company_id)
-            serializer = CompanySerializer(queryset)
+            field_kwargs = CompanySerializer.fields_from_request(request)
+            queryset = CompanySerializer.setup_queryset(
+                Company.objects.all(), **field_kwargs
+            ).get(pk=company_id)
+            serializer = CompanySerializer(queryset, **field_kwargs)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Company.DoesNotExist:
             return Response(
@@ -2,6 +2,7 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from django.core.exceptions import ValidationError
 from django.utils import timezone
 from datetime import timedelta
 from django.db.models import Count, Q
@@ -11,6 +12,10 @@ from palenso.db.models.job import Job, JobApplication, SavedJob, Interview, Offe
 from palenso.db.models.event import Event, EventRegistration
 from palenso.db.models.company import Company
 from palenso.db.models.user import User
+from palenso.analytics.reports import parse_days
+from palenso.analytics.timeseries import INTERVALS, job_series, role_series
+from palenso.bgtasks.alerts import current_alerts
+from palenso.utils.sections import Section, run_sections
 
 
 class DashboardAnalyticsEndpoint(APIView):
@@ -188,6 +193,73 @@ class DashboardAnalyticsEndpoint(APIView):
         return Response(analytics_data, status=status.HTTP_200_OK)
 
 
+class DashboardSeriesEndpoint(APIView):
+    """Metrics per day, week or month (``?interval=``) between ``?start=``
+    and ``?end=``, merged from daily buckets instead of counted from the
+    source tables
+
+    Employers get their company's applications, interviews, offers, saves
+    and views, for one job with ``?job=``. Admins get signups,
+    applications, events and registrations per role (``?role=``), or a
+    company's job metrics with ``?company=``.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            interval = request.query_params.get("interval", "day")
+            if interval not in INTERVALS:
+                return Response(
+                    {"error": f"interval must be one of {', '.join(INTERVALS)}"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            try:
+                start, end = parse_days(request.query_params)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            params = {"start": start, "end": end, "interval": interval}
+
+            if request.user.role == "admin":
+                company_id = request.query_params.get("company")
+                if company_id is None:
+                    roles = role_series(
+                        start, end, interval, request.query_params.get("role")
+                    )
+                    return Response(dict(params, roles=roles), status=status.HTTP_200_OK)
+            elif request.user.role == "employer":
+                if not request.user.is_employer_with_company:
+                    return Response(
+                        dict(params, company_setup_required=True),
+                        status=status.HTTP_200_OK,
+                    )
+                company_id = request.user.company.pk
+            else:
+                return Response("Restricted", status=status.HTTP_403_FORBIDDEN)
+
+            job_id = request.query_params.get("job")
+            if not Company.objects.filter(pk=company_id).exists() or (
+                job_id is not None
+                and not Job.objects.filter(pk=job_id, company_id=company_id).exists()
+            ):
+                return Response(
+                    {"error": "Sorry, Job not found. Please try again."},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            metrics = job_series(company_id, start, end, interval, job_id)
+            return Response(dict(params, metrics=metrics), status=status.HTTP_200_OK)
+        except ValidationError:
+            return Response(
+                {"error": "company and job must be ids"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            capture_exception(e)
+            return Response(
+                {"message": "Something went wrong"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
 class DashboardInfoEndpoint(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -218,33 +290,16 @@ class DashboardInfoEndpoint(APIView):
 
     def _get_student_dashboard(self, request, now, week_ago):
         """Get dashboard data for students"""
-        # Recent Job Opportunities (active jobs from last 7 days)
-        recent_jobs = (
-            Job.objects.filter(is_active=True, created_at__gte=week_ago)
-            .select_related("company")
-            .order_by("-created_at")[:10]
-        )
-
-        # Upcoming Events (events starting in the future)
-        upcoming_events = (
-            Event.objects.filter(is_active=True, start_date__gt=now)
-            .select_related("company", "organizer")
-            .order_by("start_date")[:10]
-        )
-
-        # Upcoming Interviews (scheduled interviews for the student)
-        upcoming_interviews = (
-            Interview.objects.filter(
-                application__applicant=request.user,
-                scheduled_at__gt=now,
-                status="scheduled",
+        user = request.user
+
+        def recent_job_opportunities():
+            # Active jobs from last 7 days
+            recent_jobs = (
+                Job.objects.filter(is_active=True, created_at__gte=week_ago)
+                .select_related("company")
+                .order_by("-created_at")[:10]
             )
-            .select_related("application__job__company", "interviewer")
-            .order_by("scheduled_at")[:10]
-        )
-
-        dashboard_data = {
-            "recent_job_opportunities": [
+            return [
                 {
                     "id": job.id,
                     "title": job.title,
@@ -260,8 +315,16 @@ class DashboardInfoEndpoint(APIView):
                     "application_deadline": job.application_deadline,
                 }
                 for job in recent_jobs
-            ],
-            "upcoming_events": [
+            ]
+
+        def upcoming_events():
+            # Events starting in the future
+            events = (
+                Event.objects.filter(is_active=True, start_date__gt=now)
+                .select_related("company", "organizer")
+                .order_by("start_date")[:10]
+            )
+            return [
                 {
                     "id": event.id,
                     "title": event.title,
@@ -276,9 +339,21 @@ class DashboardInfoEndpoint(APIView):
                     "registration_fee": event.registration_fee,
                     "is_registration_required": event.is_registration_required,
                 }
-                for event in upcoming_events
-            ],
-            "upcoming_interviews": [
+                for event in events
+            ]
+
+        def upcoming_interviews():
+            # Scheduled interviews for the student
+            interviews = (
+                Interview.objects.filter(
+                    application__applicant=user,
+                    scheduled_at__gt=now,
+                    status="scheduled",
+                )
+                .select_related("application__job__company", "interviewer")
+                .order_by("scheduled_at")[:10]
+            )
+            return [
                 {
                     "id": interview.id,
                     "job_title": interview.application.job.title,
@@ -291,11 +366,17 @@ class DashboardInfoEndpoint(APIView):
                     "interviewer_name": interview.interviewer.get_full_name(),
                     "status": interview.status,
                 }
-                for interview in upcoming_interviews
-            ],
-        }
-
-        return Response(dashboard_data, status=status.HTTP_200_OK)
+                for interview in interviews
+            ]
+
+        sections = run_sections(
+            [
+                Section("recent_job_opportunities", recent_job_opportunities, default=[]),
+                Section("upcoming_events", upcoming_events, default=[]),
+                Section("upcoming_interviews", upcoming_interviews, default=[]),
+            ]
+        )
+        return sections.annotate(Response(dict(sections), status=status.HTTP_200_OK))
 
     def _get_employer_dashboard(self, request, now, week_ago):
         """Get dashboard data for employers"""
@@ -312,42 +393,19 @@ class DashboardInfoEndpoint(APIView):
             return Response(dashboard_data, status=status.HTTP_200_OK)
 
         # Get company
-        company = request.user.company
-
-        # Recent Applications (applications from last 7 days)
-        recent_applications = (
-            JobApplication.objects.filter(
-                job__company=company, created_at__gte=week_ago
-            )
-            .select_related("job", "applicant")
-            .order_by("-created_at")[:10]
-        )
-
-        # Active Jobs
-        active_jobs = Job.objects.filter(company=company, is_active=True).order_by(
-            "-created_at"
-        )[:10]
-
-        # Upcoming Events (events organized by the employer)
-        upcoming_events = (
-            Event.objects.filter(organizer=request.user, start_date__gt=now)
-            .select_related("company")
-            .order_by("start_date")[:10]
-        )
-
-        # Upcoming Interviews (interviews for the employer's company)
-        upcoming_interviews = (
-            Interview.objects.filter(
-                application__job__company=company,
-                scheduled_at__gt=now,
-                status="scheduled",
+        user = request.user
+        company = user.company
+
+        def recent_applications():
+            # Applications from last 7 days
+            applications = (
+                JobApplication.objects.filter(
+                    job__company=company, created_at__gte=week_ago
+                )
+                .select_related("job", "applicant")
+                .order_by("-created_at")[:10]
             )
-            .select_related("application__job", "application__applicant", "interviewer")
-            .order_by("scheduled_at")[:10]
-        )
-
-        dashboard_data = {
-            "recent_applications": [
+            return [
                 {
                     "id": app.id,
                     "job_title": app.job.title,
@@ -363,9 +421,14 @@ class DashboardInfoEndpoint(APIView):
                     "available_from": app.available_from,
                     "created_at": app.created_at,
                 }
-                for app in recent_applications
-            ],
-            "active_jobs": [
+                for app in applications
+            ]
+
+        def active_jobs():
+            jobs = Job.objects.filter(company=company, is_active=True).order_by(
+                "-created_at"
+            )[:10]
+            return [
                 {
                     "id": job.id,
                     "title": job.title,
@@ -378,9 +441,17 @@ class DashboardInfoEndpoint(APIView):
                     "created_at": job.created_at,
                     "application_deadline": job.application_deadline,
                 }
-                for job in active_jobs
-            ],
-            "upcoming_events": [
+                for job in jobs
+            ]
+
+        def upcoming_events():
+            # Events organized by the employer
+            events = (
+                Event.objects.filter(organizer=user, start_date__gt=now)
+                .select_related("company")
+                .order_by("start_date")[:10]
+            )
+            return [
                 {
                     "id": event.id,
                     "title": event.title,
@@ -393,9 +464,21 @@ class DashboardInfoEndpoint(APIView):
                     "max_participants": event.max_participants,
                     "is_featured": event.is_featured,
                 }
-                for event in upcoming_events
-            ],
-            "upcoming_interviews": [
+                for event in events
+            ]
+
+        def upcoming_interviews():
+            # Interviews for the employer's company
+            interviews = (
+                Interview.objects.filter(
+                    application__job__company=company,
+                    scheduled_at__gt=now,
+                    status="scheduled",
+                )
+                .select_related("application__job", "application__applicant", "interviewer")
+                .order_by("scheduled_at")[:10]
+            )
+            return [
                 {
                     "id": interview.id,
                     "job_title": interview.application.job.title,
@@ -408,102 +491,28 @@ class DashboardInfoEndpoint(APIView):
                     "meeting_url": interview.meeting_url,
                     "interviewer_name": interview.interviewer.get_full_name(),
                 }
-                for interview in upcoming_interviews
-            ],
-        }
-
-        return Response(dashboard_data, status=status.HTTP_200_OK)
+                for interview in interviews
+            ]
+
+        sections = run_sections(
+            [
+                Section("recent_applications", recent_applications, default=[]),
+                Section("active_jobs", active_jobs, default=[]),
+                Section("upcoming_events", upcoming_events, default=[]),
+                Section("upcoming_interviews", upcoming_interviews, default=[]),
+            ]
+        )
+        return sections.annotate(Response(dict(sections), status=status.HTTP_200_OK))
 
     def _get_admin_dashboard(self, request, now, week_ago):
         """Get dashboard data for admins"""
-        # Recent Users (users who joined in last 7 days)
-        recent_users = User.objects.filter(date_joined__gte=week_ago).order_by(
-            "-date_joined"
-        )[:10]
-
-        # System Alerts (various system conditions that need attention)
-        system_alerts = []
-
-        # Check for pending job applications (more than 3 days old)
-        old_pending_applications = JobApplication.objects.filter(
-            status="pending", created_at__lt=now - timedelta(days=3)
-        ).count()
-        if old_pending_applications > 0:
-            system_alerts.append(
-                {
-                    "type": "pending_applications",
-                    "message": f"{old_pending_applications} job applications pending for more than 3 days",
-                    "severity": "medium",
-                    "count": old_pending_applications,
-                }
-            )
 
-        # Check for expired jobs
-        expired_jobs = Job.objects.filter(
-            is_active=True, application_deadline__lt=now.date()
-        ).count()
-        if expired_jobs > 0:
-            system_alerts.append(
-                {
-                    "type": "expired_jobs",
-                    "message": f"{expired_jobs} active jobs have expired",
-                    "severity": "high",
-                    "count": expired_jobs,
-                }
-            )
-
-        # Check for upcoming events with low registration
-        upcoming_events_low_registration = Event.objects.filter(
-            is_active=True,
-            start_date__gt=now,
-            start_date__lte=now + timedelta(days=7),
-            max_participants__isnull=False,
-        )
-        for event in upcoming_events_low_registration:
-            registration_rate = (
-                event.registration_count / event.max_participants
-                if event.max_participants > 0
-                else 0
-            )
-            if registration_rate < 0.3:  # Less than 30% registered
-                system_alerts.append(
-                    {
-                        "type": "low_event_registration",
-                        "message": f"Event '{event.title}' has low registration ({event.registration_count}/{event.max_participants})",
-                        "severity": "low",
-                        "event_id": event.id,
-                        "registration_rate": registration_rate,
-                    }
-                )
-
-        # Check for inactive users (no login for 30+ days)
-        inactive_users = User.objects.filter(
-            last_active__lt=now - timedelta(days=30), is_active=True
-        ).count()
-        if inactive_users > 0:
-            system_alerts.append(
-                {
-                    "type": "inactive_users",
-                    "message": f"{inactive_users} users have been inactive for 30+ days",
-                    "severity": "low",
-                    "count": inactive_users,
-                }
-            )
-
-        # Check for companies without active jobs
-        companies_without_jobs = Company.objects.filter(jobs__isnull=True).count()
-        if companies_without_jobs > 0:
-            system_alerts.append(
-                {
-                    "type": "companies_without_jobs",
-                    "message": f"{companies_without_jobs} companies have no active jobs",
-                    "severity": "medium",
-                    "count": companies_without_jobs,
-                }
-            )
-
-        dashboard_data = {
-            "recent_users": [
+        def recent_users():
+            # Users who joined in last 7 days
+            users = User.objects.filter(date_joined__gte=week_ago).order_by(
+                "-date_joined"
+            )[:10]
+            return [
                 {
                     "id": user.id,
                     "username": user.username,
@@ -515,9 +524,22 @@ class DashboardInfoEndpoint(APIView):
                     "is_active": user.is_active,
                     "is_email_verified": user.is_email_verified,
                 }
-                for user in recent_users
-            ],
+                for user in users
+            ]
+
+        sections = run_sections(
+            [
+                Section("recent_users", recent_users, default=[]),
+                # Precomputed by the refresh_system_alerts command
+                Section("system_alerts", current_alerts, default=([], None)),
+            ]
+        )
+        system_alerts, evaluated_at = sections["system_alerts"]
+
+        dashboard_data = {
+            "recent_users": sections["recent_users"],
             "system_alerts": system_alerts,
+            "system_alerts_evaluated_at": evaluated_at,
         }
 
-        return Response(dashboard_data, status=status.HTTP_200_OK)
+        return sections.annotate(Response(dashboard_data, status=status.HTTP_200_OK))
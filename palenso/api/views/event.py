@@ -1,3 +1,8 @@
+import uuid
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
 from rest_framework import status
 
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -8,9 +13,23 @@ from django_filters import rest_framework as filters
 
 from sentry_sdk import capture_exception
 
-from palenso.api.filters.event import EventFilter
-from palenso.api.serializers.event import EventSerializer, EventRegistrationSerializer, AnonymousEventRegistrationSerializer
+from palenso.analytics.buffer import record_view
+from palenso.api.filters.event import EVENT_FACETS, EventFilter
+from palenso.api.serializers.event import (
+    EventSerializer,
+    EventRegistrationSerializer,
+    AnonymousEventRegistrationSerializer,
+    EventRegistrationBulkStatusSerializer,
+)
 from palenso.db.models.event import Event, EventRegistration
+from palenso.utils.conditional import (
+    not_modified_response,
+    queryset_etag,
+    set_validators,
+)
+from palenso.utils.export import EXPORT_FILE_TYPES, streaming_export_response
+from palenso.utils.facets import FacetError, cached_facet_counts
+from palenso.utils.status_events import publish_changes
 
 
 class EventListCreateEndpoint(APIView):
@@ -38,10 +57,38 @@ class EventListCreateEndpoint(APIView):
 
     def get(self, request):
         try:
-            queryset = Event.objects.all()
+            field_kwargs = EventSerializer.fields_from_request(request)
+            queryset = EventSerializer.setup_queryset(Event.objects.all(), **field_kwargs)
             filtered_queryset = self.filter_queryset(request, queryset)
-            serializer = EventSerializer(filtered_queryset, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+
+            aggregates = {
+                "closed": Count(
+                    "pk",
+                    distinct=True,
+                    filter=Q(registration_deadline__lte=timezone.now()),
+                ),
+            }
+            # Joining registrations multiplies the rows aggregated, so only
+            # when their count is rendered
+            rendered = EventSerializer(**field_kwargs).fields
+            if "registration_count" in rendered or "is_full" in rendered:
+                aggregates["registrations"] = Count("registrations", distinct=True)
+            etag = queryset_etag(
+                request,
+                filtered_queryset,
+                timestamps=("updated_at", "company__updated_at", "organizer__updated_at"),
+                aggregates=aggregates,
+            )
+            not_modified = not_modified_response(request, etag)
+            if not_modified:
+                return not_modified
+
+            projection = EventSerializer.get_row_projection(**field_kwargs)
+            if projection:
+                data = projection.rows(projection.apply(filtered_queryset))
+            else:
+                data = EventSerializer(filtered_queryset, many=True, **field_kwargs).data
+            return set_validators(Response(data, status=status.HTTP_200_OK), etag)
         except Exception as e:
             capture_exception(e)
             return Response(
@@ -74,6 +121,28 @@ class EventListCreateEndpoint(APIView):
             )
 
 
+class EventFacetsEndpoint(EventListCreateEndpoint):
+    """Counts per facet value over the events the list endpoint returns for
+    the same filters, e.g. ``?facets=a,b&...``"""
+
+    http_method_names = ["get", "head", "options"]
+
+    def get(self, request):
+        try:
+            data = cached_facet_counts(
+                "events", self, request, Event.objects.all(), EVENT_FACETS
+            )
+            return Response(data, status=status.HTTP_200_OK)
+        except FacetError as e:
+            return Response(e.args[0], status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            capture_exception(e)
+            return Response(
+                {"message": "Something went wrong"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
 class EventDetailEndpoint(APIView):
     def get_permissions(self):
         if self.request.method == "GET":
@@ -82,8 +151,12 @@ class EventDetailEndpoint(APIView):
 
     def get(self, request, event_id):
         try:
-            queryset = Event.objects.get(pk=event_id)
-            serializer = EventSerializer(queryset)
+            field_kwargs = EventSerializer.fields_from_request(request)
+            queryset = EventSerializer.setup_queryset(
+                Event.objects.all(), **field_kwargs
+            ).get(pk=event_id)
+            serializer = EventSerializer(queryset, **field_kwargs)
+            record_view(request, "event", event_id)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Event.DoesNotExist:
             return Response(
@@ -273,3 +346,149 @@ class EventRegistrationDetailEndpoint(APIView):
                 {"message": "Something went wrong"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+
+class EventRegistrationBulkStatusEndpoint(APIView):
+    """Mark attendance for many registrations in a single request"""
+
+    permission_classes = [IsAuthenticated]
+
+    # Attendance can only be recorded on live registrations. Switching between
+    # attended and no_show is allowed so a mis-scan can be corrected.
+    ALLOWED_TRANSITIONS = {
+        "attended": ("registered", "confirmed", "no_show"),
+        "no_show": ("registered", "confirmed", "attended"),
+    }
+
+    # Keep the IN (...) lists well below the SQLite bound parameter limit
+    CHUNK_SIZE = 500
+
+    def post(self, request):
+        try:
+            if request.user.role not in ["admin", "employer"]:
+                return Response("Forbidden", status=status.HTTP_403_FORBIDDEN)
+
+            serializer = EventRegistrationBulkStatusSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+            new_status = serializer.validated_data["status"]
+            registration_ids = list(
+                dict.fromkeys(serializer.validated_data["registration_ids"])
+            )
+
+            queryset = EventRegistration.objects.all()
+            if request.user.role == "employer":
+                # Same ownership rule as EventRegistrationDetailEndpoint.put
+                queryset = queryset.filter(event__organizer=request.user)
+
+            now = timezone.now()
+            results = {}
+            changes = []
+            with transaction.atomic():
+                for start in range(0, len(registration_ids), self.CHUNK_SIZE):
+                    chunk = registration_ids[start : start + self.CHUNK_SIZE]
+                    registrations = (
+                        queryset.filter(pk__in=chunk)
+                        .select_for_update(of=("self",))
+                        .only("id", "status", "participant", "event")
+                    )
+                    to_update = []
+                    for registration in registrations:
+                        if registration.status == new_status:
+                            results[registration.id] = "unchanged"
+                        elif registration.status in self.ALLOWED_TRANSITIONS[new_status]:
+                            changes.append((registration, registration.status))
+                            registration.status = new_status
+                            registration.updated_by = request.user
+                            registration.updated_at = now
+                            to_update.append(registration)
+                            results[registration.id] = "updated"
+                        else:
+                            results[registration.id] = "invalid_transition"
+
+                    EventRegistration.objects.bulk_update(
+                        to_update, ["status", "updated_by", "updated_at"]
+                    )
+                # bulk_update sends no post_save, so publish here
+                transaction.on_commit(
+                    lambda: publish_changes(EventRegistration._meta.label, changes)
+                )
+
+            items = [
+                {"id": registration_id, "result": results.get(registration_id, "not_found")}
+                for registration_id in registration_ids
+            ]
+            return Response(
+                {
+                    "status": new_status,
+                    "updated": sum(1 for item in items if item["result"] == "updated"),
+                    "results": items,
+                },
+                status=status.HTTP_200_OK,
+            )
+        except Exception as e:
+            capture_exception(e)
+            return Response(
+                {"message": "Something went wrong"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class EventRegistrationExportEndpoint(APIView):
+    """Stream event registrations as CSV or NDJSON"""
+
+    permission_classes = [IsAuthenticated]
+
+    columns = [
+        ("registration_id", "id"),
+        ("event_id", "event_id"),
+        ("event_title", "event__title"),
+        ("first_name", "participant__first_name"),
+        ("last_name", "participant__last_name"),
+        ("email", "participant__email"),
+        ("mobile_number", "participant__mobile_number"),
+        ("status", "status"),
+        ("registration_date", "registration_date"),
+        ("payment_status", "payment_status"),
+        ("payment_amount", "payment_amount"),
+        ("dietary_restrictions", "dietary_restrictions"),
+        ("special_requirements", "special_requirements"),
+    ]
+
+    def get(self, request):
+        try:
+            if request.user.role not in ["admin", "employer"]:
+                return Response("Forbidden", status=status.HTTP_403_FORBIDDEN)
+
+            file_type = request.GET.get("file_type", "csv")
+            if file_type not in EXPORT_FILE_TYPES:
+                return Response(
+                    {"error": "file_type must be one of csv, ndjson"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            queryset = EventRegistration.objects.all()
+            if request.user.role == "employer":
+                queryset = queryset.filter(event__organizer=request.user)
+
+            event_id = request.GET.get("event_id")
+            if event_id:
+                try:
+                    event_id = uuid.UUID(event_id)
+                except ValueError:
+                    return Response(
+                        {"error": "event_id must be a UUID"},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+                queryset = queryset.filter(event_id=event_id)
+
+            return streaming_export_response(
+                queryset, self.columns, file_type, "event-registrations"
+            )
+        except Exception as e:
+            capture_exception(e)
+            return Response(
+                {"message": "Something went wrong"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
@@ -1,3 +1,8 @@
+import uuid
+
+from django.conf import settings
+from django.db.models import Count, Q
+from django.utils import timezone
 from rest_framework import status
 
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -8,12 +13,22 @@ from django_filters import rest_framework as filters
 
 from sentry_sdk import capture_exception
 
-from palenso.api.filters.job import JobFilter
+from palenso.analytics.buffer import record_view
+from palenso.api.filters.job import JOB_FACETS, JobFilter
+from palenso.api.filters.ordering import NullsLastOrderingFilter
 from palenso.api.serializers.job import (
-    JobSerializer, JobApplicationSerializer, SavedJobSerializer,
+    JobSerializer, JobApplicationSerializer, SavedJobSerializer, SavedSearchSerializer,
     InterviewSerializer, OfferSerializer
 )
 from palenso.db.models.job import Job, JobApplication, SavedJob, Interview, Offer
+from palenso.db.models.search import SavedSearch
+from palenso.utils.conditional import (
+    not_modified_response,
+    queryset_etag,
+    set_validators,
+)
+from palenso.utils.export import EXPORT_FILE_TYPES, streaming_export_response
+from palenso.utils.facets import FacetError, cached_facet_counts
 
 
 class JobListCreateEndpoint(APIView):
@@ -25,8 +40,10 @@ class JobListCreateEndpoint(APIView):
     filter_backends = (
         filters.DjangoFilterBackend,
         rest_filters.SearchFilter,
+        NullsLastOrderingFilter,
     )
     filterset_class = JobFilter
+    ordering_fields = ("created_at", "application_deadline", "salary_min_base", "salary_max_base")
     search_fields = (
         "^title",
         "^job_type",
@@ -42,10 +59,37 @@ class JobListCreateEndpoint(APIView):
 
     def get(self, request):
         try:
-            queryset = Job.objects.all()
+            field_kwargs = JobSerializer.fields_from_request(request)
+            queryset = JobSerializer.setup_queryset(Job.objects.all(), **field_kwargs)
             filtered_queryset = self.filter_queryset(request, queryset)
-            serializer = JobSerializer(filtered_queryset, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+
+            aggregates = {
+                "expired": Count(
+                    "pk",
+                    distinct=True,
+                    filter=Q(application_deadline__lt=timezone.now().date()),
+                ),
+            }
+            # Joining applications multiplies the rows aggregated, so only
+            # when their count is rendered
+            if "application_count" in JobSerializer(**field_kwargs).fields:
+                aggregates["applications"] = Count("applications", distinct=True)
+            etag = queryset_etag(
+                request,
+                filtered_queryset,
+                timestamps=("updated_at", "company__updated_at"),
+                aggregates=aggregates,
+            )
+            not_modified = not_modified_response(request, etag)
+            if not_modified:
+                return not_modified
+
+            projection = JobSerializer.get_row_projection(**field_kwargs)
+            if projection:
+                data = projection.rows(projection.apply(filtered_queryset))
+            else:
+                data = JobSerializer(filtered_queryset, many=True, **field_kwargs).data
+            return set_validators(Response(data, status=status.HTTP_200_OK), etag)
         except Exception as e:
             capture_exception(e)
             return Response(
@@ -76,6 +120,28 @@ class JobListCreateEndpoint(APIView):
             )
 
 
+class JobFacetsEndpoint(JobListCreateEndpoint):
+    """Counts per facet value over the jobs the list endpoint returns for
+    the same filters, e.g. ``?facets=a,b&...``"""
+
+    http_method_names = ["get", "head", "options"]
+
+    def get(self, request):
+        try:
+            data = cached_facet_counts(
+                "jobs", self, request, Job.objects.all(), JOB_FACETS
+            )
+            return Response(data, status=status.HTTP_200_OK)
+        except FacetError as e:
+            return Response(e.args[0], status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            capture_exception(e)
+            return Response(
+                {"message": "Something went wrong"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
 class JobDetailEndpoint(APIView):
     def get_permissions(self):
         if self.request.method == 'GET':
@@ -84,8 +150,12 @@ class JobDetailEndpoint(APIView):
     
     def get(self, request, job_id):
         try:
-            queryset = Job.objects.get(pk=job_id)
-            serializer = JobSerializer(queryset)
+            field_kwargs = JobSerializer.fields_from_request(request)
+            queryset = JobSerializer.setup_queryset(
+                Job.objects.all(), **field_kwargs
+            ).get(pk=job_id)
+            serializer = JobSerializer(queryset, **field_kwargs)
+            record_view(request, "job", job_id)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Job.DoesNotExist:
             return Response(
@@ -180,6 +250,65 @@ class JobApplicationListCreateEndpoint(APIView):
             )
 
 
+class JobApplicationExportEndpoint(APIView):
+    """Stream job applications as CSV or NDJSON"""
+
+    permission_classes = [IsAuthenticated]
+
+    columns = [
+        ("application_id", "id"),
+        ("job_id", "job_id"),
+        ("job_title", "job__title"),
+        ("first_name", "applicant__first_name"),
+        ("last_name", "applicant__last_name"),
+        ("email", "applicant__email"),
+        ("mobile_number", "applicant__mobile_number"),
+        ("status", "status"),
+        ("expected_salary", "expected_salary"),
+        ("available_from", "available_from"),
+        ("resume_url", "resume__file_url"),
+        ("cover_letter", "cover_letter"),
+        ("applied_at", "created_at"),
+    ]
+
+    def get(self, request):
+        try:
+            if request.user.role not in ["admin", "employer"]:
+                return Response("Forbidden", status=status.HTTP_403_FORBIDDEN)
+
+            file_type = request.GET.get("file_type", "csv")
+            if file_type not in EXPORT_FILE_TYPES:
+                return Response(
+                    {"error": "file_type must be one of csv, ndjson"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            queryset = JobApplication.objects.all()
+            if request.user.role == "employer":
+                queryset = queryset.filter(job__company__employer=request.user)
+
+            job_id = request.GET.get("job_id")
+            if job_id:
+                try:
+                    job_id = uuid.UUID(job_id)
+                except ValueError:
+                    return Response(
+                        {"error": "job_id must be a UUID"},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+                queryset = queryset.filter(job_id=job_id)
+
+            return streaming_export_response(
+                queryset, self.columns, file_type, "job-applications"
+            )
+        except Exception as e:
+            capture_exception(e)
+            return Response(
+                {"message": "Something went wrong"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
 class JobApplicationDetailEndpoint(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -256,7 +385,9 @@ class SavedJobListCreateEndpoint(APIView):
             payload["student"] = request.user.id
             serializer = SavedJobSerializer(data=payload)
             if serializer.is_valid():
-                serializer.save(created_by=request.user, updated_by=request.user)
+                serializer.save(
+                    student=request.user, created_by=request.user, updated_by=request.user
+                )
                 return Response(serializer.data, status=status.HTTP_201_CREATED)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
@@ -288,6 +419,102 @@ class SavedJobDetailEndpoint(APIView):
             )
 
 
+class SavedSearchListCreateEndpoint(APIView):
+    """Job filters a user saved; new jobs matching them are emailed in a
+    daily digest while ``alerts_enabled`` is set"""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            queryset = SavedSearch.objects.filter(user=request.user)
+            serializer = SavedSearchSerializer(queryset, many=True)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+        except Exception as e:
+            capture_exception(e)
+            return Response(
+                {"message": "Something went wrong"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    def post(self, request):
+        try:
+            if SavedSearch.objects.filter(user=request.user).count() >= settings.SAVED_SEARCH_LIMIT:
+                return Response(
+                    {"error": f"You can save up to {settings.SAVED_SEARCH_LIMIT} searches."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            serializer = SavedSearchSerializer(data=request.data)
+            if serializer.is_valid():
+                serializer.save(user=request.user, created_by=request.user, updated_by=request.user)
+                return Response(serializer.data, status=status.HTTP_201_CREATED)
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            capture_exception(e)
+            return Response(
+                {"message": "Something went wrong"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class SavedSearchDetailEndpoint(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, saved_search_id):
+        try:
+            saved_search = SavedSearch.objects.get(pk=saved_search_id, user=request.user)
+            serializer = SavedSearchSerializer(saved_search)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+        except SavedSearch.DoesNotExist:
+            return Response(
+                {"error": "Saved search not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        except Exception as e:
+            capture_exception(e)
+            return Response(
+                {"message": "Something went wrong"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    def put(self, request, saved_search_id):
+        try:
+            saved_search = SavedSearch.objects.get(pk=saved_search_id, user=request.user)
+            serializer = SavedSearchSerializer(saved_search, data=request.data, partial=True)
+            if serializer.is_valid():
+                serializer.save(updated_by=request.user)
+                return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        except SavedSearch.DoesNotExist:
+            return Response(
+                {"error": "Saved search not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        except Exception as e:
+            capture_exception(e)
+            return Response(
+                {"message": "Something went wrong"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    def delete(self, request, saved_search_id):
+        try:
+            saved_search = SavedSearch.objects.get(pk=saved_search_id, user=request.user)
+            saved_search.delete()
+            return Response("Saved search deleted!", status=status.HTTP_204_NO_CONTENT)
+        except SavedSearch.DoesNotExist:
+            return Response(
+                {"error": "Saved search not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        except Exception as e:
+            capture_exception(e)
+            return Response(
+                {"message": "Something went wrong"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
 class InterviewListCreateEndpoint(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -2,40 +2,48 @@ from django.core.exceptions import ValidationError
 from rest_framework import status
 
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.views import APIView
 from rest_framework.response import Response
 
-from sentry_sdk import capture_exception
-
 from palenso.api.serializers.media import MediaAssetSerializer
+from palenso.api.views.base import AsyncUpstreamEndpoint, UpstreamEndpoint
 from palenso.db.models.library import MediaAssets
 
 
-class UploadMediaEndpoint(APIView):
+class UploadMediaEndpoint(UpstreamEndpoint):
     permission_classes = [IsAuthenticated]
 
-    def post(self, request):
-        try:
-            asset_type = request.data.get("asset_type", "other")
-            file = request.FILES.get("file")
-
-            if not file:
-                return Response(
-                    {"error": "No file uploaded."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+    def prepare(self, request):
+        asset_type = request.data.get("asset_type", "other")
+        file = request.FILES.get("file")
 
-            serializer = MediaAssetSerializer(
-                data={"file": file, "asset_type": asset_type}
-            )
-            if serializer.is_valid():
-                serializer.save(created_by=request.user, updated_by=request.user)
-                return Response(serializer.data, status=status.HTTP_201_CREATED)
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-        except Exception as e:
-            capture_exception(e)
+        if not file:
             return Response(
-                {"message": "Something went wrong"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                {"error": "No file uploaded."},
+                status=status.HTTP_400_BAD_REQUEST,
             )
+
+        serializer = MediaAssetSerializer(
+            data={"file": file, "asset_type": asset_type}
+        )
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return {"serializer": serializer, "file": file}
+
+    def deliver(self, context):
+        # Upload before the row exists, so only the storage call waits on S3
+        field = MediaAssets._meta.get_field("file")
+        file = context["file"]
+        context["name"] = field.storage.save(
+            field.generate_filename(None, file.name), file, max_length=field.max_length
+        )
+
+    def complete(self, request, context):
+        serializer = context["serializer"]
+        serializer.save(
+            file=context["name"], created_by=request.user, updated_by=request.user
+        )
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class AsyncUploadMediaEndpoint(AsyncUpstreamEndpoint, UploadMediaEndpoint):
+    pass
@@ -0,0 +1,27 @@
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+from rest_framework.response import Response
+
+from sentry_sdk import capture_exception
+
+from palenso.utils.metrics import PROMETHEUS_CONTENT_TYPE, REGISTRY
+
+
+class MetricsEndpoint(APIView):
+    """Request metrics of this worker process in Prometheus text format"""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            if request.user.role != "admin":
+                return Response("Forbidden", status=status.HTTP_403_FORBIDDEN)
+            return HttpResponse(REGISTRY.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+        except Exception as e:
+            capture_exception(e)
+            return Response(
+                {"message": "Something went wrong"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
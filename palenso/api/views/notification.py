@@ -0,0 +1,101 @@
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from sentry_sdk import capture_exception
+
+from palenso.api.serializers.notification import (
+    MarkNotificationsReadSerializer,
+    NotificationSerializer,
+)
+from palenso.db.models import Notification
+from palenso.utils.notifications import delete_notification, mark_read, unread_count
+from palenso.utils.paginator import BasePaginator, KeysetCursor, KeysetPaginator
+
+
+class NotificationListEndpoint(APIView, BasePaginator):
+    """The user's notifications, newest first, ``?unread=1`` for unread
+    only; pages are keyset cursors, so ``total_pages`` is not computed"""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            queryset = Notification.objects.filter(user=request.user)
+            if request.GET.get("unread") in ("1", "true"):
+                queryset = queryset.filter(is_read=False)
+            return self.paginate(
+                request=request,
+                queryset=queryset,
+                paginator_cls=KeysetPaginator,
+                cursor_cls=KeysetCursor,
+                default_per_page=20,
+                on_results=lambda data: NotificationSerializer(data, many=True).data,
+                extra_stats={"unread": unread_count(request.user)},
+            )
+        except ParseError as e:
+            return Response({"error": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            capture_exception(e)
+            return Response(
+                {"message": "Something went wrong"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class NotificationUnreadCountEndpoint(APIView):
+    """Unread badge, read from the user's counter row"""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            return Response({"unread": unread_count(request.user)}, status=status.HTTP_200_OK)
+        except Exception as e:
+            capture_exception(e)
+            return Response(
+                {"message": "Something went wrong"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class NotificationMarkReadEndpoint(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        try:
+            serializer = MarkNotificationsReadSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            updated = mark_read(request.user, serializer.validated_data.get("ids"))
+            return Response(
+                {"updated": updated, "unread": unread_count(request.user)},
+                status=status.HTTP_200_OK,
+            )
+        except Exception as e:
+            capture_exception(e)
+            return Response(
+                {"message": "Something went wrong"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class NotificationDetailEndpoint(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def delete(self, request, notification_id):
+        try:
+            if not delete_notification(request.user, notification_id):
+                return Response(
+                    {"error": "Notification not found."},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        except Exception as e:
+            capture_exception(e)
+            return Response(
+                {"message": "Something went wrong"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
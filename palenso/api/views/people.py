@@ -9,6 +9,11 @@ from django_filters import rest_framework as filters
 
 from palenso.api.serializers.people import UserSerializer
 from palenso.api.filters.user import UserFilter
+from palenso.utils.conditional import (
+    not_modified_response,
+    queryset_etag,
+    set_validators,
+)
 from palenso.utils.paginator import BasePaginator
 
 from palenso.db.models.user import User
@@ -49,11 +54,25 @@ class PeopleView(APIView, BasePaginator):
 
             filtered_queryset = self.filter_queryset(request, users)
 
-            return self.paginate(
-                request=request,
-                queryset=filtered_queryset,
-                on_results=lambda data: UserSerializer(data, many=True).data,
-            )
+            etag = queryset_etag(request, filtered_queryset)
+            not_modified = not_modified_response(request, etag)
+            if not_modified:
+                return not_modified
+
+            projection = UserSerializer.get_row_projection()
+            if projection:
+                response = self.paginate(
+                    request=request,
+                    queryset=projection.apply(filtered_queryset),
+                    on_results=projection.rows,
+                )
+            else:
+                response = self.paginate(
+                    request=request,
+                    queryset=filtered_queryset,
+                    on_results=lambda data: UserSerializer(data, many=True).data,
+                )
+            return set_validators(response, etag)
         except Exception as e:
             capture_exception(e)
             return Response(
@@ -0,0 +1,150 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from sentry_sdk import capture_exception
+
+from palenso.api.renderers import EventStreamRenderer, FastJSONRenderer
+from palenso.api.views.base import AsyncAPIView
+from palenso.utils.status_events import event_stream_response, get_hub
+
+
+def _last_event_id(request):
+    """``?after=`` or the ``Last-Event-ID`` header an EventSource resends;
+    None when neither is given"""
+    value = request.query_params.get("after") or request.headers.get("Last-Event-ID")
+    if value in (None, ""):
+        return None
+    return int(value)
+
+
+class StatusEventsEndpoint(APIView):
+    """Status changes of the user's applications, interviews, offers and
+    event registrations after event ``?after=``, waiting up to ``?wait=``
+    seconds for one to happen (long polling)
+
+    Without ``?after=`` nothing is waited for; the response only carries the
+    id to poll from.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def parse(self, request):
+        try:
+            after = _last_event_id(request)
+            wait = float(request.query_params.get("wait", settings.STATUS_EVENTS_POLL_TIMEOUT))
+        except ValueError:
+            return Response(
+                {"error": "after and wait must be numbers"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        return after, min(max(wait, 0), settings.STATUS_EVENTS_POLL_TIMEOUT)
+
+    def respond(self, events, after):
+        return Response(
+            {
+                "events": events,
+                "last_event_id": events[-1]["id"] if events else after,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    def get(self, request):
+        try:
+            params = self.parse(request)
+            if isinstance(params, Response):
+                return params
+            after, wait = params
+            hub = get_hub()
+            if after is None:
+                return self.respond([], hub.latest_id())
+
+            events = hub.events_after(request.user.pk, after)
+            if events or not wait:
+                return self.respond(events, after)
+            listener = hub.listen(request.user.pk)
+            try:
+                # Published while the listener was being registered
+                events = hub.events_after(request.user.pk, after)
+                event = None if events else listener.get(wait)
+                while event is not None:
+                    if event["id"] > after:
+                        events.append(event)
+                    event = listener.get_nowait()
+            finally:
+                hub.unlisten(listener)
+            return self.respond(events, after)
+        except Exception as e:
+            capture_exception(e)
+            return Response(
+                {"message": "Something went wrong"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class AsyncStatusEventsEndpoint(AsyncAPIView, StatusEventsEndpoint):
+    """``StatusEventsEndpoint`` waiting on the event loop, so a pending poll
+    holds no thread"""
+
+    async def get(self, request):
+        try:
+            params = self.parse(request)
+            if isinstance(params, Response):
+                return params
+            after, wait = params
+            hub = get_hub()
+            if after is None:
+                latest_id = await sync_to_async(hub.latest_id, thread_sensitive=False)()
+                return self.respond([], latest_id)
+
+            events_after = sync_to_async(hub.events_after, thread_sensitive=False)
+            events = await events_after(request.user.pk, after)
+            if events or not wait:
+                return self.respond(events, after)
+            listener = hub.listen(request.user.pk, asyncio.get_running_loop())
+            try:
+                events = await events_after(request.user.pk, after)
+                event = None if events else await listener.aget(wait)
+                while event is not None:
+                    if event["id"] > after:
+                        events.append(event)
+                    event = listener.get_nowait()
+            finally:
+                hub.unlisten(listener)
+            return self.respond(events, after)
+        except Exception as e:
+            capture_exception(e)
+            return Response(
+                {"message": "Something went wrong"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class StatusEventStreamEndpoint(APIView):
+    """The same events as server-sent events; the stream ends after
+    ``STATUS_EVENTS_STREAM_TIMEOUT`` and the client reconnects with
+    ``Last-Event-ID``"""
+
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [FastJSONRenderer, EventStreamRenderer]
+
+    def get(self, request):
+        try:
+            try:
+                after = _last_event_id(request)
+            except ValueError:
+                return Response(
+                    {"error": "after must be a number"}, status=status.HTTP_400_BAD_REQUEST
+                )
+            if after is None:
+                after = get_hub().latest_id()
+            return event_stream_response(request.user.pk, after)
+        except Exception as e:
+            capture_exception(e)
+            return Response(
+                {"message": "Something went wrong"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
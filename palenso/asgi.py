@@ -0,0 +1,61 @@
+"""
+ASGI config for palenso project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+
+"""
+
+import os
+
+import django
+from asgiref.sync import ThreadSensitiveContext, sync_to_async
+from django.core.handlers.asgi import ASGIHandler
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE',
+                      'palenso.settings.production')
+os.environ.setdefault('ASYNC_VIEWS', '1')
+
+
+class StreamingASGIHandler(ASGIHandler):
+    """Django's handler, but a response with ``async_streaming_content``
+    is sent from that async iterator
+
+    Django 3.2 iterates streaming responses synchronously on the event
+    loop, so a stream that waits for data, like the status event stream,
+    would block every other request in the process.
+    """
+
+    async def send_response(self, response, send):
+        content = getattr(response, "async_streaming_content", None)
+        if content is None:
+            return await super().send_response(response, send)
+
+        headers = [
+            (header.encode("ascii"), value.encode("latin1"))
+            for header, value in response.items()
+        ]
+        headers.extend(
+            (b"Set-Cookie", cookie.output(header="").encode("ascii").strip())
+            for cookie in response.cookies.values()
+        )
+        await send({"type": "http.response.start", "status": response.status_code, "headers": headers})
+        try:
+            async for part in content:
+                if isinstance(part, str):
+                    part = part.encode(response.charset)
+                await send({"type": "http.response.body", "body": part, "more_body": True})
+            await send({"type": "http.response.body"})
+        finally:
+            await content.aclose()
+            await sync_to_async(response.close, thread_sensitive=True)()
+
+
+django.setup(set_prefix=False)
+django_application = StreamingASGIHandler()
+
+
+async def application(scope, receive, send):
+    # Django 3.2 runs all sync code (middleware, sync views, the ORM) on one
+    # shared thread unless each request opens its own context
+    async with ThreadSensitiveContext():
+        await django_application(scope, receive, send)
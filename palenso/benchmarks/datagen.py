@@ -0,0 +1,405 @@
+import random
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+from faker import Faker
+
+from palenso.benchmarks.utils import chunked
+from palenso.db.models import (
+    Company,
+    Education,
+    Event,
+    EventRegistration,
+    Interest,
+    Job,
+    JobApplication,
+    Profile,
+    Project,
+    Resume,
+    SavedJob,
+    Skill,
+    User,
+    WorkExperience,
+)
+from palenso.db.models.job import Interview, Offer
+from palenso.utils.taxonomy import LINKS, backfill_links
+
+BATCH_SIZE = 5000
+
+# Every bench user signs in with this password
+BENCH_PASSWORD = "bench-password"
+
+# Row counts at the smallest size; "100k" and "1m" multiply them by 10 and 100.
+# The name refers to the largest tables (applications and registrations).
+BASE_COUNTS = {
+    "students": 2000,
+    "companies": 100,
+    "jobs": 1000,
+    "applications": 10_000,
+    "interviews": 2000,
+    "offers": 500,
+    "saved_jobs": 5000,
+    "events": 200,
+    "registrations": 10_000,
+}
+
+SIZES = {"10k": 1, "100k": 10, "1m": 100}
+
+JOB_TYPES = ["full_time", "part_time", "contract", "internship"]
+EXPERIENCE_LEVELS = ["entry", "mid", "senior", "executive"]
+APPLICATION_STATUSES = ["pending", "reviewed", "shortlisted", "interviewed", "rejected", "hired"]
+INTERVIEW_TYPES = ["phone", "video", "in_person", "technical"]
+EVENT_TYPES = ["workshop", "seminar", "conference", "hackathon", "career_fair", "webinar"]
+REGISTRATION_STATUSES = ["registered", "confirmed", "attended", "cancelled", "no_show"]
+PROFICIENCY_LEVELS = ["beginner", "intermediate", "advanced", "expert"]
+COMPANY_SIZES = [choice for choice, _ in Company.COMPANY_SIZE_CHOICES]
+
+# One in this many students also gets a work experience, interest, project
+# and resume
+PROFILE_EXTRAS_EVERY = 4
+
+# Distinct values drawn from faker once; rows pick from these pools so that
+# generating a million rows does not call faker a million times
+POOL_SIZE = 500
+
+
+def get_counts(size):
+    factor = SIZES[size]
+    return {name: count * factor for name, count in BASE_COUNTS.items()}
+
+
+class DataGenerator:
+    """Deterministic synthetic dataset for benchmarks
+
+    The same ``seed`` and ``size`` always produce the same rows and primary
+    keys. Relations are laid out by index so unique constraints hold and so
+    ``bench_employer_0`` and ``bench_student_0`` always own related rows
+    (jobs, applications, interviews, offers, events, registrations) that
+    scenarios can use.
+    """
+
+    def __init__(self, size="10k", seed=42, log=None):
+        self.size = size
+        self.counts = get_counts(size)
+        self.rng = random.Random(seed)
+        self.fake = Faker()
+        self.fake.seed_instance(seed)
+        self.log = log or (lambda message: None)
+        self.now = timezone.now().replace(microsecond=0)
+
+        self.first_names = self._pool(self.fake.first_name)
+        self.last_names = self._pool(self.fake.last_name)
+        self.cities = self._pool(self.fake.city)
+        self.states = self._pool(self.fake.state, size=50)
+        self.company_names = self._pool(self.fake.company)
+        self.industries = self._pool(self.fake.bs, size=50)
+        self.job_titles = self._pool(self.fake.job)
+        self.sentences = self._pool(self.fake.sentence)
+        self.paragraphs = self._pool(lambda: self.fake.paragraph(nb_sentences=5))
+        self.skills = self._pool(self.fake.word, size=200)
+        self.universities = self._pool(lambda: f"{self.fake.city()} University", size=100)
+
+    def _pool(self, factory, size=POOL_SIZE):
+        return [factory() for _ in range(size)]
+
+    def _pick(self, pool):
+        return pool[self.rng.randrange(len(pool))]
+
+    def _uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _bulk_create(self, model, objects):
+        created = 0
+        for batch in chunked(objects, BATCH_SIZE):
+            model.objects.bulk_create(batch)
+            created += len(batch)
+        self.log(f"{model._meta.db_table}: {created}")
+        return created
+
+    def run(self):
+        counts = self.counts
+        self.password = make_password(BENCH_PASSWORD)
+
+        self.admin_id = self._uuid()
+        self.employer_ids = [self._uuid() for _ in range(counts["companies"])]
+        self.student_ids = [self._uuid() for _ in range(counts["students"])]
+        self.company_ids = [self._uuid() for _ in range(counts["companies"])]
+        self.job_ids = [self._uuid() for _ in range(counts["jobs"])]
+        self.event_ids = [self._uuid() for _ in range(counts["events"])]
+
+        self._create_users()
+        self._create_profiles()
+        self._bulk_create(Company, self._companies())
+        self._bulk_create(Job, self._jobs())
+
+        # Interviews and offers hang off the first applications only
+        self.application_ids = []
+        self._bulk_create(JobApplication, self._applications())
+        self._bulk_create(Interview, self._interviews())
+        self._bulk_create(Offer, self._offers())
+        self._bulk_create(SavedJob, self._saved_jobs())
+
+        self._bulk_create(Event, self._events())
+        self._bulk_create(EventRegistration, self._registrations())
+
+        # bulk_create skips the signals that keep the link tables in step
+        for name in LINKS:
+            links = backfill_links(name)
+            self.log(f"{name} links: {links}")
+        return {"size": self.size, **counts}
+
+    def _user(self, user_id, username, role):
+        first_name = self._pick(self.first_names)
+        last_name = self._pick(self.last_names)
+        return User(
+            id=user_id,
+            username=username,
+            email=f"{username}@bench.example.com",
+            first_name=first_name,
+            last_name=last_name,
+            role=role,
+            password=self.password,
+            is_email_verified=True,
+        )
+
+    def _create_users(self):
+        users = [self._user(self.admin_id, "bench_admin", "admin")]
+        users += [
+            self._user(user_id, f"bench_employer_{index}", "employer")
+            for index, user_id in enumerate(self.employer_ids)
+        ]
+        self._bulk_create(User, users)
+        self._bulk_create(
+            User,
+            (
+                self._user(user_id, f"bench_student_{index}", "student")
+                for index, user_id in enumerate(self.student_ids)
+            ),
+        )
+
+    def _create_profiles(self):
+        user_ids = [self.admin_id] + self.employer_ids + self.student_ids
+        self.profile_ids = {user_id: self._uuid() for user_id in user_ids}
+        self._bulk_create(
+            Profile,
+            (
+                Profile(
+                    id=self.profile_ids[user_id],
+                    user_id=user_id,
+                    bio=self._pick(self.sentences),
+                    city=self._pick(self.cities),
+                    state=self._pick(self.states),
+                    country="India",
+                )
+                for user_id in user_ids
+            ),
+        )
+        self._bulk_create(
+            Education,
+            (
+                Education(
+                    id=self._uuid(),
+                    profile_id=self.profile_ids[user_id],
+                    institution=self._pick(self.universities),
+                    degree="B.Tech",
+                    field_of_study=self._pick(self.skills).title(),
+                    start_date=(self.now - timedelta(days=1500)).date(),
+                    end_date=(self.now - timedelta(days=100)).date(),
+                )
+                for user_id in self.student_ids
+            ),
+        )
+        self._bulk_create(
+            Skill,
+            (
+                Skill(
+                    id=self._uuid(),
+                    profile_id=self.profile_ids[user_id],
+                    name=f"{self._pick(self.skills)} {index}",
+                    proficiency_level=self._pick(PROFICIENCY_LEVELS),
+                )
+                for user_id in self.student_ids
+                for index in range(2)
+            ),
+        )
+
+        profile_ids = [
+            self.profile_ids[user_id] for user_id in self.student_ids[::PROFILE_EXTRAS_EVERY]
+        ]
+        start_date = (self.now - timedelta(days=700)).date()
+        self._bulk_create(
+            WorkExperience,
+            (
+                WorkExperience(
+                    id=self._uuid(),
+                    profile_id=profile_id,
+                    company=self._pick(self.company_names),
+                    position=self._pick(self.job_titles)[:200],
+                    location=self._pick(self.cities),
+                    start_date=start_date,
+                    is_current=True,
+                )
+                for profile_id in profile_ids
+            ),
+        )
+        self._bulk_create(
+            Interest,
+            (
+                Interest(id=self._uuid(), profile_id=profile_id, name=self._pick(self.skills))
+                for profile_id in profile_ids
+            ),
+        )
+        self._bulk_create(
+            Project,
+            (
+                Project(
+                    id=self._uuid(),
+                    profile_id=profile_id,
+                    title=self._pick(self.sentences)[:200],
+                    description=self._pick(self.paragraphs),
+                    start_date=start_date,
+                )
+                for profile_id in profile_ids
+            ),
+        )
+        self._bulk_create(
+            Resume,
+            (
+                Resume(
+                    id=self._uuid(),
+                    profile_id=profile_id,
+                    title="Resume",
+                    file_url="https://bench.example.com/resume.pdf",
+                    is_primary=True,
+                )
+                for profile_id in profile_ids
+            ),
+        )
+
+    def _companies(self):
+        for index, company_id in enumerate(self.company_ids):
+            yield Company(
+                id=company_id,
+                employer_id=self.employer_ids[index],
+                name=self._pick(self.company_names),
+                description=self._pick(self.paragraphs),
+                industry=self._pick(self.industries)[:100],
+                company_size=self._pick(COMPANY_SIZES),
+                country="India",
+                state=self._pick(self.states),
+                city=self._pick(self.cities),
+                is_verified=self.rng.random() < 0.5,
+            )
+
+    def _jobs(self):
+        for index, job_id in enumerate(self.job_ids):
+            salary_min = self.rng.randrange(200, 2000) * 1000
+            yield Job(
+                id=job_id,
+                company_id=self.company_ids[index % len(self.company_ids)],
+                title=self._pick(self.job_titles)[:200],
+                description=self._pick(self.paragraphs),
+                requirements=self._pick(self.paragraphs),
+                responsibilities=self._pick(self.paragraphs),
+                job_type=self._pick(JOB_TYPES),
+                experience_level=self._pick(EXPERIENCE_LEVELS),
+                location=self._pick(self.cities),
+                is_remote=self.rng.random() < 0.3,
+                salary_min=Decimal(salary_min),
+                salary_max=Decimal(salary_min * 2),
+                salary_currency="INR",
+                required_skills=", ".join(self._pick(self.skills) for _ in range(4)),
+                category=self._pick(self.skills).title(),
+                application_deadline=(self.now + timedelta(days=self.rng.randrange(-30, 90))).date(),
+                is_featured=self.rng.random() < 0.1,
+            )
+
+    def _applications(self):
+        jobs = len(self.job_ids)
+        students = len(self.student_ids)
+        keep = max(self.counts["interviews"], self.counts["offers"])
+        for index in range(self.counts["applications"]):
+            application_id = self._uuid()
+            if index < keep:
+                self.application_ids.append((application_id, index % jobs))
+            yield JobApplication(
+                id=application_id,
+                job_id=self.job_ids[index % jobs],
+                applicant_id=self.student_ids[(index // jobs + index % jobs) % students],
+                cover_letter=self._pick(self.paragraphs),
+                status=self._pick(APPLICATION_STATUSES),
+                expected_salary=Decimal(self.rng.randrange(300, 3000) * 1000),
+            )
+
+    def _employer_for_job(self, job_index):
+        return self.employer_ids[job_index % len(self.company_ids)]
+
+    def _interviews(self):
+        for application_id, job_index in self.application_ids[: self.counts["interviews"]]:
+            yield Interview(
+                id=self._uuid(),
+                application_id=application_id,
+                interviewer_id=self._employer_for_job(job_index),
+                interview_type=self._pick(INTERVIEW_TYPES),
+                scheduled_at=self.now + timedelta(hours=self.rng.randrange(-500, 500)),
+                location=self._pick(self.cities),
+            )
+
+    def _offers(self):
+        for application_id, job_index in self.application_ids[: self.counts["offers"]]:
+            yield Offer(
+                id=self._uuid(),
+                application_id=application_id,
+                offered_by_id=self._employer_for_job(job_index),
+                position_title=self._pick(self.job_titles)[:200],
+                salary_amount=Decimal(self.rng.randrange(300, 3000) * 1000),
+                salary_currency="INR",
+                job_type=self._pick(JOB_TYPES),
+                start_date=(self.now + timedelta(days=60)).date(),
+                offer_deadline=(self.now + timedelta(days=14)).date(),
+            )
+
+    def _saved_jobs(self):
+        jobs = len(self.job_ids)
+        students = len(self.student_ids)
+        for index in range(self.counts["saved_jobs"]):
+            yield SavedJob(
+                id=self._uuid(),
+                job_id=self.job_ids[index % jobs],
+                student_id=self.student_ids[(index // jobs + index % jobs) % students],
+            )
+
+    def _events(self):
+        companies = len(self.company_ids)
+        for index, event_id in enumerate(self.event_ids):
+            start = self.now + timedelta(hours=self.rng.randrange(-720, 2160))
+            yield Event(
+                id=event_id,
+                organizer_id=self.employer_ids[index % companies],
+                company_id=self.company_ids[index % companies] if index % 2 == 0 else None,
+                title=self._pick(self.sentences)[:200],
+                description=self._pick(self.paragraphs),
+                event_type=self._pick(EVENT_TYPES),
+                start_date=start,
+                end_date=start + timedelta(hours=3),
+                registration_deadline=start - timedelta(days=1),
+                location=self._pick(self.cities),
+                is_virtual=self.rng.random() < 0.4,
+                max_participants=self.rng.choice([None, 50, 100, 500]),
+                registration_fee=Decimal(self.rng.choice([0, 0, 199, 499])),
+                tags=", ".join(self._pick(self.skills) for _ in range(3)),
+            )
+
+    def _registrations(self):
+        events = len(self.event_ids)
+        students = len(self.student_ids)
+        for index in range(self.counts["registrations"]):
+            yield EventRegistration(
+                id=self._uuid(),
+                event_id=self.event_ids[index % events],
+                participant_id=self.student_ids[(index // events + index % events) % students],
+                status=self._pick(REGISTRATION_STATUSES),
+            )
@@ -0,0 +1,368 @@
+import json
+import random
+import statistics
+import threading
+import time
+from datetime import timedelta
+
+from django.utils import timezone
+
+from palenso.benchmarks.datagen import BENCH_PASSWORD
+from palenso.benchmarks.utils import http_request
+from palenso.db.models import Event, Job, JobApplication, SavedJob, User
+
+# Share of virtual users per role, an assumed mix of mostly students;
+# pass --mix to match the traffic being tested
+DEFAULT_MIX = {"student": 80, "employer": 15, "admin": 5}
+
+# Consecutive concurrency levels whose throughput differs by less than this
+# are considered saturated
+SATURATION_GAIN = 0.10
+
+# Error rate (5xx and connection failures) that counts as saturated
+SATURATION_ERROR_RATE = 0.01
+
+CATALOG_SIZE = 1000
+
+
+def browse_jobs(vu):
+    return "GET", "/api/jobs?profile=card", None
+
+
+def search_jobs(vu):
+    return "GET", "/api/jobs?profile=card&search=" + vu.rng.choice(["dev", "eng", "man", "ana"]), None
+
+
+def view_job(vu):
+    return "GET", f"/api/jobs/{vu.rng.choice(vu.catalog['jobs'])}", None
+
+
+def browse_events(vu):
+    return "GET", "/api/events?profile=card", None
+
+
+def fresh_job(vu, taken):
+    """A job this user has not saved or applied to yet; both are unique
+    per student, and repeating one only measures the 500 it raises"""
+    for _ in range(20):
+        job_id = vu.rng.choice(vu.catalog["jobs"])
+        if job_id not in taken:
+            taken.add(job_id)
+            return job_id
+    return None
+
+
+def save_job(vu):
+    job_id = fresh_job(vu, vu.saved)
+    if job_id is None:
+        return browse_jobs(vu)
+    return "POST", "/api/saved-jobs", {"job_id": job_id}
+
+
+def apply_to_job(vu):
+    job_id = fresh_job(vu, vu.applied)
+    if job_id is None:
+        return browse_jobs(vu)
+    return (
+        "POST",
+        "/api/job-applications",
+        {"job": job_id, "cover_letter": "Load test application"},
+    )
+
+
+def my_applications(vu):
+    return "GET", "/api/job-applications", None
+
+
+def dashboard_info(vu):
+    return "GET", "/api/dashboard-info", None
+
+
+def dashboard_analytics(vu):
+    return "GET", "/api/dashboard-analytics", None
+
+
+def review_applications(vu):
+    return "GET", "/api/job-applications", None
+
+
+def view_application(vu):
+    return "GET", f"/api/job-applications/{vu.rng.choice(vu.applications)}", None
+
+
+def update_application(vu):
+    return (
+        "PUT",
+        f"/api/job-applications/{vu.rng.choice(vu.applications)}",
+        {"status": vu.rng.choice(["reviewed", "shortlisted", "interviewed"])},
+    )
+
+
+def schedule_interview(vu):
+    scheduled_at = timezone.now() + timedelta(days=vu.rng.randrange(1, 30))
+    return (
+        "POST",
+        "/api/interviews",
+        {
+            "application_id": vu.rng.choice(vu.applications),
+            "interview_type": "video",
+            "scheduled_at": scheduled_at.isoformat(),
+        },
+    )
+
+
+def list_interviews(vu):
+    return "GET", "/api/interviews", None
+
+
+def list_users(vu):
+    return "GET", "/api/users", None
+
+
+def event_registrations(vu):
+    return "GET", "/api/event-registrations", None
+
+
+# (weight, action) per role; weights are relative within a role
+PROFILES = {
+    "student": [
+        (30, browse_jobs),
+        (10, search_jobs),
+        (20, view_job),
+        (10, browse_events),
+        (8, save_job),
+        (4, apply_to_job),
+        (8, my_applications),
+        (10, dashboard_info),
+    ],
+    "employer": [
+        (30, review_applications),
+        (20, view_application),
+        (10, update_application),
+        (5, schedule_interview),
+        (10, list_interviews),
+        (15, dashboard_info),
+        (10, dashboard_analytics),
+    ],
+    "admin": [
+        (35, dashboard_analytics),
+        (35, dashboard_info),
+        (15, list_users),
+        (15, event_registrations),
+    ],
+}
+
+
+def parse_mix(value):
+    """Parse ``student=80,employer=15,admin=5``"""
+    mix = {}
+    for part in value.split(","):
+        role, _, weight = part.partition("=")
+        if role.strip() not in PROFILES:
+            raise ValueError(f"Unknown role {role!r}")
+        mix[role.strip()] = float(weight)
+    return mix
+
+
+def load_catalog():
+    """Ids the actions pick from, read once before any thread starts"""
+    return {
+        "jobs": [str(pk) for pk in Job.objects.values_list("id", flat=True)[:CATALOG_SIZE]],
+        "events": [str(pk) for pk in Event.objects.values_list("id", flat=True)[:CATALOG_SIZE]],
+    }
+
+
+class TokenCache:
+    """Access tokens per user, obtained once through SignInEndpoint and
+    shared by every virtual user and concurrency level"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.tokens = {}
+        self.lock = threading.Lock()
+
+    def get(self, user):
+        with self.lock:
+            token = self.tokens.get(user.username)
+        if token is None:
+            token = self.sign_in(user)
+        return token
+
+    def sign_in(self, user):
+        _, status, body, _ = http_request(
+            self.base_url,
+            "POST",
+            "/api/auth/signin",
+            {"email": user.email, "password": BENCH_PASSWORD},
+        )
+        if status != 200:
+            raise RuntimeError(f"Signing in as {user.username} failed with status {status}")
+        token = json.loads(body)["access_token"]
+        with self.lock:
+            self.tokens[user.username] = token
+        return token
+
+    def invalidate(self, user):
+        with self.lock:
+            self.tokens.pop(user.username, None)
+
+
+class VirtualUser:
+    def __init__(self, index, role, user, catalog, seed, applications=(), saved=(), applied=()):
+        self.index = index
+        self.role = role
+        self.user = user
+        self.catalog = catalog
+        self.applications = list(applications)
+        self.saved = set(saved)
+        self.applied = set(applied)
+        self.rng = random.Random(seed * 100_003 + index)
+
+        actions = PROFILES[role]
+        if role == "employer" and not self.applications:
+            # Employers without applications only browse
+            actions = [
+                (weight, action)
+                for weight, action in actions
+                if action not in (view_application, update_application, schedule_interview)
+            ]
+        self.weights = [weight for weight, _ in actions]
+        self.actions = [action for _, action in actions]
+        self.samples = []
+
+    def run(self, base_url, tokens, deadline, think_time):
+        while time.perf_counter() < deadline:
+            action = self.rng.choices(self.actions, weights=self.weights)[0]
+            method, path, data = action(self)
+            token = tokens.get(self.user)
+            try:
+                elapsed, status, _, _ = http_request(base_url, method, path, data, token)
+                if status == 401:
+                    tokens.invalidate(self.user)
+            except OSError:
+                elapsed, status = None, None
+            self.samples.append((action.__name__, elapsed, status))
+            if think_time:
+                time.sleep(think_time)
+
+
+def build_virtual_users(count, mix, catalog, seed):
+    """Assign roles by the traffic mix and a distinct bench user to each"""
+    rng = random.Random(seed)
+    roles = list(mix)
+    weights = [mix[role] for role in roles]
+    per_role = {role: 0 for role in roles}
+
+    assignments = []
+    for index in range(count):
+        role = rng.choices(roles, weights=weights)[0]
+        assignments.append((index, role, per_role[role]))
+        per_role[role] += 1
+
+    users = {}
+    for role, needed in per_role.items():
+        if role == "admin":
+            # There is a single bench admin
+            users[role] = list(User.objects.filter(username="bench_admin")) * max(needed, 1)
+            continue
+        usernames = [f"bench_{role}_{index}" for index in range(needed)]
+        found = {user.username: user for user in User.objects.filter(username__in=usernames)}
+        users[role] = [found[username] for username in usernames if username in found]
+        if len(users[role]) < needed:
+            raise ValueError(f"The dataset has fewer than {needed} {role} users; seed a larger size")
+
+    virtual_users = []
+    for index, role, offset in assignments:
+        user = users[role][offset]
+        history = {}
+        if role == "employer":
+            history["applications"] = [
+                str(pk)
+                for pk in JobApplication.objects.filter(job__company__employer=user).values_list(
+                    "id", flat=True
+                )[:200]
+            ]
+        elif role == "student":
+            history["saved"] = [
+                str(pk) for pk in SavedJob.objects.filter(student=user).values_list("job_id", flat=True)
+            ]
+            history["applied"] = [
+                str(pk)
+                for pk in JobApplication.objects.filter(applicant=user).values_list("job_id", flat=True)
+            ]
+        virtual_users.append(VirtualUser(index, role, user, catalog, seed, **history))
+    return virtual_users
+
+
+def summarize_level(concurrency, virtual_users, duration):
+    samples = [sample for vu in virtual_users for sample in vu.samples]
+    latencies = sorted(elapsed for _, elapsed, status in samples if elapsed is not None)
+    errors = sum(1 for _, _, status in samples if status is None or status >= 500)
+    client_errors = sum(1 for _, _, status in samples if status is not None and 400 <= status < 500)
+
+    def percentile(values, fraction):
+        if not values:
+            return None
+        return round(values[min(len(values) - 1, int(fraction * len(values)))], 2)
+
+    actions = {}
+    for name in sorted({name for name, _, _ in samples}):
+        action_latencies = sorted(
+            elapsed for action, elapsed, _ in samples if action == name and elapsed is not None
+        )
+        actions[name] = {
+            "requests": sum(1 for action, _, _ in samples if action == name),
+            "errors": sum(
+                1
+                for action, _, status in samples
+                if action == name and (status is None or status >= 500)
+            ),
+            "p50_ms": percentile(action_latencies, 0.50),
+            "p95_ms": percentile(action_latencies, 0.95),
+        }
+
+    return {
+        "concurrency": concurrency,
+        "roles": {
+            role: sum(1 for vu in virtual_users if vu.role == role)
+            for role in PROFILES
+        },
+        "requests": len(samples),
+        "rps": round(len(samples) / duration, 1),
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "mean_ms": round(statistics.mean(latencies), 2) if latencies else None,
+        "error_rate": round(errors / len(samples), 4) if samples else None,
+        "client_errors": client_errors,
+        "actions": actions,
+    }
+
+
+def find_saturation(levels):
+    """First concurrency at which adding users stops adding throughput or
+    starts producing errors"""
+    for previous, current in zip(levels, levels[1:]):
+        if (current["error_rate"] or 0) > SATURATION_ERROR_RATE:
+            return current["concurrency"]
+        if current["rps"] < previous["rps"] * (1 + SATURATION_GAIN):
+            return previous["concurrency"]
+    return None
+
+
+def run_level(base_url, tokens, concurrency, mix, catalog, seed, duration, think_time):
+    virtual_users = build_virtual_users(concurrency, mix, catalog, seed)
+    # Sign everyone in before the clock starts
+    for vu in virtual_users:
+        tokens.get(vu.user)
+
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=vu.run, args=(base_url, tokens, deadline, think_time), daemon=True)
+        for vu in virtual_users
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize_level(concurrency, virtual_users, duration)
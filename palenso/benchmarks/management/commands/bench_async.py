@@ -0,0 +1,99 @@
+import json
+import platform
+import time
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from palenso.benchmarks.management.commands.bench_endpoints import git_revision
+from palenso.benchmarks.management.commands.bench_load import parse_levels
+from palenso.benchmarks.upstream import DEFAULT_UPSTREAM_DELAY, run_upstream_level
+from palenso.benchmarks.utils import serve, server_env
+from palenso.db.models import User
+
+SERVERS = {
+    "wsgi": ["gunicorn", "palenso.wsgi"],
+    "asgi": [
+        "gunicorn",
+        "palenso.asgi:application",
+        "--worker-class",
+        "uvicorn.workers.UvicornWorker",
+    ],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare gunicorn sync workers with the ASGI deployment on an endpoint "
+        "that waits on a slow upstream (password reset email with a simulated "
+        "SMTP delay). Requires the bench_seed dataset."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument("--concurrency", default="1,8,32")
+        parser.add_argument("--duration", type=float, default=10, help="Seconds per level")
+        parser.add_argument(
+            "--delay",
+            type=float,
+            default=DEFAULT_UPSTREAM_DELAY,
+            help="Seconds each simulated email delivery takes",
+        )
+        parser.add_argument("--servers", default="wsgi,asgi")
+        parser.add_argument("--output", help="Write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        servers = options["servers"].split(",")
+        unknown = set(servers) - set(SERVERS)
+        if unknown:
+            raise CommandError(f"Unknown servers: {', '.join(sorted(unknown))}")
+
+        emails = list(
+            User.objects.filter(username__startswith="bench_student_")
+            .order_by("username")
+            .values_list("email", flat=True)[:1000]
+        )
+        if not emails:
+            raise CommandError("Run bench_seed against this database first")
+
+        env = server_env(BENCH_UPSTREAM_DELAY=str(options["delay"]))
+        started = time.perf_counter()
+        runs = {}
+        for server in servers:
+            levels = []
+            command = SERVERS[server] + ["--workers", str(options["workers"])]
+            with serve(command, env=env) as base_url:
+                for concurrency in parse_levels(options["concurrency"]):
+                    self.stderr.write(f"{server} concurrency={concurrency}")
+                    result = run_upstream_level(base_url, emails, concurrency, options["duration"])
+                    self.stderr.write(
+                        f"  {result['rps']} req/s, p95 {result['p95_ms']} ms, "
+                        f"errors {result['errors']}"
+                    )
+                    levels.append(result)
+            runs[server] = levels
+
+        report = {
+            "meta": {
+                "revision": git_revision(),
+                "created_at": timezone.now().isoformat(),
+                "endpoint": "/api/auth/forgot-password",
+                "workers": options["workers"],
+                "delay": options["delay"],
+                "duration": options["duration"],
+                "seconds": round(time.perf_counter() - started, 2),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": settings.DATABASES["default"]["ENGINE"],
+            },
+            "runs": runs,
+        }
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as report_file:
+                report_file.write(output + "\n")
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,107 @@
+import json
+import random
+import statistics
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from palenso.utils.autocomplete import PrefixIndex
+
+WORDS = [
+    "senior", "junior", "lead", "principal", "staff", "associate", "software",
+    "data", "product", "backend", "frontend", "full", "stack", "mobile", "cloud",
+    "security", "machine", "learning", "platform", "site", "reliability", "quality",
+    "engineer", "developer", "analyst", "scientist", "manager", "designer",
+    "architect", "consultant", "intern", "specialist", "administrator", "tester",
+]
+
+
+def percentile(timings, fraction):
+    ordered = sorted(timings)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Build an autocomplete prefix index over --values generated job "
+        "titles and time top-10 lookups for prefixes of 1 to 8 characters."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--values", type=int, default=300_000, help="Distinct values")
+        parser.add_argument("--lookups", type=int, default=20_000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--output", help="Write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        counts = self._values(rng, options["values"])
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        index = PrefixIndex(counts)
+        build_seconds = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        values = list(counts)
+        results = []
+        for length in range(1, 9):
+            prefixes = [
+                rng.choice(values)[:length] for _ in range(options["lookups"] // 8)
+            ]
+            timings = []
+            for prefix in prefixes:
+                started = time.perf_counter()
+                index.lookup(prefix, 10)
+                timings.append((time.perf_counter() - started) * 1000)
+            results.append(
+                {
+                    "prefix_length": length,
+                    "p50_ms": round(statistics.median(timings), 3),
+                    "p99_ms": round(percentile(timings, 0.99), 3),
+                    "max_ms": round(max(timings), 3),
+                }
+            )
+            self.stderr.write(
+                f"prefix length {length}: p50 {results[-1]['p50_ms']} ms, "
+                f"p99 {results[-1]['p99_ms']} ms"
+            )
+
+        timings = []
+        for value in rng.sample(values, min(1000, len(values))):
+            started = time.perf_counter()
+            index.apply(value + " ii", 1)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        report = {
+            "meta": {
+                "values": len(counts),
+                "keys": len(index.keys),
+                "precomputed_prefixes": len(index.top),
+                "build_seconds": round(build_seconds, 2),
+                "build_peak_mb": round(peak / 2**20, 1),
+                "seed": options["seed"],
+            },
+            "lookups": results,
+            "apply_new_value": {
+                "p50_ms": round(statistics.median(timings), 3),
+                "p99_ms": round(percentile(timings, 0.99), 3),
+            },
+        }
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as report_file:
+                report_file.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    def _values(self, rng, count):
+        # Zipf-like row counts per value, like titles posted by many companies
+        counts = {}
+        while len(counts) < count:
+            words = rng.sample(WORDS, rng.randint(2, 4))
+            value = " ".join(words).title() + f" {rng.randint(1, count // 100 + 1)}"
+            counts[value] = int(1 / rng.random())
+        return counts
@@ -0,0 +1,121 @@
+import json
+import platform
+import subprocess
+import time
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from django.utils import timezone
+
+from palenso.benchmarks.datagen import SIZES, DataGenerator
+from palenso.benchmarks.scenarios import (
+    SCENARIOS,
+    SKIPPED_ROUTES,
+    HTTPRunner,
+    TestClientRunner,
+    load_fixtures,
+    run_scenarios,
+    uncovered_routes,
+)
+from palenso.benchmarks.utils import benchmark_database
+
+
+def git_revision():
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "HEAD"], cwd=settings.BASE_DIR, stderr=subprocess.DEVNULL
+            )
+            .decode()
+            .strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Run every API route scenario against a seeded dataset and emit latency "
+        "percentiles, queries per request and response bytes as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", choices=list(SIZES), default="10k")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument(
+            "--match",
+            action="append",
+            help="Only run scenarios whose name contains this text (repeatable)",
+        )
+        parser.add_argument(
+            "--base-url",
+            help=(
+                "Benchmark a running server (e.g. a local gunicorn) instead of the "
+                "test client. The configured database must hold the bench_seed "
+                "dataset; unsafe scenarios are skipped."
+            ),
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        scenarios = SCENARIOS
+        if options["match"]:
+            scenarios = [
+                scenario
+                for scenario in scenarios
+                if any(text in scenario.name for text in options["match"])
+            ]
+        if options["base_url"]:
+            scenarios = [scenario for scenario in scenarios if scenario.safe]
+        if not scenarios:
+            raise CommandError("No scenarios selected")
+
+        started = time.perf_counter()
+        if options["base_url"]:
+            runner = HTTPRunner(load_fixtures(), options["base_url"])
+            results = run_scenarios(
+                runner, scenarios, options["iterations"], options["warmup"], log=self.stderr.write
+            )
+            dataset = None
+        else:
+            # Every scenario comes from one client address
+            with benchmark_database(), override_settings(RATE_LIMITS={}):
+                dataset = DataGenerator(
+                    size=options["size"], seed=options["seed"], log=self.stderr.write
+                ).run()
+                runner = TestClientRunner(load_fixtures())
+                results = run_scenarios(
+                    runner, scenarios, options["iterations"], options["warmup"], log=self.stderr.write
+                )
+
+        report = {
+            "meta": {
+                "revision": git_revision(),
+                "created_at": timezone.now().isoformat(),
+                "runner": "http" if options["base_url"] else "test_client",
+                "base_url": options["base_url"],
+                "size": options["size"],
+                "seed": options["seed"],
+                "dataset": dataset,
+                "iterations": options["iterations"],
+                "warmup": options["warmup"],
+                "seconds": round(time.perf_counter() - started, 2),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": settings.DATABASES["default"]["ENGINE"],
+            },
+            "results": results,
+            "skipped_routes": SKIPPED_ROUTES,
+            "uncovered_routes": uncovered_routes(),
+        }
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as report_file:
+                report_file.write(output + "\n")
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,194 @@
+import gc
+import json
+import math
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from palenso.benchmarks.utils import benchmark_database, chunked, current_rss_mb
+from palenso.db.models import Company, Event, EventRegistration, Job, JobApplication, User
+
+BATCH_SIZE = 5000
+
+EXPORT_URLS = {
+    "registrations": "/api/event-registrations/export",
+    "applications": "/api/job-applications/export",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway database with N registrations or applications, stream "
+        "them through the export endpoint and report throughput and RSS growth."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument(
+            "--target", choices=sorted(EXPORT_URLS), default="registrations"
+        )
+        parser.add_argument("--file-type", choices=["csv", "ndjson"], default="csv")
+        parser.add_argument(
+            "--parents",
+            type=int,
+            default=1000,
+            help="Number of events (or jobs) the rows are spread over",
+        )
+        parser.add_argument(
+            "--max-rss-growth-mb",
+            type=float,
+            default=None,
+            help="Fail if RSS grows by more than this while streaming",
+        )
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            admin = User.objects.create_user(
+                username="bench_admin", password=None, role="admin"
+            )
+            seed_started = time.perf_counter()
+            if options["target"] == "registrations":
+                self._seed_registrations(options["rows"], options["parents"])
+            else:
+                self._seed_applications(options["rows"], options["parents"])
+            seed_seconds = time.perf_counter() - seed_started
+
+            result = self._export(admin, options)
+            result["seed_seconds"] = round(seed_seconds, 2)
+
+        self.stdout.write(json.dumps(result, indent=2))
+
+        limit = options["max_rss_growth_mb"]
+        if limit is not None and result["rss_growth_mb"] > limit:
+            raise CommandError(
+                f"RSS grew by {result['rss_growth_mb']} MB, limit is {limit} MB"
+            )
+
+    def _export(self, admin, options):
+        client = APIClient()
+        client.force_authenticate(admin)
+
+        gc.collect()
+        rss_start = rss_peak = current_rss_mb()
+        started = time.perf_counter()
+
+        response = client.get(
+            EXPORT_URLS[options["target"]], {"file_type": options["file_type"]}
+        )
+        if response.status_code != 200:
+            raise CommandError(f"Export failed with status {response.status_code}")
+
+        total_bytes = 0
+        lines = 0
+        for index, chunk in enumerate(response.streaming_content):
+            total_bytes += len(chunk)
+            lines += chunk.count(b"\n")
+            if index % 50 == 0:
+                rss_peak = max(rss_peak, current_rss_mb())
+
+        elapsed = time.perf_counter() - started
+        rss_peak = max(rss_peak, current_rss_mb())
+        rows = lines - 1 if options["file_type"] == "csv" else lines
+
+        return {
+            "target": options["target"],
+            "file_type": options["file_type"],
+            "rows": rows,
+            "bytes": total_bytes,
+            "seconds": round(elapsed, 2),
+            "rows_per_second": round(rows / elapsed) if elapsed else None,
+            "rss_start_mb": round(rss_start, 1),
+            "rss_peak_mb": round(rss_peak, 1),
+            "rss_growth_mb": round(rss_peak - rss_start, 1),
+        }
+
+    def _create_users(self, count, prefix):
+        users = (
+            User(
+                username=f"{prefix}_{index}",
+                email=f"{prefix}_{index}@example.com",
+                first_name="Bench",
+                last_name=str(index),
+                password="!",
+            )
+            for index in range(count)
+        )
+        for batch in chunked(users, BATCH_SIZE):
+            User.objects.bulk_create(batch)
+        return list(
+            User.objects.filter(username__startswith=f"{prefix}_").values_list(
+                "id", flat=True
+            )
+        )
+
+    def _seed_registrations(self, rows, parents):
+        organizer = User.objects.create_user(username="bench_organizer", role="employer")
+        now = timezone.now()
+        events = [
+            Event(
+                id=uuid.uuid4(),
+                organizer=organizer,
+                title=f"Event {index}",
+                description="Benchmark event",
+                event_type="career_fair",
+                start_date=now,
+                end_date=now,
+                location="Bangalore",
+            )
+            for index in range(parents)
+        ]
+        Event.objects.bulk_create(events, batch_size=BATCH_SIZE)
+
+        participant_ids = self._create_users(math.ceil(rows / parents), "participant")
+        registrations = (
+            EventRegistration(
+                event_id=events[index % parents].id,
+                participant_id=participant_ids[index // parents],
+            )
+            for index in range(rows)
+        )
+        for batch in chunked(registrations, BATCH_SIZE):
+            EventRegistration.objects.bulk_create(batch)
+
+    def _seed_applications(self, rows, parents):
+        employer = User.objects.create_user(username="bench_employer", role="employer")
+        company = Company.objects.create(
+            employer=employer,
+            name="Bench Corp",
+            description="Benchmark company",
+            industry="Software",
+            company_size="1000+",
+            country="India",
+            state="Karnataka",
+            city="Bangalore",
+        )
+        jobs = [
+            Job(
+                id=uuid.uuid4(),
+                company=company,
+                title=f"Job {index}",
+                description="Benchmark job",
+                requirements="",
+                responsibilities="",
+                job_type="full_time",
+                experience_level="entry",
+                location="Bangalore",
+            )
+            for index in range(parents)
+        ]
+        Job.objects.bulk_create(jobs, batch_size=BATCH_SIZE)
+
+        applicant_ids = self._create_users(math.ceil(rows / parents), "applicant")
+        applications = (
+            JobApplication(
+                job_id=jobs[index % parents].id,
+                applicant_id=applicant_ids[index // parents],
+                cover_letter="I would like to apply.",
+            )
+            for index in range(rows)
+        )
+        for batch in chunked(applications, BATCH_SIZE):
+            JobApplication.objects.bulk_create(batch)
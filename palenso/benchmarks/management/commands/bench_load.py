@@ -0,0 +1,142 @@
+import json
+import platform
+import time
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from palenso.benchmarks.loadtest import (
+    DEFAULT_MIX,
+    TokenCache,
+    find_saturation,
+    load_catalog,
+    parse_mix,
+    run_level,
+)
+from palenso.benchmarks.management.commands.bench_endpoints import git_revision
+from palenso.benchmarks.utils import serve, server_env
+from palenso.db.models import User
+
+
+def parse_levels(value):
+    try:
+        levels = [int(level) for level in value.split(",")]
+    except ValueError:
+        raise CommandError(f"Expected a comma separated list of integers, got {value!r}")
+    if not levels or min(levels) < 1:
+        raise CommandError("Levels must be positive integers")
+    return sorted(set(levels))
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive a live server with concurrent students, employers and admins in a "
+        "given traffic mix (80/15/5 by default, an assumption), and report "
+        "throughput, latency percentiles and the saturation point per worker "
+        "count. Requires the bench_seed dataset."
+    )
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument("--base-url", help="Load an already running server")
+        target.add_argument(
+            "--workers",
+            help="Start gunicorn once per worker count, e.g. 1,2,4, and load each",
+        )
+        parser.add_argument("--concurrency", default="1,2,4,8,16,32")
+        parser.add_argument("--duration", type=float, default=20, help="Seconds per level")
+        parser.add_argument(
+            "--mix",
+            default=",".join(f"{role}={weight}" for role, weight in DEFAULT_MIX.items()),
+            help="Share of virtual users per role",
+        )
+        parser.add_argument(
+            "--think-time", type=float, default=0, help="Seconds each user waits between requests"
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--output", help="Write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        if not User.objects.filter(username="bench_admin").exists():
+            raise CommandError("Run bench_seed against this database first")
+        try:
+            mix = parse_mix(options["mix"])
+        except ValueError as e:
+            raise CommandError(str(e))
+        concurrency = parse_levels(options["concurrency"])
+        catalog = load_catalog()
+
+        started = time.perf_counter()
+        runs = []
+        if options["base_url"]:
+            base_url = options["base_url"].rstrip("/")
+            runs.append(self.load(base_url, None, concurrency, mix, catalog, options))
+        else:
+            for workers in parse_levels(options["workers"]):
+                runs.append(self.load_gunicorn(workers, concurrency, mix, catalog, options))
+
+        database = settings.DATABASES["default"]
+        report = {
+            "meta": {
+                "revision": git_revision(),
+                "created_at": timezone.now().isoformat(),
+                "mix": mix,
+                "duration": options["duration"],
+                "think_time": options["think_time"],
+                "seed": options["seed"],
+                "seconds": round(time.perf_counter() - started, 2),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": database["ENGINE"],
+                "conn_max_age": database.get("CONN_MAX_AGE", 0),
+            },
+            "runs": runs,
+        }
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as report_file:
+                report_file.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    def load_gunicorn(self, workers, concurrency, mix, catalog, options):
+        command = ["gunicorn", "palenso.wsgi", "--workers", str(workers)]
+        with serve(command, env=server_env()) as base_url:
+            return self.load(base_url, workers, concurrency, mix, catalog, options)
+
+    def load(self, base_url, workers, concurrency, mix, catalog, options):
+        tokens = TokenCache(base_url)
+        levels = []
+        for level in concurrency:
+            self.stderr.write(f"workers={workers or '?'} concurrency={level}")
+            try:
+                result = run_level(
+                    base_url,
+                    tokens,
+                    level,
+                    mix,
+                    catalog,
+                    options["seed"],
+                    options["duration"],
+                    options["think_time"],
+                )
+            except (RuntimeError, ValueError) as e:
+                raise CommandError(str(e))
+            self.stderr.write(
+                f"  {result['rps']} req/s, p95 {result['p95_ms']} ms, "
+                f"errors {result['error_rate']}"
+            )
+            levels.append(result)
+
+        best = max(levels, key=lambda result: result["rps"])
+        return {
+            "base_url": base_url,
+            "workers": workers,
+            "levels": levels,
+            "saturation_concurrency": find_saturation(levels),
+            "peak_rps": best["rps"],
+            "peak_concurrency": best["concurrency"],
+        }
@@ -0,0 +1,167 @@
+import json
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from palenso.api.renderers import FastJSONRenderer
+from palenso.api.serializers.event import EventSerializer
+from palenso.api.serializers.job import JobSerializer
+from palenso.api.serializers.people import UserSerializer
+from palenso.benchmarks.utils import benchmark_database, chunked
+from palenso.db.models import Company, Event, Job, User
+
+BATCH_SIZE = 5000
+
+# (serializer, model, ordering, serializer kwargs) rendered by each list endpoint
+ENDPOINTS = {
+    "jobs": (JobSerializer, Job, "-created_at", {"profile": "card"}),
+    "events": (EventSerializer, Event, "-start_date", {"profile": "card"}),
+    "users": (UserSerializer, User, "-date_joined", {}),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare list rendering through the stock serializer and JSONRenderer, "
+        "the serializer with FastJSONRenderer, and row projection with "
+        "FastJSONRenderer."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=10)
+        parser.add_argument(
+            "--endpoint",
+            action="append",
+            choices=sorted(ENDPOINTS),
+            help="Limit the run to these endpoints (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        endpoints = options["endpoint"] or sorted(ENDPOINTS)
+        results = []
+
+        with benchmark_database():
+            self._seed(options["rows"])
+            for name in endpoints:
+                results.append(self._measure(name, options["repeat"]))
+
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def _measure(self, name, repeat):
+        serializer_class, model, ordering, kwargs = ENDPOINTS[name]
+        queryset = model.objects.order_by(ordering)
+
+        projection = serializer_class.get_row_projection(**kwargs)
+        if projection is None:
+            raise CommandError(f"{name} cannot be rendered from a row projection")
+
+        def stock():
+            data = serializer_class(
+                serializer_class.setup_queryset(queryset, **kwargs), many=True, **kwargs
+            ).data
+            return JSONRenderer().render(data)
+
+        def serializer_fast():
+            data = serializer_class(
+                serializer_class.setup_queryset(queryset, **kwargs), many=True, **kwargs
+            ).data
+            return FastJSONRenderer().render(data)
+
+        def projection_fast():
+            return FastJSONRenderer().render(projection.rows(projection.apply(queryset)))
+
+        baseline = json.loads(stock())
+        if json.loads(projection_fast()) != baseline:
+            raise CommandError(f"{name}: projection output differs from the serializer")
+
+        result = {"endpoint": name, "rows": len(baseline)}
+        for label, func in (
+            ("serializer_json", stock),
+            ("serializer_orjson", serializer_fast),
+            ("projection_orjson", projection_fast),
+        ):
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                payload = func()
+                timings.append((time.perf_counter() - started) * 1000)
+            result[label] = {
+                "median_ms": round(statistics.median(timings), 2),
+                "min_ms": round(min(timings), 2),
+                "bytes": len(payload),
+            }
+
+        stock_ms = result["serializer_json"]["median_ms"]
+        fast_ms = result["projection_orjson"]["median_ms"]
+        result["speedup"] = round(stock_ms / fast_ms, 1) if fast_ms else None
+        return result
+
+    def _seed(self, rows):
+        employer = User.objects.create_user(username="bench_employer", role="employer")
+        company = Company.objects.create(
+            employer=employer,
+            name="Bench Corp",
+            description="Benchmark company",
+            industry="Software",
+            company_size="1000+",
+            country="India",
+            state="Karnataka",
+            city="Bangalore",
+        )
+        now = timezone.now()
+
+        jobs = (
+            Job(
+                id=uuid.uuid4(),
+                company=company,
+                title=f"Job {index}",
+                description="Benchmark job",
+                requirements="",
+                responsibilities="",
+                job_type="full_time",
+                experience_level="entry",
+                location="Bangalore",
+                salary_min=300000,
+                salary_max=900000,
+                application_deadline=now.date(),
+            )
+            for index in range(rows)
+        )
+        for batch in chunked(jobs, BATCH_SIZE):
+            Job.objects.bulk_create(batch)
+
+        events = (
+            Event(
+                id=uuid.uuid4(),
+                organizer=employer,
+                company=company if index % 2 else None,
+                title=f"Event {index}",
+                description="Benchmark event",
+                event_type="career_fair",
+                start_date=now,
+                end_date=now,
+                registration_deadline=now,
+                location="Bangalore",
+            )
+            for index in range(rows)
+        )
+        for batch in chunked(events, BATCH_SIZE):
+            Event.objects.bulk_create(batch)
+
+        users = (
+            User(
+                username=f"user_{index}",
+                email=f"user_{index}@example.com",
+                first_name="Bench",
+                last_name=str(index),
+                password="!",
+            )
+            for index in range(rows)
+        )
+        for batch in chunked(users, BATCH_SIZE):
+            User.objects.bulk_create(batch)
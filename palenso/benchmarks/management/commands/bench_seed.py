@@ -0,0 +1,50 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from palenso.benchmarks.datagen import SIZES, DataGenerator
+from palenso.db.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the configured database with the deterministic benchmark dataset, "
+        "for running bench_endpoints --base-url against a live server."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", choices=list(SIZES), default="10k")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--noinput",
+            "--no-input",
+            action="store_false",
+            dest="interactive",
+            help="Do not ask for confirmation",
+        )
+
+    def handle(self, *args, **options):
+        if User.objects.filter(username="bench_admin").exists():
+            raise CommandError("This database already holds a benchmark dataset")
+
+        database = connections[DEFAULT_DB_ALIAS].settings_dict["NAME"]
+        if options["interactive"]:
+            confirm = input(
+                f"This writes the {options['size']} benchmark dataset into "
+                f"'{database}'. Type 'yes' to continue: "
+            )
+            if confirm != "yes":
+                raise CommandError("Seeding cancelled")
+
+        started = time.perf_counter()
+        generator = DataGenerator(
+            size=options["size"], seed=options["seed"], log=self.stdout.write
+        )
+        with transaction.atomic():
+            counts = generator.run()
+
+        counts["seed"] = options["seed"]
+        counts["seconds"] = round(time.perf_counter() - started, 2)
+        self.stdout.write(json.dumps(counts, indent=2))
@@ -0,0 +1,157 @@
+import json
+import random
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from palenso.benchmarks.utils import benchmark_database, chunked
+from palenso.db.models import Company, Job, User
+from palenso.utils.taxonomy import backfill_links, filter_by_terms, seed_aliases
+
+BATCH_SIZE = 5000
+
+# Real skill names, several of which are substrings of others ("Go" of
+# "Django" and "MongoDB", "Java" of "JavaScript", "R" of nearly all)
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "Django", "MongoDB", "C",
+    "C++", "C#", "R", "Ruby", "Ruby on Rails", "React", "React Native", "SQL",
+    "PostgreSQL", "MySQL", "NoSQL", "Kotlin", "Swift", "Rust", "Scala", "Spark",
+    "AWS", "Docker", "Kubernetes", "Node.js", "Angular", "Vue", "HTML", "CSS",
+    "Git", "Linux", "Excel", "Power BI", "Tableau", "Machine Learning",
+    "Deep Learning", "TensorFlow", "PyTorch", "Pandas", "NumPy", "Figma",
+    "Photoshop", "Communication", "Leadership", "Sales", "Marketing", "Google Ads",
+]
+
+# Skill predicates measured, from common to rare, plus one conjunction
+QUERIES = ["Python", "Go", "Java", "R", "Rust", "Python, Django"]
+
+
+def percentile(timings, fraction):
+    ordered = sorted(timings)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare filtering jobs by required skill with a LIKE scan of "
+        "required_skills against the job_skills index join, on a throwaway "
+        "database of --jobs generated jobs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--jobs", type=int, default=1_000_000)
+        parser.add_argument("--vocabulary", type=int, default=500, help="Distinct skills")
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--output", help="Write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            started = time.perf_counter()
+            self._seed(options["jobs"], options["vocabulary"], options["seed"])
+            seeded = time.perf_counter()
+            seed_aliases()
+            links = backfill_links("job")
+            backfilled = time.perf_counter()
+            self.stderr.write(f"{links} job skills in {backfilled - seeded:.1f}s")
+
+            results = [self._measure(query, options["repeat"]) for query in QUERIES]
+
+        report = {
+            "meta": {
+                "jobs": options["jobs"],
+                "vocabulary": options["vocabulary"],
+                "repeat": options["repeat"],
+                "seed": options["seed"],
+                "job_skills": links,
+                "seed_seconds": round(seeded - started, 1),
+                "backfill_seconds": round(backfilled - seeded, 1),
+            },
+            "results": results,
+        }
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as report_file:
+                report_file.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    def _measure(self, query, repeat):
+        jobs = Job.objects.all()
+        like = jobs
+        for name in query.split(","):
+            like = like.filter(required_skills__icontains=name.strip())
+        strategies = {
+            "like": like,
+            "terms": filter_by_terms(jobs, "job", query, is_required=True),
+        }
+
+        result = {"query": query}
+        for label, queryset in strategies.items():
+            matches = queryset.count()
+            page = queryset.order_by("-created_at").values_list("pk", flat=True)
+            count_ms, page_ms = [], []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                queryset.count()
+                count_ms.append((time.perf_counter() - started) * 1000)
+                started = time.perf_counter()
+                list(page[:20])
+                page_ms.append((time.perf_counter() - started) * 1000)
+            result[label] = {
+                "matches": matches,
+                "count_p50_ms": round(statistics.median(count_ms), 2),
+                "count_p95_ms": round(percentile(count_ms, 0.95), 2),
+                "page_p50_ms": round(statistics.median(page_ms), 2),
+                "page_p95_ms": round(percentile(page_ms, 0.95), 2),
+            }
+        # Jobs the LIKE scan returns that do not list the skill
+        result["false_positives"] = result["like"]["matches"] - result["terms"]["matches"]
+        self.stderr.write(
+            f"{query}: like {result['like']['count_p50_ms']} ms, "
+            f"terms {result['terms']['count_p50_ms']} ms, "
+            f"false positives {result['false_positives']}"
+        )
+        return result
+
+    def _seed(self, count, vocabulary, seed):
+        rng = random.Random(seed)
+        skills = SKILLS + [f"Skill {index}" for index in range(vocabulary - len(SKILLS))]
+        # Zipf-like popularity, so a few skills appear in many jobs
+        weights = [1 / (rank + 1) for rank in range(len(skills))]
+
+        employer = User.objects.create_user(username="bench_employer", role="employer")
+        company = Company.objects.create(
+            employer=employer,
+            name="Bench Corp",
+            description="Benchmark company",
+            industry="Software",
+            company_size="1000+",
+            country="India",
+            state="Karnataka",
+            city="Bangalore",
+        )
+        now = timezone.now()
+
+        jobs = (
+            Job(
+                id=uuid.UUID(int=rng.getrandbits(128), version=4),
+                company=company,
+                title=f"Job {index}",
+                description="Benchmark job",
+                requirements="",
+                responsibilities="",
+                job_type="full_time",
+                experience_level="entry",
+                location="Bangalore",
+                required_skills=", ".join(dict.fromkeys(rng.choices(skills, weights, k=4))),
+                preferred_skills=", ".join(dict.fromkeys(rng.choices(skills, weights, k=2))),
+                application_deadline=now.date(),
+            )
+            for index in range(count)
+        )
+        for batch in chunked(jobs, BATCH_SIZE):
+            Job.objects.bulk_create(batch)
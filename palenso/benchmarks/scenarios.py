@@ -0,0 +1,343 @@
+import json
+import re
+import statistics
+import time
+import urllib.parse
+
+from contextlib import ExitStack
+
+from django.core.management.base import CommandError
+from django.db import connections, transaction
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.test import APIClient
+
+from palenso.benchmarks.datagen import BENCH_PASSWORD
+from palenso.benchmarks.utils import http_request
+from palenso.db.models import (
+    Education,
+    Event,
+    EventRegistration,
+    Interest,
+    JobApplication,
+    Project,
+    Resume,
+    SavedJob,
+    Skill,
+    User,
+    WorkExperience,
+)
+from palenso.db.models.job import Interview, Offer
+from palenso.utils.instrumentation import RequestStats
+
+API_PREFIX = "api/"
+
+_PARAMETER = re.compile(r"<(?:\w+:)?(\w+)>")
+
+
+class Scenario:
+    """One request against an API route
+
+    ``route`` is the pattern as written in ``palenso/api/urls.py``; its
+    parameters are filled from the fixtures returned by ``load_fixtures``.
+    Unsafe scenarios change data: the test client runner rolls each of them
+    back, the HTTP runner skips them.
+    """
+
+    def __init__(self, route, method="GET", role="student", params=None, data=None, label=None, safe=None):
+        self.route = route
+        self.method = method
+        self.role = role
+        self.params = params or {}
+        self.data = data
+        self.label = label
+        self.safe = method == "GET" if safe is None else safe
+
+    @property
+    def name(self):
+        name = f"{self.method} /{API_PREFIX}{self.route}"
+        return f"{name} [{self.label}]" if self.label else name
+
+    def path(self, fixtures):
+        return "/" + API_PREFIX + _PARAMETER.sub(lambda match: str(fixtures[match.group(1)]), self.route)
+
+    def payload(self, fixtures):
+        if self.data is None:
+            return None
+
+        def fill(value):
+            if isinstance(value, str):
+                return value.format(**fixtures)
+            if isinstance(value, list):
+                return [fill(item) for item in value]
+            return value
+
+        return {key: fill(value) for key, value in self.data.items()}
+
+
+SCENARIOS = [
+    # auth; the mutating password and verification flows send mail or SMS
+    Scenario("auth/signin", "POST", role=None, safe=True, data={"email": "{student_email}", "password": BENCH_PASSWORD}),
+    Scenario("auth/check-medium-availability", "POST", role=None, safe=True, data={"email": "{student_email}"}),
+    Scenario("auth/check-user-existence", "POST", role=None, safe=True, data={"email": "{student_email}"}),
+    # users
+    Scenario("users", role="admin"),
+    Scenario("users", role="admin", params={"search": "bench"}, label="search"),
+    Scenario("users/me"),
+    Scenario("users/<uuid:user_id>", role="admin"),
+    # profile
+    Scenario("users/<uuid:user_id>/profile"),
+    Scenario("educations"),
+    Scenario("educations/<uuid:education_id>"),
+    Scenario("work-experiences"),
+    Scenario("work-experiences/<uuid:experience_id>"),
+    Scenario("skills"),
+    Scenario("skills/<uuid:skill_id>"),
+    Scenario("interests"),
+    Scenario("interests/<uuid:interest_id>"),
+    Scenario("projects"),
+    Scenario("projects/<uuid:project_id>"),
+    Scenario("resumes"),
+    Scenario("resumes/<uuid:resume_id>"),
+    # company
+    Scenario("companies", role=None),
+    Scenario("companies", role=None, params={"profile": "card"}, label="card"),
+    Scenario("companies/<uuid:company_id>", role=None),
+    # jobs
+    Scenario("jobs", role=None),
+    Scenario("jobs", role=None, params={"profile": "card"}, label="card"),
+    Scenario("jobs", role=None, params={"search": "eng"}, label="search"),
+    Scenario("jobs/<uuid:job_id>", role=None),
+    Scenario(
+        "jobs",
+        "POST",
+        role="employer",
+        label="create",
+        data={
+            "title": "Benchmark job",
+            "description": "Created by the benchmark",
+            "requirements": "Python",
+            "responsibilities": "Build APIs",
+            "job_type": "full_time",
+            "experience_level": "entry",
+            "location": "Bangalore",
+        },
+    ),
+    Scenario("job-applications", role="student"),
+    Scenario("job-applications", role="employer", label="employer"),
+    Scenario("job-applications/export", role="employer", params={"file_type": "csv"}),
+    Scenario("job-applications/<uuid:application_id>", role="employer"),
+    Scenario("saved-jobs"),
+    Scenario("saved-jobs/<uuid:saved_job_id>", "DELETE"),
+    Scenario("interviews", role="employer"),
+    Scenario("interviews/<uuid:interview_id>", role="employer"),
+    Scenario("offers", role="employer"),
+    Scenario("offers/<uuid:offer_id>", role="employer"),
+    # events
+    Scenario("events", role=None),
+    Scenario("events", role=None, params={"profile": "card"}, label="card"),
+    Scenario("events/<uuid:event_id>", role=None),
+    Scenario("event-registrations", role="student"),
+    Scenario("event-registrations", role="employer", label="employer"),
+    Scenario(
+        "event-registrations/bulk-status",
+        "POST",
+        role="employer",
+        data={"status": "attended", "registration_ids": ["{registration_id}"]},
+    ),
+    Scenario("event-registrations/export", role="employer", params={"file_type": "csv"}),
+    Scenario("event-registrations/<uuid:registration_id>", role="employer"),
+    # dashboards
+    Scenario("dashboard-analytics", role="student"),
+    Scenario("dashboard-analytics", role="employer", label="employer"),
+    Scenario("dashboard-analytics", role="admin", label="admin"),
+    Scenario("dashboard-info", role="student"),
+    Scenario("dashboard-info", role="employer", label="employer"),
+    Scenario("dashboard-info", role="admin", label="admin"),
+    Scenario("metrics", role="admin"),
+]
+
+# Routes deliberately left out, with the reason reported in the results
+SKIPPED_ROUTES = {
+    "upload": "uploads to object storage",
+    "auth/signup": "creates users on every call",
+    "auth/signout": "revokes the token the run uses",
+    "auth/forgot-password": "sends mail",
+    "auth/reset-password": "needs a mailed token",
+    "auth/change-password": "changes the bench password",
+    "auth/request-medium-verification": "sends mail or SMS",
+    "auth/verify-medium": "needs a mailed code",
+}
+
+
+def api_routes():
+    """Every route pattern under /api/, as written in palenso/api/urls.py"""
+
+    def walk(patterns, prefix):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern.url_patterns, prefix + str(pattern.pattern))
+            elif isinstance(pattern, URLPattern):
+                yield prefix + str(pattern.pattern)
+
+    routes = []
+    for route in walk(get_resolver().url_patterns, ""):
+        if route.startswith(API_PREFIX) and route[len(API_PREFIX):] not in routes:
+            routes.append(route[len(API_PREFIX):])
+    return routes
+
+
+def uncovered_routes(scenarios=SCENARIOS):
+    covered = {scenario.route for scenario in scenarios} | set(SKIPPED_ROUTES)
+    return [route for route in api_routes() if route not in covered]
+
+
+def load_fixtures():
+    """Look up the rows scenarios point at, owned by the first bench users"""
+    admin = User.objects.get(username="bench_admin")
+    employer = User.objects.get(username="bench_employer_0")
+    student = User.objects.get(username="bench_student_0")
+
+    application = JobApplication.objects.filter(job__company__employer=employer).first()
+    registration = EventRegistration.objects.filter(event__organizer=employer).first()
+    return {
+        "users": {"admin": admin, "employer": employer, "student": student},
+        "user_id": student.id,
+        "student_email": student.email,
+        "education_id": Education.objects.filter(profile__user=student).values_list("id", flat=True).first(),
+        "skill_id": Skill.objects.filter(profile__user=student).values_list("id", flat=True).first(),
+        "experience_id": WorkExperience.objects.filter(profile__user=student).values_list("id", flat=True).first(),
+        "interest_id": Interest.objects.filter(profile__user=student).values_list("id", flat=True).first(),
+        "project_id": Project.objects.filter(profile__user=student).values_list("id", flat=True).first(),
+        "resume_id": Resume.objects.filter(profile__user=student).values_list("id", flat=True).first(),
+        "company_id": employer.company.id,
+        "job_id": application.job_id,
+        "application_id": application.id,
+        "saved_job_id": SavedJob.objects.filter(student=student).values_list("id", flat=True).first(),
+        "interview_id": Interview.objects.filter(application__job__company__employer=employer).values_list("id", flat=True).first(),
+        "offer_id": Offer.objects.filter(application__job__company__employer=employer).values_list("id", flat=True).first(),
+        "event_id": Event.objects.filter(organizer=employer).values_list("id", flat=True).first(),
+        "registration_id": registration.id,
+    }
+
+
+def summarize(latencies, queries, sizes, statuses):
+    ordered = sorted(latencies)
+
+    def percentile(fraction):
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 2)
+
+    return {
+        "requests": len(ordered),
+        "status": sorted(set(statuses)),
+        "p50_ms": percentile(0.50),
+        "p90_ms": percentile(0.90),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "mean_ms": round(statistics.mean(ordered), 2),
+        "max_ms": round(ordered[-1], 2),
+        "queries": max(queries) if queries and None not in queries else None,
+        "bytes": max(sizes),
+    }
+
+
+class TestClientRunner:
+    """Runs scenarios in process through DRF's test client
+
+    Every request runs in a transaction that is rolled back, so unsafe
+    scenarios leave the dataset as generated.
+    """
+
+    def __init__(self, fixtures):
+        self.fixtures = fixtures
+        # Sign-in stores the user agent, which the test client leaves unset
+        self.clients = {None: APIClient(HTTP_USER_AGENT="palenso-bench")}
+        for role, user in fixtures["users"].items():
+            client = APIClient(HTTP_USER_AGENT="palenso-bench")
+            client.force_authenticate(user)
+            self.clients[role] = client
+
+    def request(self, scenario):
+        client = self.clients[scenario.role]
+        path = scenario.path(self.fixtures)
+        if scenario.params:
+            path = path + "?" + urllib.parse.urlencode(scenario.params)
+        method = getattr(client, scenario.method.lower())
+        payload = scenario.payload(self.fixtures)
+
+        # Counted with the instrumentation wrapper rather than
+        # CaptureQueriesContext, whose log is capped at 9000 queries
+        stats = RequestStats()
+        with transaction.atomic(), ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            started = time.perf_counter()
+            if payload is None:
+                response = method(path)
+            else:
+                response = method(path, payload, format="json")
+            if response.streaming:
+                size = sum(len(chunk) for chunk in response.streaming_content)
+            else:
+                size = len(response.content)
+            elapsed = (time.perf_counter() - started) * 1000
+            transaction.set_rollback(True)
+        return elapsed, stats.query_count, size, response.status_code
+
+
+class HTTPRunner:
+    """Runs safe scenarios against a live server, e.g. a local gunicorn
+
+    Signs in once per role with the bench password. Query counts are read
+    from the ``X-DB-Queries`` header, which the server only sends when
+    ``REQUEST_METRICS_HEADERS`` is enabled.
+    """
+
+    def __init__(self, fixtures, base_url):
+        self.fixtures = fixtures
+        self.base_url = base_url.rstrip("/")
+        self.tokens = {None: None}
+        for role, user in fixtures["users"].items():
+            _, status, body, _ = http_request(
+                self.base_url,
+                "POST",
+                "/api/auth/signin",
+                {"email": user.email, "password": BENCH_PASSWORD},
+            )
+            if status != 200:
+                raise CommandError(f"Signing in as {user.username} failed with status {status}")
+            self.tokens[role] = json.loads(body)["access_token"]
+
+    def request(self, scenario):
+        path = scenario.path(self.fixtures)
+        if scenario.params:
+            path = path + "?" + urllib.parse.urlencode(scenario.params)
+        elapsed, status, content, headers = http_request(
+            self.base_url,
+            scenario.method,
+            path,
+            scenario.payload(self.fixtures),
+            self.tokens[scenario.role],
+        )
+        queries = headers.get("X-DB-Queries")
+        return elapsed, int(queries) if queries is not None else None, len(content), status
+
+
+def run_scenarios(runner, scenarios, iterations, warmup, log=None):
+    results = []
+    for scenario in scenarios:
+        for _ in range(warmup):
+            runner.request(scenario)
+
+        latencies, queries, sizes, statuses = [], [], [], []
+        for _ in range(iterations):
+            elapsed, query_count, size, status = runner.request(scenario)
+            latencies.append(elapsed)
+            queries.append(query_count)
+            sizes.append(size)
+            statuses.append(status)
+
+        result = {"scenario": scenario.name, "role": scenario.role, **summarize(latencies, queries, sizes, statuses)}
+        if log:
+            log(f"{scenario.name}: p50 {result['p50_ms']} ms, {result['queries']} queries")
+        results.append(result)
+    return results
@@ -0,0 +1,16 @@
+"""Settings for the servers benchmarks start
+
+Everything comes from the settings module named in BENCH_BASE_SETTINGS,
+except email delivery, which goes to a backend that only waits, and rate
+limits, which all traffic from the one load generator would trip.
+"""
+
+import importlib
+import os
+
+_base = importlib.import_module(os.environ["BENCH_BASE_SETTINGS"])
+globals().update({name: value for name, value in vars(_base).items() if name.isupper()})
+
+EMAIL_BACKEND = "palenso.benchmarks.upstream.SlowEmailBackend"
+
+RATE_LIMITS = {}
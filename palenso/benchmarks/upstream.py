@@ -0,0 +1,69 @@
+import os
+import threading
+import time
+
+from django.core.mail.backends.base import BaseEmailBackend
+
+from palenso.benchmarks.utils import http_request
+
+# Seconds a simulated SMTP delivery takes
+DEFAULT_UPSTREAM_DELAY = 0.5
+
+
+class SlowEmailBackend(BaseEmailBackend):
+    """Email backend that waits like a slow SMTP server and sends nothing"""
+
+    def send_messages(self, email_messages):
+        time.sleep(float(os.environ.get("BENCH_UPSTREAM_DELAY", DEFAULT_UPSTREAM_DELAY)))
+        return len(email_messages)
+
+
+def run_upstream_level(base_url, emails, concurrency, duration):
+    """Have ``concurrency`` clients request password reset emails for
+    ``duration`` seconds and summarize what the server sustained"""
+    started = time.perf_counter()
+    deadline = started + duration
+    samples = []
+    lock = threading.Lock()
+
+    def client(offset):
+        index = offset
+        while time.perf_counter() < deadline:
+            email = emails[index % len(emails)]
+            index += concurrency
+            try:
+                elapsed, status, _, _ = http_request(
+                    base_url, "POST", "/api/auth/forgot-password", {"email": email}
+                )
+            except OSError:
+                elapsed, status = None, None
+            with lock:
+                samples.append((elapsed, status))
+
+    threads = [
+        threading.Thread(target=client, args=(offset,), daemon=True)
+        for offset in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Requests still in flight at the deadline finish afterwards
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(elapsed for elapsed, status in samples if status == 200)
+
+    def percentile(fraction):
+        if not latencies:
+            return None
+        return round(latencies[min(len(latencies) - 1, int(fraction * len(latencies)))], 2)
+
+    return {
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "ok": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "errors": len(samples) - len(latencies),
+    }
@@ -0,0 +1,134 @@
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+
+@contextmanager
+def benchmark_database(keepdb=False):
+    """Run a benchmark against a throwaway test database
+
+    Uses Django's test database machinery so benchmarks never write into the
+    configured database (``test_<name>`` on Postgres, in-memory on SQLite).
+    """
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=keepdb)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+        teardown_test_environment()
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB"""
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        # ru_maxrss is the peak, not the current value, but it is the best we
+        # have on platforms without procfs. It is KB on Linux and bytes on macOS.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def chunked(iterable, size):
+    """Yield lists of at most ``size`` items"""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def http_request(base_url, method, path, data=None, token=None, timeout=30):
+    """Send a JSON request and return ``(elapsed_ms, status, body, headers)``
+
+    HTTP error statuses are returned, not raised.
+    """
+    body = json.dumps(data).encode() if data is not None else None
+    request = urllib.request.Request(base_url + path, data=body, method=method)
+    request.add_header("Content-Type", "application/json")
+    if token:
+        request.add_header("Authorization", f"Bearer {token}")
+
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            content, status, headers = response.read(), response.status, response.headers
+    except urllib.error.HTTPError as error:
+        content, status, headers = error.read(), error.code, error.headers
+    elapsed = (time.perf_counter() - started) * 1000
+    return elapsed, status, content, headers
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(base_url, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise CommandError(f"The server exited with status {process.returncode}")
+        try:
+            urllib.request.urlopen(base_url + "/", timeout=1)
+        except urllib.error.HTTPError:
+            # Any HTTP answer means the workers are serving
+            return
+        except OSError:
+            time.sleep(0.2)
+        else:
+            return
+    raise CommandError(f"The server did not start within {timeout}s")
+
+
+def server_env(**extra):
+    """Environment for servers started by benchmarks: the calling command's
+    settings through palenso.benchmarks.settings"""
+    return {
+        "DJANGO_SETTINGS_MODULE": "palenso.benchmarks.settings",
+        "BENCH_BASE_SETTINGS": os.environ["DJANGO_SETTINGS_MODULE"],
+        **extra,
+    }
+
+
+@contextmanager
+def serve(args, env=None):
+    """Run ``python -m <args> --bind 127.0.0.1:<port>`` from the project
+    root and yield its base URL once it answers
+
+    The server inherits DJANGO_SETTINGS_MODULE unless ``env`` overrides it,
+    so it uses the same database as the calling command.
+    """
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    process = subprocess.Popen(
+        [sys.executable, "-m", *args, "--bind", f"127.0.0.1:{port}", "--log-level", "warning"],
+        cwd=os.path.dirname(settings.BASE_DIR),
+        env=dict(os.environ, **(env or {})),
+    )
+    try:
+        wait_until_ready(base_url, process)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
@@ -0,0 +1,214 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, F, FloatField, Q
+from django.db.models.functions import Cast
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from sentry_sdk import capture_exception
+
+from palenso.db.models import Company, Event, Job, JobApplication, SystemAlert, User
+
+
+class AlertRule:
+    """A check over the whole platform, evaluated in the background
+
+    Subclasses set ``name`` (unique, used as the storage key) and
+    ``cadence``, and implement ``evaluate(now)`` returning a list of alert
+    dicts with at least ``type``, ``message`` and ``severity``. Rules are
+    listed by dotted path in ``SYSTEM_ALERT_RULES``.
+    """
+
+    name = None
+    cadence = timedelta(minutes=15)
+
+    def evaluate(self, now):
+        raise NotImplementedError(f"{type(self).__name__} must implement evaluate()")
+
+    def is_due(self, snapshot, now):
+        return snapshot is None or snapshot.evaluated_at is None or (
+            snapshot.evaluated_at + self.cadence <= now
+        )
+
+
+class PendingApplicationsRule(AlertRule):
+    name = "pending_applications"
+    cadence = timedelta(minutes=15)
+
+    def evaluate(self, now):
+        count = JobApplication.objects.filter(
+            status="pending", created_at__lt=now - timedelta(days=3)
+        ).count()
+        if not count:
+            return []
+        return [
+            {
+                "type": "pending_applications",
+                "message": f"{count} job applications pending for more than 3 days",
+                "severity": "medium",
+                "count": count,
+            }
+        ]
+
+
+class ExpiredJobsRule(AlertRule):
+    name = "expired_jobs"
+    cadence = timedelta(minutes=15)
+
+    def evaluate(self, now):
+        count = Job.objects.filter(
+            is_active=True, application_deadline__lt=now.date()
+        ).count()
+        if not count:
+            return []
+        return [
+            {
+                "type": "expired_jobs",
+                "message": f"{count} active jobs have expired",
+                "severity": "high",
+                "count": count,
+            }
+        ]
+
+
+class LowEventRegistrationRule(AlertRule):
+    """Events in the next 7 days with less than 30% of their places taken"""
+
+    name = "low_event_registration"
+    cadence = timedelta(minutes=10)
+    threshold = 0.3
+
+    def evaluate(self, now):
+        events = (
+            Event.objects.filter(
+                is_active=True,
+                start_date__gt=now,
+                start_date__lte=now + timedelta(days=7),
+                max_participants__isnull=False,
+            )
+            .annotate(registered=Count("registrations"))
+            .filter(
+                Q(max_participants__lte=0)
+                | Q(
+                    registered__lt=Cast(F("max_participants"), FloatField())
+                    * self.threshold
+                )
+            )
+            .order_by("start_date")
+            .values("id", "title", "registered", "max_participants")
+        )
+        return [
+            {
+                "type": "low_event_registration",
+                "message": f"Event '{event['title']}' has low registration ({event['registered']}/{event['max_participants']})",
+                "severity": "low",
+                "event_id": str(event["id"]),
+                "registration_rate": (
+                    event["registered"] / event["max_participants"]
+                    if event["max_participants"] > 0
+                    else 0
+                ),
+            }
+            for event in events
+        ]
+
+
+class InactiveUsersRule(AlertRule):
+    name = "inactive_users"
+    cadence = timedelta(hours=6)
+
+    def evaluate(self, now):
+        count = User.objects.filter(
+            last_active__lt=now - timedelta(days=30), is_active=True
+        ).count()
+        if not count:
+            return []
+        return [
+            {
+                "type": "inactive_users",
+                "message": f"{count} users have been inactive for 30+ days",
+                "severity": "low",
+                "count": count,
+            }
+        ]
+
+
+class CompaniesWithoutJobsRule(AlertRule):
+    name = "companies_without_jobs"
+    cadence = timedelta(hours=1)
+
+    def evaluate(self, now):
+        count = Company.objects.filter(jobs__isnull=True).count()
+        if not count:
+            return []
+        return [
+            {
+                "type": "companies_without_jobs",
+                "message": f"{count} companies have no active jobs",
+                "severity": "medium",
+                "count": count,
+            }
+        ]
+
+
+_rules = None
+
+
+def get_rules():
+    """Rule instances in ``SYSTEM_ALERT_RULES`` order"""
+    global _rules
+    if _rules is None:
+        _rules = [import_string(path)() for path in settings.SYSTEM_ALERT_RULES]
+    return _rules
+
+
+def evaluate_rule(rule, now=None):
+    """Evaluate ``rule`` and store the result; a failing rule keeps its
+    previous alerts and records the error"""
+    now = now or timezone.now()
+    snapshot, _ = SystemAlert.objects.get_or_create(rule=rule.name)
+    started = time.perf_counter()
+    try:
+        snapshot.alerts = rule.evaluate(now)
+        snapshot.error = ""
+    except Exception as e:
+        capture_exception(e)
+        snapshot.error = repr(e)
+    snapshot.evaluated_at = now
+    snapshot.duration_ms = round((time.perf_counter() - started) * 1000, 2)
+    snapshot.save()
+    return snapshot
+
+
+def refresh_alerts(now=None, force=False, names=None):
+    """Evaluate every rule whose cadence has elapsed (all of them with
+    ``force``) and return the refreshed snapshots"""
+    now = now or timezone.now()
+    snapshots = {snapshot.rule: snapshot for snapshot in SystemAlert.objects.all()}
+    refreshed = []
+    for rule in get_rules():
+        if names and rule.name not in names:
+            continue
+        if force or rule.is_due(snapshots.get(rule.name), now):
+            refreshed.append(evaluate_rule(rule, now))
+    return refreshed
+
+
+def current_alerts():
+    """Stored alerts in rule order, and the time of the oldest evaluation
+
+    Rules never evaluated yet (fresh deploy, newly added rule) are
+    evaluated here once, so the first page load is not empty.
+    """
+    snapshots = {snapshot.rule: snapshot for snapshot in SystemAlert.objects.all()}
+    alerts = []
+    evaluated_at = []
+    for rule in get_rules():
+        snapshot = snapshots.get(rule.name)
+        if snapshot is None or snapshot.evaluated_at is None:
+            snapshot = evaluate_rule(rule)
+        alerts.extend(snapshot.alerts)
+        evaluated_at.append(snapshot.evaluated_at)
+    return alerts, min(evaluated_at) if evaluated_at else None
@@ -1,5 +1,20 @@
+import os
+import sys
+
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class BgtasksConfig(AppConfig):
     name = 'palenso.bgtasks'
+
+    def ready(self):
+        if not settings.BGTASKS_RUN_LOCALLY or sys.argv[1:2] != ["runserver"]:
+            return
+        # With the autoreloader only the child process serves requests
+        if os.environ.get("RUN_MAIN") != "true" and "--noreload" not in sys.argv:
+            return
+
+        from palenso.bgtasks.scheduler import LocalScheduler
+
+        LocalScheduler().start()
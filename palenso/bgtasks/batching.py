@@ -0,0 +1,78 @@
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+
+def _batch_ids(queryset, batch_size):
+    return list(queryset.order_by("pk").values_list("pk", flat=True)[:batch_size])
+
+
+def delete_in_batches(queryset, batch_size=None, pause=None):
+    """Delete the rows matching ``queryset`` a batch at a time, each batch in
+    its own short transaction, sleeping ``pause`` seconds in between so
+    replication and other writers keep up
+
+    Returns rows deleted per model label, cascades included.
+    """
+    batch_size = batch_size or settings.BGTASKS_BATCH_SIZE
+    pause = settings.BGTASKS_BATCH_PAUSE if pause is None else pause
+    deleted = {}
+    while True:
+        ids = _batch_ids(queryset, batch_size)
+        if not ids:
+            break
+        with transaction.atomic():
+            _, per_model = queryset.filter(pk__in=ids).delete()
+        for label, count in per_model.items():
+            deleted[label] = deleted.get(label, 0) + count
+        if len(ids) < batch_size:
+            break
+        time.sleep(pause)
+    return deleted
+
+
+def update_in_batches(queryset, values, batch_size=None, pause=None):
+    """Apply ``values`` to the rows matching ``queryset`` a batch at a time
+
+    ``values`` must take rows out of ``queryset`` (e.g. filter on
+    ``is_active=True`` and set ``is_active=False``), otherwise the same rows
+    would be selected again. Returns the number of rows updated.
+    """
+    batch_size = batch_size or settings.BGTASKS_BATCH_SIZE
+    pause = settings.BGTASKS_BATCH_PAUSE if pause is None else pause
+    updated = 0
+    while True:
+        ids = _batch_ids(queryset, batch_size)
+        if not ids:
+            break
+        with transaction.atomic():
+            count = queryset.filter(pk__in=ids).update(**values)
+        updated += count
+        if len(ids) < batch_size or not count:
+            break
+        time.sleep(pause)
+    return updated
+
+
+def rewrite_in_batches(queryset, values, batch_size=None, pause=None):
+    """Apply ``values`` once to every row matching ``queryset``, walking the
+    primary key, for values that leave rows in ``queryset`` (e.g.
+    recomputing a column from an expression). Returns the number of rows
+    updated."""
+    batch_size = batch_size or settings.BGTASKS_BATCH_SIZE
+    pause = settings.BGTASKS_BATCH_PAUSE if pause is None else pause
+    updated = 0
+    last_pk = None
+    while True:
+        batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        ids = _batch_ids(batch, batch_size)
+        if not ids:
+            break
+        with transaction.atomic():
+            updated += queryset.filter(pk__in=ids).update(**values)
+        if len(ids) < batch_size:
+            break
+        last_pk = ids[-1]
+        time.sleep(pause)
+    return updated
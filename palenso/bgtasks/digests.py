@@ -0,0 +1,97 @@
+import logging
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+from palenso.db.models import SavedSearchMatch
+
+logger = logging.getLogger(__name__)
+
+
+def _digest_body(user, searches):
+    lines = [f"Hello {user.first_name or user.username},", ""]
+    for search, jobs in searches:
+        lines.append(f"New jobs for \"{search.name}\":")
+        shown = [job for job in jobs if job.is_active]
+        for job in shown[: settings.SAVED_SEARCH_DIGEST_JOBS]:
+            lines.append(f"- {job.title} at {job.company.name}, {job.location}")
+            lines.append(f"  {settings.SITE_URL}/jobs/{job.id}")
+        if len(shown) > settings.SAVED_SEARCH_DIGEST_JOBS:
+            lines.append(
+                f"  and {len(shown) - settings.SAVED_SEARCH_DIGEST_JOBS} more: "
+                f"{settings.SITE_URL}/jobs?{urlencode(search.query)}"
+            )
+        lines.append("")
+    lines.append(f"Best regards,\n{settings.SITE_NAME}")
+    return "\n".join(lines)
+
+
+def digest_message(user, matches, connection):
+    """One email listing the new jobs of each of ``user``'s saved searches,
+    or None when none of them is still open"""
+    searches = {}
+    for match in matches:
+        searches.setdefault(match.search, []).append(match.job)
+    if not user.email or not any(job.is_active for jobs in searches.values() for job in jobs):
+        return None
+    return EmailMessage(
+        subject=f"New jobs matching your saved searches on {settings.SITE_NAME}",
+        body=_digest_body(user, searches.items()),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[user.email],
+        connection=connection,
+    )
+
+
+def send_digests(batch_size=None):
+    """Email every user with pending saved search matches one digest, then
+    delete those matches
+
+    Users are taken a batch at a time and every batch is sent over the same
+    SMTP connection. A batch whose sending fails keeps its matches for the
+    next run.
+    """
+    batch_size = batch_size or settings.SAVED_SEARCH_DIGEST_BATCH_SIZE
+    users = (
+        SavedSearchMatch.objects.order_by("search__user_id")
+        .values_list("search__user_id", flat=True)
+        .distinct()
+    )
+    sent = deleted = 0
+    last_user_id = None
+    connection = get_connection()
+    try:
+        while True:
+            batch = users if last_user_id is None else users.filter(search__user_id__gt=last_user_id)
+            user_ids = list(batch[:batch_size])
+            if not user_ids:
+                break
+            matches = (
+                SavedSearchMatch.objects.filter(search__user_id__in=user_ids)
+                .select_related("search__user", "job__company")
+                .order_by("search__user_id", "search__name", "-job__created_at")
+            )
+            per_user = {}
+            for match in matches:
+                per_user.setdefault(match.search.user, []).append(match)
+
+            messages = []
+            for user, user_matches in per_user.items():
+                message = digest_message(user, user_matches, connection)
+                if message is not None:
+                    messages.append(message)
+            if messages:
+                # Opened once, on the first batch with something to send
+                connection.open()
+                connection.send_messages(messages)
+            sent += len(messages)
+            # Matches found while sending stay for the next run
+            deleted += SavedSearchMatch.objects.filter(
+                pk__in=[match.pk for user_matches in per_user.values() for match in user_matches]
+            ).delete()[0]
+            logger.info("Sent %s saved search digests", len(messages))
+            last_user_id = user_ids[-1]
+    finally:
+        connection.close()
+    return {"digests_sent": sent, SavedSearchMatch._meta.db_table: deleted}
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from palenso.analytics.timeseries import backfill
+
+
+def _date(value):
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise CommandError(f"Not a YYYY-MM-DD date: {value}")
+    return day
+
+
+class Command(BaseCommand):
+    help = (
+        "Count the daily dashboard metric buckets from the created_at "
+        "timestamps of existing rows, a few days per transaction, newest "
+        "first. The roll_up_metrics task keeps recent days current; run this "
+        "once after deploying, or for any range after bulk imports."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", type=_date, help="First day, default the oldest row")
+        parser.add_argument("--end", type=_date, help="Last day, default today")
+        parser.add_argument("--chunk-days", type=int, help="Days per transaction")
+
+    def handle(self, *args, **options):
+        total = 0
+        for start, end, written in backfill(
+            options["start"], options["end"], options["chunk_days"]
+        ):
+            total += written
+            self.stdout.write(f"{start} to {end}: {written} buckets")
+        self.stdout.write(f"{total} buckets written")
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from palenso.utils.geo import GEO_MODELS, geocode_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Set latitude and longitude on jobs, events and companies from their "
+        "location text using the local gazetteer. Rows saved through the ORM "
+        "are located on save; run this after bulk imports or after changing "
+        "the gazetteer (with --all)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model", action="append", dest="models", choices=sorted(GEO_MODELS),
+            help="Only this model (repeatable)",
+        )
+        parser.add_argument(
+            "--all", action="store_true", help="Also redo rows that already have coordinates"
+        )
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        for name in options["models"] or GEO_MODELS:
+            located = geocode_rows(
+                name, batch_size=options["batch_size"], overwrite=options["all"]
+            )
+            self.stdout.write(f"{name}: {located} rows located")
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from palenso.bgtasks.alerts import get_rules, refresh_alerts
+
+
+class Command(BaseCommand):
+    help = (
+        "Evaluate the admin system alert rules whose cadence has elapsed and "
+        "store their results. Run it every minute or so."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force", action="store_true", help="Evaluate every rule regardless of cadence"
+        )
+        parser.add_argument(
+            "--rule", action="append", dest="rules", help="Only this rule (repeatable)"
+        )
+
+    def handle(self, *args, **options):
+        known = {rule.name for rule in get_rules()}
+        unknown = set(options["rules"] or ()) - known
+        if unknown:
+            raise CommandError(f"Unknown rules: {', '.join(sorted(unknown))}")
+
+        for snapshot in refresh_alerts(force=options["force"], names=options["rules"]):
+            outcome = f"failed: {snapshot.error}" if snapshot.error else f"{len(snapshot.alerts)} alerts"
+            self.stdout.write(f"{snapshot.rule}: {outcome} in {snapshot.duration_ms} ms")
@@ -0,0 +1,42 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from palenso.bgtasks.scheduler import Scheduler
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the periodic background tasks in PERIODIC_TASKS as they fall due. "
+        "Runs until stopped; use --once from cron instead."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Run due tasks once and exit")
+        parser.add_argument(
+            "--task",
+            action="append",
+            dest="tasks",
+            help="Run this task now, due or not, and exit (repeatable)",
+        )
+        parser.add_argument("--poll-interval", type=float, help="Seconds between checks")
+
+    def handle(self, *args, **options):
+        scheduler = Scheduler()
+
+        if options["tasks"]:
+            tasks = {task.name: task for task in scheduler.tasks}
+            unknown = set(options["tasks"]) - set(tasks)
+            if unknown:
+                raise CommandError(f"Unknown tasks: {', '.join(sorted(unknown))}")
+            runs = [scheduler.run_task(tasks[name]) for name in options["tasks"]]
+        elif options["once"]:
+            runs = scheduler.run_pending()
+        else:
+            self.stdout.write(f"Scheduling {', '.join(task.name for task in scheduler.tasks)}")
+            scheduler.run_forever(options["poll_interval"])
+            return
+
+        for run in runs:
+            outcome = run.error if run.error else json.dumps(run.result)
+            self.stdout.write(f"{run.task}: {run.status} in {run.duration_ms} ms {outcome}")
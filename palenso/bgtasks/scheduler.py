@@ -0,0 +1,130 @@
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from sentry_sdk import capture_exception
+
+from palenso.db.models import TaskRun
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """A function run every ``interval``, configured in ``PERIODIC_TASKS``
+
+    The function takes no arguments and returns rows affected per table,
+    which is stored on the TaskRun.
+    """
+
+    def __init__(self, name, task, interval):
+        self.name = name
+        self.func = import_string(task) if isinstance(task, str) else task
+        if not isinstance(interval, timedelta):
+            interval = timedelta(seconds=interval)
+        self.interval = interval
+
+    def is_due(self, last_started_at, now):
+        return last_started_at is None or last_started_at + self.interval <= now
+
+
+def get_tasks():
+    return [
+        PeriodicTask(name, options["task"], options["interval"])
+        for name, options in settings.PERIODIC_TASKS.items()
+    ]
+
+
+class Scheduler:
+    """Runs periodic tasks whose interval has elapsed since their last
+    recorded run
+
+    Last runs come from TaskRun, so any process can pick up where another
+    left off; run a single scheduler at a time. ``clock`` can be replaced
+    to drive it deterministically.
+    """
+
+    def __init__(self, tasks=None, clock=timezone.now):
+        self.tasks = get_tasks() if tasks is None else tasks
+        self.clock = clock
+
+    def last_runs(self):
+        return dict(
+            TaskRun.objects.values("task")
+            .annotate(last_started_at=Max("started_at"))
+            .values_list("task", "last_started_at")
+        )
+
+    def due(self, now=None):
+        now = now or self.clock()
+        last_runs = self.last_runs()
+        return [task for task in self.tasks if task.is_due(last_runs.get(task.name), now)]
+
+    def run_task(self, task):
+        started_at = self.clock()
+        started = time.perf_counter()
+        try:
+            result = task.func() or {}
+            status, error = "succeeded", ""
+        except Exception as e:
+            capture_exception(e)
+            result, status, error = {}, "failed", repr(e)
+        run = TaskRun.objects.create(
+            task=task.name,
+            started_at=started_at,
+            duration_ms=round((time.perf_counter() - started) * 1000, 2),
+            status=status,
+            result=result,
+            error=error,
+        )
+        logger.info("%s %s in %s ms: %s", task.name, status, run.duration_ms, error or result)
+        return run
+
+    def run_pending(self, now=None):
+        """Run every due task once, in configuration order"""
+        return [self.run_task(task) for task in self.due(now)]
+
+    def run_forever(self, poll_interval=None, stop=None):
+        poll_interval = poll_interval or settings.BGTASKS_POLL_INTERVAL
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            close_old_connections()
+            try:
+                self.run_pending()
+            except Exception as e:
+                # The database may be briefly unavailable; try again next poll
+                capture_exception(e)
+            finally:
+                close_old_connections()
+            stop.wait(poll_interval)
+
+
+class LocalScheduler(Scheduler):
+    """Scheduler on a daemon thread of the current process, for runserver
+    (``BGTASKS_RUN_LOCALLY``) and tests"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self, poll_interval=None):
+        self.thread = threading.Thread(
+            target=self.run_forever,
+            args=(poll_interval, self.stop_event),
+            name="bgtasks-scheduler",
+            daemon=True,
+        )
+        self.thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
@@ -0,0 +1,154 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from palenso.analytics.buffer import flush_activity as flush_buffered_activity
+from palenso.analytics.timeseries import refresh_recent
+from palenso.bgtasks.alerts import refresh_alerts
+from palenso.bgtasks.batching import delete_in_batches, update_in_batches
+from palenso.bgtasks.digests import send_digests
+from palenso.db.models import (
+    ActivityEvent,
+    ActivityRollup,
+    ExchangeRate,
+    Job,
+    JobMetricDay,
+    Notification,
+    RoleMetricDay,
+    TaskRun,
+    Token,
+    VerificationCode,
+)
+from palenso.utils.auth_utils import cleanup_expired_tokens
+from palenso.utils.currency import convert_salaries, unrated_currencies
+from palenso.utils.notifications import prune_notifications as prune_inbox
+from palenso.utils.notifications import send_event_reminders as remind_registrants
+from palenso.utils.saved_search import match_new_jobs
+
+# How long task run history is kept
+TASK_RUN_RETENTION = timedelta(days=30)
+
+
+def sweep_auth_tokens():
+    """Verification, OTP and password reset tokens past their expiry"""
+    return {Token._meta.db_table: cleanup_expired_tokens()}
+
+
+def sweep_jwt_tokens():
+    """Expired refresh tokens and their blacklist entries, like simplejwt's
+    flushexpiredtokens but in batches"""
+    deleted = delete_in_batches(
+        OutstandingToken.objects.filter(expires_at__lt=timezone.now())
+    )
+    return {
+        "token_blacklist_outstandingtoken": deleted.get(
+            "token_blacklist.OutstandingToken", 0
+        ),
+        "token_blacklist_blacklistedtoken": deleted.get(
+            "token_blacklist.BlacklistedToken", 0
+        ),
+    }
+
+
+def sweep_verification_codes():
+    """Expired codes of the database verification store; the Redis store
+    expires its own keys"""
+    codes = delete_in_batches(
+        VerificationCode.objects.filter(expires_at__lt=timezone.now())
+    )
+    return {VerificationCode._meta.db_table: codes.get(VerificationCode._meta.label, 0)}
+
+
+def deactivate_expired_jobs():
+    """Active jobs whose application deadline has passed"""
+    now = timezone.now()
+    updated = update_in_batches(
+        Job.objects.filter(is_active=True, application_deadline__lt=now.date()),
+        # update() skips auto_now; list ETags depend on updated_at
+        {"is_active": False, "updated_at": now},
+    )
+    return {Job._meta.db_table: updated}
+
+
+def apply_exchange_rates():
+    """Convert job and offer salaries again for currencies whose rate
+    changed since they were last converted, and clear those of currencies
+    whose rate was deleted"""
+    updated = {}
+    for exchange_rate in ExchangeRate.objects.exclude(applied_rate=F("rate")):
+        for table, count in convert_salaries(exchange_rate.currency, exchange_rate.rate).items():
+            updated[table] = updated.get(table, 0) + count
+        # Unless the rate changed again meanwhile
+        ExchangeRate.objects.filter(pk=exchange_rate.pk, rate=exchange_rate.rate).update(
+            applied_rate=exchange_rate.rate
+        )
+    for currency in unrated_currencies():
+        for table, count in convert_salaries(currency, None).items():
+            updated[table] = updated.get(table, 0) + count
+    return updated
+
+
+def match_saved_searches():
+    """New active jobs against the saved searches with alerts on"""
+    return match_new_jobs()
+
+
+def send_job_alert_digests():
+    """One email per user listing the new jobs of their saved searches"""
+    return send_digests()
+
+
+def send_event_reminders():
+    """Notifications to the registrants of events starting soon"""
+    return {Notification._meta.db_table: remind_registrants()}
+
+
+def prune_notifications():
+    """Read notifications past their retention and any past the longest"""
+    return {Notification._meta.db_table: prune_inbox()}
+
+
+def flush_activity():
+    """Buffered views, saves, applications and registrations, with the
+    batches workers queued in Redis"""
+    return {ActivityEvent._meta.db_table: flush_buffered_activity()}
+
+
+def prune_activity():
+    """Raw activity events and hourly rollups past their retention"""
+    now = timezone.now()
+    events = delete_in_batches(
+        ActivityEvent.objects.filter(
+            occurred_at__lt=now - settings.ANALYTICS_RAW_RETENTION
+        )
+    )
+    rollups = delete_in_batches(
+        ActivityRollup.objects.filter(
+            granularity="hour", bucket__lt=now - settings.ANALYTICS_HOURLY_RETENTION
+        )
+    )
+    return {
+        ActivityEvent._meta.db_table: events.get(ActivityEvent._meta.label, 0),
+        ActivityRollup._meta.db_table: rollups.get(ActivityRollup._meta.label, 0),
+    }
+
+
+def roll_up_metrics():
+    """Today's and recent days' dashboard buckets, recounted"""
+    jobs, roles = refresh_recent()
+    return {JobMetricDay._meta.db_table: jobs, RoleMetricDay._meta.db_table: roles}
+
+
+def refresh_system_alerts():
+    """Admin alert rules whose own cadence has elapsed"""
+    return {"rules_evaluated": len(refresh_alerts())}
+
+
+def prune_task_runs():
+    deleted = delete_in_batches(
+        TaskRun.objects.filter(started_at__lt=timezone.now() - TASK_RUN_RETENTION)
+    )
+    return {TaskRun._meta.db_table: deleted.get(TaskRun._meta.label, 0)}
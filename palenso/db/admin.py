@@ -20,6 +20,15 @@ from palenso.db.models import (
     Event,
     EventRegistration,
     MediaAssets,
+    SystemAlert,
+    TaskRun,
+    VerificationCode,
+    Term,
+    TermAlias,
+    ExchangeRate,
+    SavedSearch,
+    Notification,
+    ActivityRollup,
 )
 
 
@@ -369,3 +378,96 @@ class EventRegistrationAdmin(admin.ModelAdmin):
         ),
         ("Payment", {"fields": ("payment_status", "payment_amount")}),
     )
+
+
+@admin.register(SystemAlert)
+class SystemAlertAdmin(admin.ModelAdmin):
+    list_display = ("rule", "evaluated_at", "duration_ms", "error")
+    ordering = ("rule",)
+    readonly_fields = ("rule", "alerts", "evaluated_at", "duration_ms", "error")
+
+
+@admin.register(TaskRun)
+class TaskRunAdmin(admin.ModelAdmin):
+    list_display = ("task", "status", "started_at", "duration_ms")
+    list_filter = ("task", "status")
+    ordering = ("-started_at",)
+    readonly_fields = ("task", "started_at", "duration_ms", "status", "result", "error")
+
+
+@admin.register(VerificationCode)
+class VerificationCodeAdmin(admin.ModelAdmin):
+    list_display = ("user", "channel", "attempts", "expires_at")
+    list_filter = ("channel",)
+    readonly_fields = ("user", "channel", "attempts", "expires_at")
+    exclude = ("digest",)
+
+
+class TermAliasInline(admin.TabularInline):
+    model = TermAlias
+    fields = ("kind", "normalized")
+    extra = 1
+
+
+@admin.register(Term)
+class TermAdmin(admin.ModelAdmin):
+    list_display = ("name", "kind", "normalized")
+    list_filter = ("kind",)
+    search_fields = ("name", "normalized")
+    ordering = ("kind", "normalized")
+    inlines = [TermAliasInline]
+
+
+@admin.register(ExchangeRate)
+class ExchangeRateAdmin(admin.ModelAdmin):
+    list_display = ("currency", "rate", "applied_rate", "updated_at")
+    search_fields = ("currency",)
+    readonly_fields = ("applied_rate",)
+
+
+@admin.register(SavedSearch)
+class SavedSearchAdmin(admin.ModelAdmin):
+    list_display = ("name", "user", "anchor", "alerts_enabled", "created_at")
+    list_filter = ("alerts_enabled",)
+    search_fields = ("name", "user__email", "anchor")
+    readonly_fields = ("anchor",)
+    raw_id_fields = ("user",)
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ("title", "user", "kind", "is_read", "created_at")
+    list_filter = ("kind", "is_read")
+    search_fields = ("title", "user__email")
+    raw_id_fields = ("user",)
+
+    # Rows are added and removed with palenso.utils.notifications, which keeps
+    # the unread counters in step
+    def has_add_permission(self, request):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ActivityRollup)
+class ActivityRollupAdmin(admin.ModelAdmin):
+    list_display = (
+        "target_type",
+        "target_id",
+        "action",
+        "granularity",
+        "bucket",
+        "count",
+        "unique_visitors",
+    )
+    list_filter = ("target_type", "action", "granularity")
+    search_fields = ("target_id",)
+    exclude = ("visitors",)
+
+    # Written by palenso.analytics from buffered activity
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
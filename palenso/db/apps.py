@@ -7,3 +7,9 @@ class DbConfig(AppConfig):
     def ready(self):
         """Import signals when the app is ready"""
         import palenso.db.signals.base
+        import palenso.db.signals.taxonomy
+        import palenso.db.signals.autocomplete
+        import palenso.db.signals.geo
+        import palenso.db.signals.currency
+        import palenso.db.signals.status_events
+        import palenso.db.signals.analytics
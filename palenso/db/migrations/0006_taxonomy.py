@@ -0,0 +1,121 @@
+# Generated by Django 3.2.14 on 2026-10-19 06:39
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0005_verification_code'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Term',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Last Modified At')),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('skill', 'Skill'), ('tag', 'Tag')], max_length=20)),
+                ('name', models.CharField(max_length=100)),
+                ('normalized', models.CharField(max_length=100)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='term_created_by', to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='term_updated_by', to=settings.AUTH_USER_MODEL, verbose_name='Last Modified By')),
+            ],
+            options={
+                'db_table': 'terms',
+                'ordering': ['name'],
+                'unique_together': {('kind', 'normalized')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ProjectTechnology',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Last Modified At')),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='projecttechnology_created_by', to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='technology_links', to='db.project')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_links', to='db.term')),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='projecttechnology_updated_by', to=settings.AUTH_USER_MODEL, verbose_name='Last Modified By')),
+            ],
+            options={
+                'db_table': 'project_technologies',
+            },
+        ),
+        migrations.CreateModel(
+            name='JobSkill',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Last Modified At')),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('is_required', models.BooleanField(default=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobskill_created_by', to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to='db.job')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_links', to='db.term')),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobskill_updated_by', to=settings.AUTH_USER_MODEL, verbose_name='Last Modified By')),
+            ],
+            options={
+                'db_table': 'job_skills',
+            },
+        ),
+        migrations.CreateModel(
+            name='EventTag',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Last Modified At')),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='eventtag_created_by', to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='db.event')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='event_links', to='db.term')),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='eventtag_updated_by', to=settings.AUTH_USER_MODEL, verbose_name='Last Modified By')),
+            ],
+            options={
+                'db_table': 'event_tags',
+            },
+        ),
+        migrations.CreateModel(
+            name='TermAlias',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Last Modified At')),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('skill', 'Skill'), ('tag', 'Tag')], max_length=20)),
+                ('normalized', models.CharField(max_length=100)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='termalias_created_by', to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='db.term')),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='termalias_updated_by', to=settings.AUTH_USER_MODEL, verbose_name='Last Modified By')),
+            ],
+            options={
+                'db_table': 'term_aliases',
+                'unique_together': {('kind', 'normalized')},
+            },
+        ),
+        migrations.AddIndex(
+            model_name='projecttechnology',
+            index=models.Index(fields=['term', 'project'], name='project_tec_term_id_80849a_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='projecttechnology',
+            unique_together={('project', 'term')},
+        ),
+        migrations.AddIndex(
+            model_name='jobskill',
+            index=models.Index(fields=['term', 'is_required', 'job'], name='job_skills_term_id_9e3c38_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='jobskill',
+            unique_together={('job', 'term')},
+        ),
+        migrations.AddIndex(
+            model_name='eventtag',
+            index=models.Index(fields=['term', 'event'], name='event_tags_term_id_fa288f_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='eventtag',
+            unique_together={('event', 'term')},
+        ),
+    ]
@@ -0,0 +1,151 @@
+import re
+
+from django.db import migrations
+
+# Frozen copy of palenso.utils.taxonomy as of this migration, so later
+# changes there do not change what this backfill does
+
+SEPARATORS = re.compile(r"[,;\n]")
+
+SKILL_ALIASES = {
+    "JavaScript": ["js", "java script", "ecmascript"],
+    "TypeScript": ["ts"],
+    "Python": ["python3", "py"],
+    "PostgreSQL": ["postgres", "psql"],
+    "React": ["reactjs", "react.js"],
+    "Vue": ["vuejs", "vue.js"],
+    "Node.js": ["node", "nodejs"],
+    "Go": ["golang"],
+    "Kubernetes": ["k8s"],
+    "C++": ["cpp"],
+    "C#": ["csharp", "c sharp"],
+    "AWS": ["amazon web services"],
+    "GCP": ["google cloud", "google cloud platform"],
+    "Machine Learning": ["ml"],
+    "Artificial Intelligence": ["ai"],
+    "SQL": ["structured query language"],
+}
+
+# (model, link model, owner field, term kind, {text field: extra link values})
+LINKS = [
+    (
+        "Job",
+        "JobSkill",
+        "job",
+        "skill",
+        {"required_skills": {"is_required": True}, "preferred_skills": {"is_required": False}},
+    ),
+    ("Project", "ProjectTechnology", "project", "skill", {"technologies_used": {}}),
+    ("Event", "EventTag", "event", "tag", {"tags": {}}),
+]
+
+BATCH_SIZE = 2000
+
+
+def normalize_term(name):
+    return " ".join(name.split()).lower()
+
+
+def parse_terms(text):
+    terms = {}
+    for part in SEPARATORS.split(text or ""):
+        display = " ".join(part.split())
+        normalized = display.lower()
+        if normalized and len(normalized) <= 100:
+            terms.setdefault(normalized, display)
+    return list(terms.items())
+
+
+def seed_aliases(Term, TermAlias):
+    for name, spellings in SKILL_ALIASES.items():
+        term, _ = Term.objects.get_or_create(
+            kind="skill", normalized=normalize_term(name), defaults={"name": name}
+        )
+        for spelling in spellings:
+            TermAlias.objects.get_or_create(
+                kind="skill", normalized=normalize_term(spelling), defaults={"term": term}
+            )
+
+
+def resolve_terms(Term, TermAlias, kind, terms, cache):
+    """Term ids for ``(normalized, display)`` pairs, through aliases,
+    creating the terms that do not exist yet"""
+    missing = [normalized for normalized, _ in terms if normalized not in cache]
+    if missing:
+        cache.update(
+            TermAlias.objects.filter(kind=kind, normalized__in=missing).values_list(
+                "normalized", "term_id"
+            )
+        )
+        missing = [normalized for normalized in missing if normalized not in cache]
+    if missing:
+        cache.update(
+            Term.objects.filter(kind=kind, normalized__in=missing).values_list(
+                "normalized", "id"
+            )
+        )
+        new = [
+            Term(kind=kind, name=display[:100], normalized=normalized)
+            for normalized, display in terms
+            if normalized not in cache
+        ]
+        if new:
+            Term.objects.bulk_create(new, ignore_conflicts=True)
+            cache.update(
+                Term.objects.filter(
+                    kind=kind, normalized__in=[term.normalized for term in new]
+                ).values_list("normalized", "id")
+            )
+    return [cache[normalized] for normalized, _ in terms]
+
+
+def backfill_links(apps, model_name, link_name, owner, kind, fields):
+    Term = apps.get_model("db", "Term")
+    TermAlias = apps.get_model("db", "TermAlias")
+    model = apps.get_model("db", model_name)
+    link_model = apps.get_model("db", link_name)
+    cache = {}
+
+    last_pk = None
+    while True:
+        rows = model.objects.order_by("pk").values("pk", *fields)
+        if last_pk is not None:
+            rows = rows.filter(pk__gt=last_pk)
+        rows = list(rows[:BATCH_SIZE])
+        if not rows:
+            return
+        links = []
+        for row in rows:
+            desired = {}
+            for field, extra in fields.items():
+                terms = parse_terms(row[field])
+                for term_id in resolve_terms(Term, TermAlias, kind, terms, cache):
+                    desired.setdefault(term_id, extra)
+            links.extend(
+                link_model(**{f"{owner}_id": row["pk"]}, term_id=term_id, **extra)
+                for term_id, extra in desired.items()
+            )
+        link_model.objects.bulk_create(links, batch_size=5000, ignore_conflicts=True)
+        last_pk = rows[-1]["pk"]
+
+
+def backfill_terms(apps, schema_editor):
+    seed_aliases(apps.get_model("db", "Term"), apps.get_model("db", "TermAlias"))
+    for spec in LINKS:
+        backfill_links(apps, *spec)
+
+
+def clear_terms(apps, schema_editor):
+    # The link tables only mirror the text fields, which are untouched
+    apps.get_model("db", "Term").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0006_taxonomy"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_terms, clear_terms),
+    ]
@@ -0,0 +1,115 @@
+import csv
+import os
+import re
+
+from django.conf import settings
+from django.db import migrations
+
+# Frozen copy of the matching in palenso.utils.geo as of this migration, so
+# later changes there do not change what this backfill does. The place data
+# is still read from the gazetteer CSV; rerun the geocode_locations command
+# after changing it.
+
+SEPARATORS = re.compile(r"[,/;|()\n]|\s[-–]\s")
+NOISE = re.compile(r"\b(\d+|remote|hybrid|onsite|on-site|wfh|city|district)\b")
+MAX_WORDS = 3
+
+GEO_MODELS = [
+    ("Job", ("location",)),
+    ("Event", ("location",)),
+    ("Company", ("city", "state", "country")),
+]
+
+BATCH_SIZE = 2000
+
+
+def normalize_place(text):
+    return " ".join(NOISE.sub(" ", (text or "").lower()).split())
+
+
+def load_gazetteer():
+    """``{normalized name or alias: [(state, country, latitude, longitude,
+    population)]}``"""
+    path = settings.GEO_GAZETTEER_PATH or os.path.join(
+        os.path.dirname(__file__), os.pardir, os.pardir, "utils", "gazetteer.csv"
+    )
+    places = {}
+    with open(path, newline="", encoding="utf-8") as gazetteer:
+        for row in csv.DictReader(gazetteer):
+            place = (
+                normalize_place(row["state"]),
+                normalize_place(row["country"]),
+                float(row["latitude"]),
+                float(row["longitude"]),
+                int(row["population"] or 0),
+            )
+            for name in [row["name"], *row["aliases"].split("|")]:
+                if normalize_place(name):
+                    places.setdefault(normalize_place(name), []).append(place)
+    return places
+
+
+def candidates(parts):
+    for part in parts:
+        yield part
+    for part in parts:
+        words = part.split()
+        for size in range(min(len(words) - 1, MAX_WORDS), 0, -1):
+            for start in range(len(words) - size + 1):
+                yield " ".join(words[start : start + size])
+
+
+def geocode(gazetteer, texts):
+    parts = [
+        normalize_place(part)
+        for text in texts
+        for part in SEPARATORS.split(text or "")
+        if normalize_place(part)
+    ]
+    context = set(parts)
+    for candidate in candidates(parts):
+        places = gazetteer.get(candidate)
+        if places:
+            _, _, latitude, longitude, _ = max(
+                places,
+                key=lambda place: (place[0] in context or place[1] in context, place[4]),
+            )
+            return latitude, longitude
+    return None
+
+
+def geocode_rows(model, fields, gazetteer):
+    rows = model.objects.order_by("pk").filter(latitude__isnull=True)
+    last_pk = None
+    while True:
+        batch = rows if last_pk is None else rows.filter(pk__gt=last_pk)
+        batch = list(batch.values_list("pk", *fields)[:BATCH_SIZE])
+        if not batch:
+            return
+        by_point = {}
+        for pk, *texts in batch:
+            by_point.setdefault(geocode(gazetteer, texts), []).append(pk)
+        for point, pks in by_point.items():
+            if point is None:
+                continue
+            latitude, longitude = point
+            model.objects.filter(pk__in=pks).update(latitude=latitude, longitude=longitude)
+        last_pk = batch[-1][0]
+
+
+def geocode_locations(apps, schema_editor):
+    gazetteer = load_gazetteer()
+    for name, fields in GEO_MODELS:
+        geocode_rows(apps.get_model("db", name), fields, gazetteer)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0008_geo_coordinates"),
+    ]
+
+    operations = [
+        # Reversing 0008 drops the coordinates
+        migrations.RunPython(geocode_locations, migrations.RunPython.noop),
+    ]
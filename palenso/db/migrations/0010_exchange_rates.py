@@ -0,0 +1,68 @@
+# Generated by Django 3.2.14 on 2026-10-19 07:14
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0009_geocode_locations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRate',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Last Modified At')),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('currency', models.CharField(max_length=3, unique=True)),
+                ('rate', models.DecimalField(decimal_places=10, max_digits=20)),
+                ('applied_rate', models.DecimalField(blank=True, decimal_places=10, max_digits=20, null=True)),
+            ],
+            options={
+                'db_table': 'exchange_rates',
+                'ordering': ['currency'],
+            },
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_max_base',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_min_base',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='offer',
+            name='salary_amount_base',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['salary_min_base'], name='jobs_salary__7ddb13_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['salary_max_base'], name='jobs_salary__586726_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['salary_amount_base'], name='offers_salary__1891da_idx'),
+        ),
+        migrations.AddField(
+            model_name='exchangerate',
+            name='created_by',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='exchangerate_created_by', to=settings.AUTH_USER_MODEL, verbose_name='Created By'),
+        ),
+        migrations.AddField(
+            model_name='exchangerate',
+            name='updated_by',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='exchangerate_updated_by', to=settings.AUTH_USER_MODEL, verbose_name='Last Modified By'),
+        ),
+    ]
@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.db import migrations, transaction
+from django.db.models import F
+
+# Salary columns and the columns holding them in the base currency, as of
+# this migration
+SALARY_FIELDS = {
+    "Job": {"salary_min": "salary_min_base", "salary_max": "salary_max_base"},
+    "Offer": {"salary_amount": "salary_amount_base"},
+}
+
+BATCH_SIZE = 2000
+
+# Sorting by pay puts salaries in unknown currencies last. PostgreSQL only
+# reads an index backwards as DESC NULLS FIRST, so descending sorts need
+# their own index; SQLite puts NULLs last on DESC with the plain index.
+DESCENDING_INDEXES = [
+    ("jobs", "salary_min_base"),
+    ("jobs", "salary_max_base"),
+    ("offers", "salary_amount_base"),
+]
+
+
+def normalize_salaries(apps, schema_editor):
+    # No exchange rates exist yet, so only base currency salaries are
+    # copied, unchanged; the apply_exchange_rates task converts the other
+    # currencies once rates are added
+    for name, fields in SALARY_FIELDS.items():
+        rows = (
+            apps.get_model("db", name)
+            .objects.filter(salary_currency__iexact=settings.BASE_CURRENCY)
+            .order_by("pk")
+        )
+        values = {base_field: F(field) for field, base_field in fields.items()}
+        last_pk = None
+        while True:
+            batch = rows if last_pk is None else rows.filter(pk__gt=last_pk)
+            ids = list(batch.values_list("pk", flat=True)[:BATCH_SIZE])
+            if not ids:
+                break
+            with transaction.atomic():
+                rows.filter(pk__in=ids).update(**values)
+            last_pk = ids[-1]
+
+
+def create_descending_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table, column in DESCENDING_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX "{table}_{column}_desc" ON "{table}" ("{column}" DESC NULLS LAST)'
+        )
+
+
+def drop_descending_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table, column in DESCENDING_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{table}_{column}_desc"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0010_exchange_rates"),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_salaries, migrations.RunPython.noop),
+        migrations.RunPython(create_descending_indexes, drop_descending_indexes),
+    ]
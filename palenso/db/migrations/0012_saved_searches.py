@@ -0,0 +1,101 @@
+# Generated by Django 3.2.14 on 2026-10-19 07:25
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0011_normalize_salaries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Last Modified At')),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100)),
+                ('query', models.JSONField(default=dict)),
+                ('anchor', models.CharField(editable=False, max_length=120)),
+                ('alerts_enabled', models.BooleanField(default=True)),
+            ],
+            options={
+                'db_table': 'saved_searches',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SavedSearchMatch',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Last Modified At')),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+            ],
+            options={
+                'db_table': 'saved_search_matches',
+            },
+        ),
+        # Jobs posted before saved searches existed are not alerted on
+        migrations.AddField(
+            model_name='job',
+            name='search_matched',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='search_matched',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['search_matched', 'is_active'], name='jobs_search__60caaa_idx'),
+        ),
+        migrations.AddField(
+            model_name='savedsearchmatch',
+            name='created_by',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='savedsearchmatch_created_by', to=settings.AUTH_USER_MODEL, verbose_name='Created By'),
+        ),
+        migrations.AddField(
+            model_name='savedsearchmatch',
+            name='job',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_matches', to='db.job'),
+        ),
+        migrations.AddField(
+            model_name='savedsearchmatch',
+            name='search',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matches', to='db.savedsearch'),
+        ),
+        migrations.AddField(
+            model_name='savedsearchmatch',
+            name='updated_by',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='savedsearchmatch_updated_by', to=settings.AUTH_USER_MODEL, verbose_name='Last Modified By'),
+        ),
+        migrations.AddField(
+            model_name='savedsearch',
+            name='created_by',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='savedsearch_created_by', to=settings.AUTH_USER_MODEL, verbose_name='Created By'),
+        ),
+        migrations.AddField(
+            model_name='savedsearch',
+            name='updated_by',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='savedsearch_updated_by', to=settings.AUTH_USER_MODEL, verbose_name='Last Modified By'),
+        ),
+        migrations.AddField(
+            model_name='savedsearch',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterUniqueTogether(
+            name='savedsearchmatch',
+            unique_together={('search', 'job')},
+        ),
+        migrations.AddIndex(
+            model_name='savedsearch',
+            index=models.Index(fields=['anchor', 'alerts_enabled'], name='saved_searc_anchor_d29868_idx'),
+        ),
+    ]
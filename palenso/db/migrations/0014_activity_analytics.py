@@ -0,0 +1,60 @@
+# Generated by Django 3.2.14 on 2026-10-19 07:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0013_notifications'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('occurred_at', models.DateTimeField()),
+                ('target_type', models.CharField(choices=[('job', 'Job'), ('event', 'Event')], max_length=10)),
+                ('target_id', models.UUIDField()),
+                ('action', models.CharField(choices=[('view', 'View'), ('save', 'Save'), ('apply', 'Apply'), ('register', 'Register')], max_length=10)),
+                ('visitor', models.CharField(max_length=64)),
+            ],
+            options={
+                'db_table': 'activity_events',
+            },
+        ),
+        migrations.CreateModel(
+            name='ActivityRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=4)),
+                ('bucket', models.DateTimeField()),
+                ('target_type', models.CharField(choices=[('job', 'Job'), ('event', 'Event')], max_length=10)),
+                ('target_id', models.UUIDField()),
+                ('action', models.CharField(choices=[('view', 'View'), ('save', 'Save'), ('apply', 'Apply'), ('register', 'Register')], max_length=10)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('unique_visitors', models.PositiveIntegerField(default=0)),
+                ('visitors', models.BinaryField()),
+            ],
+            options={
+                'db_table': 'activity_rollups',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='activityrollup',
+            index=models.Index(fields=['granularity', 'bucket'], name='activity_ro_granula_f529b7_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='activityrollup',
+            unique_together={('target_type', 'target_id', 'granularity', 'bucket', 'action')},
+        ),
+        migrations.AddIndex(
+            model_name='activityevent',
+            index=models.Index(fields=['target_type', 'target_id', 'occurred_at'], name='activity_ev_target__d98be7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activityevent',
+            index=models.Index(fields=['occurred_at'], name='activity_ev_occurre_5fccc1_idx'),
+        ),
+    ]
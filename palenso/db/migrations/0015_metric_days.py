@@ -0,0 +1,97 @@
+# Generated by Django 3.2.14 on 2026-10-19 07:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0014_activity_analytics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobMetricDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('metric', models.CharField(max_length=30)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'job_metric_days',
+            },
+        ),
+        migrations.CreateModel(
+            name='RoleMetricDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('role', models.CharField(max_length=20)),
+                ('metric', models.CharField(max_length=30)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'role_metric_days',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['created_at'], name='events_created_9e2206_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventregistration',
+            index=models.Index(fields=['created_at'], name='event_regis_created_cd7605_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['created_at'], name='interviews_created_a62a66_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['created_at'], name='job_applica_created_f3e88d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['created_at'], name='offers_created_9f8ec4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='savedjob',
+            index=models.Index(fields=['created_at'], name='saved_jobs_created_89b32f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['date_joined'], name='db_user_date_jo_1a7ea5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rolemetricday',
+            index=models.Index(fields=['day'], name='role_metric_day_821ff0_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='rolemetricday',
+            unique_together={('role', 'metric', 'day')},
+        ),
+        migrations.AddField(
+            model_name='jobmetricday',
+            name='company',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='db.company'),
+        ),
+        migrations.AddField(
+            model_name='jobmetricday',
+            name='job',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='db.job'),
+        ),
+        migrations.AddIndex(
+            model_name='jobmetricday',
+            index=models.Index(fields=['job', 'metric', 'day'], name='job_metric__job_id_d8d02f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobmetricday',
+            index=models.Index(fields=['day'], name='job_metric__day_ae3277_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='jobmetricday',
+            unique_together={('company', 'metric', 'day', 'job')},
+        ),
+    ]
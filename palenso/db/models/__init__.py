@@ -19,3 +19,19 @@ from .company import Company
 from .job import Job, JobApplication, SavedJob
 
 from .event import Event, EventRegistration
+
+from .alert import SystemAlert
+
+from .task import TaskRun
+
+from .verification import VerificationCode
+
+from .taxonomy import Term, TermAlias, JobSkill, ProjectTechnology, EventTag
+
+from .currency import ExchangeRate
+
+from .search import SavedSearch, SavedSearchMatch
+
+from .notification import Notification, NotificationCounter
+
+from .analytics import ActivityEvent, ActivityRollup, JobMetricDay, RoleMetricDay
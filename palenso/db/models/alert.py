@@ -0,0 +1,21 @@
+from django.db import models
+
+from palenso.db.models.base import BaseModel
+
+
+class SystemAlert(BaseModel):
+    """Latest result of one admin system alert rule, refreshed in the
+    background by palenso.bgtasks.alerts"""
+
+    rule = models.CharField(max_length=100, unique=True)
+    alerts = models.JSONField(default=list)
+    evaluated_at = models.DateTimeField(null=True, blank=True)
+    duration_ms = models.FloatField(null=True, blank=True)
+    # Last failure, kept alongside the previous successful result
+    error = models.TextField(blank=True, default="")
+
+    class Meta:
+        db_table = "system_alerts"
+
+    def __str__(self):
+        return f"{self.rule} ({len(self.alerts)})"
@@ -0,0 +1,115 @@
+from django.db import models
+
+TARGET_CHOICES = (
+    ("job", "Job"),
+    ("event", "Event"),
+)
+
+ACTION_CHOICES = (
+    ("view", "View"),
+    ("save", "Save"),
+    ("apply", "Apply"),
+    ("register", "Register"),
+)
+
+
+class ActivityEvent(models.Model):
+    """One view, save, application or registration of a job or event
+
+    Append-only and written in batches by palenso.analytics, never on the
+    request path. The target is not a foreign key so deleting a job keeps
+    its history and inserts skip the constraint check.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    occurred_at = models.DateTimeField()
+    target_type = models.CharField(max_length=10, choices=TARGET_CHOICES)
+    target_id = models.UUIDField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    # User id, or a keyed hash of the client IP and user agent for
+    # anonymous visitors
+    visitor = models.CharField(max_length=64)
+
+    class Meta:
+        db_table = "activity_events"
+        indexes = [
+            models.Index(fields=["target_type", "target_id", "occurred_at"]),
+            models.Index(fields=["occurred_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.action} {self.target_type} {self.target_id}"
+
+
+class ActivityRollup(models.Model):
+    """Events of one target and action in an hour or a day, with a
+    HyperLogLog sketch of the visitors so unique counts can be merged
+    across buckets"""
+
+    GRANULARITY_CHOICES = (
+        ("hour", "Hour"),
+        ("day", "Day"),
+    )
+
+    granularity = models.CharField(max_length=4, choices=GRANULARITY_CHOICES)
+    bucket = models.DateTimeField()
+    target_type = models.CharField(max_length=10, choices=TARGET_CHOICES)
+    target_id = models.UUIDField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    count = models.PositiveIntegerField(default=0)
+    unique_visitors = models.PositiveIntegerField(default=0)
+    # palenso.analytics.hyperloglog.HyperLogLog.to_bytes()
+    visitors = models.BinaryField()
+
+    class Meta:
+        db_table = "activity_rollups"
+        unique_together = ("target_type", "target_id", "granularity", "bucket", "action")
+        indexes = [
+            models.Index(fields=["granularity", "bucket"]),
+        ]
+
+    def __str__(self):
+        return f"{self.action} {self.target_type} {self.target_id} {self.bucket}"
+
+
+class JobMetricDay(models.Model):
+    """Rows of one job metric (applications, interviews, ...) created on one
+    local day, rebuilt from the source tables by
+    palenso.analytics.timeseries"""
+
+    day = models.DateField()
+    company = models.ForeignKey("Company", on_delete=models.CASCADE, related_name="+")
+    job = models.ForeignKey("Job", on_delete=models.CASCADE, related_name="+")
+    metric = models.CharField(max_length=30)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "job_metric_days"
+        # Leads with company, metric, day for company-wide ranges
+        unique_together = ("company", "metric", "day", "job")
+        indexes = [
+            models.Index(fields=["job", "metric", "day"]),
+            models.Index(fields=["day"]),
+        ]
+
+    def __str__(self):
+        return f"{self.metric} {self.job_id} {self.day}: {self.count}"
+
+
+class RoleMetricDay(models.Model):
+    """Like JobMetricDay, per role of the user concerned (signups, ...)"""
+
+    day = models.DateField()
+    role = models.CharField(max_length=20)
+    metric = models.CharField(max_length=30)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "role_metric_days"
+        unique_together = ("role", "metric", "day")
+        indexes = [
+            models.Index(fields=["day"]),
+        ]
+
+    def __str__(self):
+        return f"{self.metric} {self.role} {self.day}: {self.count}"
@@ -39,6 +39,9 @@ class Company(BaseModel):
     state = models.CharField(max_length=100)
     city = models.CharField(max_length=100)
     address = models.TextField(blank=True)
+    # Set from the city, state and country by palenso.utils.geo
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
 
     # Company Media
     logo_url = models.URLField(
@@ -60,6 +63,9 @@ class Company(BaseModel):
     class Meta:
         db_table = "companies"
         verbose_name_plural = "Companies"
+        indexes = [
+            models.Index(fields=["latitude", "longitude"]),
+        ]
 
     def __str__(self):
         return self.name
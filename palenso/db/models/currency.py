@@ -0,0 +1,30 @@
+from django.db import models
+
+from palenso.db.models.base import BaseModel
+
+
+class ExchangeRate(BaseModel):
+    """Value of one unit of ``currency`` in ``settings.BASE_CURRENCY``
+
+    Job and offer salaries keep their own currency; the ``*_base`` columns
+    hold them converted at these rates, see palenso.utils.currency.
+    """
+
+    currency = models.CharField(max_length=3, unique=True)
+    rate = models.DecimalField(max_digits=20, decimal_places=10)
+    # Rate the stored salaries were last converted at; the
+    # apply_exchange_rates task converts them again when it differs
+    applied_rate = models.DecimalField(
+        max_digits=20, decimal_places=10, null=True, blank=True
+    )
+
+    class Meta:
+        db_table = "exchange_rates"
+        ordering = ["currency"]
+
+    def __str__(self):
+        return f"{self.currency} {self.rate}"
+
+    def save(self, *args, **kwargs):
+        self.currency = self.currency.upper().strip()
+        super().save(*args, **kwargs)
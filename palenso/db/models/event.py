@@ -40,6 +40,9 @@ class Event(BaseModel):
     location = models.CharField(max_length=200)
     is_virtual = models.BooleanField(default=False)
     virtual_meeting_url = models.URLField(blank=True)
+    # Set from the location text by palenso.utils.geo
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
 
     # Capacity and Registration
     max_participants = models.IntegerField(null=True, blank=True)
@@ -58,10 +61,16 @@ class Event(BaseModel):
     # Status
     is_active = models.BooleanField(default=True)
     is_featured = models.BooleanField(default=False)
+    # When registrants were sent their reminder notification
+    reminder_sent_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         db_table = "events"
         ordering = ["-start_date"]
+        indexes = [
+            models.Index(fields=["latitude", "longitude"]),
+            models.Index(fields=["created_at"]),
+        ]
 
     def __str__(self):
         return self.title
@@ -132,6 +141,9 @@ class EventRegistration(BaseModel):
         db_table = "event_registrations"
         ordering = ["-registration_date"]
         unique_together = ["event", "participant"]
+        indexes = [
+            models.Index(fields=["created_at"]),
+        ]
 
     def __str__(self):
         return f"{self.participant.get_full_name()} - {self.event.title}"
@@ -40,6 +40,9 @@ class Job(BaseModel):
     # Location and Salary
     location = models.CharField(max_length=200)
     is_remote = models.BooleanField(default=False)
+    # Set from the location text by palenso.utils.geo
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
     salary_min = models.DecimalField(
         max_digits=10, decimal_places=2, null=True, blank=True
     )
@@ -47,6 +50,14 @@ class Job(BaseModel):
         max_digits=10, decimal_places=2, null=True, blank=True
     )
     salary_currency = models.CharField(max_length=3, default="USD")
+    # Salaries in settings.BASE_CURRENCY, set on save by palenso.utils.currency;
+    # empty when the currency has no exchange rate
+    salary_min_base = models.DecimalField(
+        max_digits=14, decimal_places=2, null=True, blank=True
+    )
+    salary_max_base = models.DecimalField(
+        max_digits=14, decimal_places=2, null=True, blank=True
+    )
 
     # Skills and Categories
     required_skills = models.TextField(blank=True)  # Comma-separated skills
@@ -60,10 +71,18 @@ class Job(BaseModel):
     # Status
     is_active = models.BooleanField(default=True)
     is_featured = models.BooleanField(default=False)
+    # Set once the job has been matched against saved searches
+    search_matched = models.BooleanField(default=False)
 
     class Meta:
         db_table = "jobs"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["latitude", "longitude"]),
+            models.Index(fields=["salary_min_base"]),
+            models.Index(fields=["salary_max_base"]),
+            models.Index(fields=["search_matched", "is_active"]),
+        ]
 
     def __str__(self):
         return f"{self.title} at {self.company.name}"
@@ -123,6 +142,9 @@ class JobApplication(BaseModel):
         db_table = "job_applications"
         ordering = ["-created_at"]
         unique_together = ["job", "applicant"]
+        indexes = [
+            models.Index(fields=["created_at"]),
+        ]
 
     def __str__(self):
         return f"{self.applicant.get_full_name()} - {self.job.title}"
@@ -142,6 +164,9 @@ class SavedJob(BaseModel):
         db_table = "saved_jobs"
         ordering = ["-saved_at"]
         unique_together = ["student", "job"]
+        indexes = [
+            models.Index(fields=["created_at"]),
+        ]
 
     def __str__(self):
         return f"{self.student.get_full_name()} - {self.job.title}"
@@ -194,6 +219,9 @@ class Interview(BaseModel):
     class Meta:
         db_table = "interviews"
         ordering = ["-scheduled_at"]
+        indexes = [
+            models.Index(fields=["created_at"]),
+        ]
 
     def __str__(self):
         return f"{self.application.applicant.get_full_name()} - {self.application.job.title}"
@@ -213,6 +241,10 @@ class Offer(BaseModel):
     position_title = models.CharField(max_length=200)
     salary_amount = models.DecimalField(max_digits=10, decimal_places=2)
     salary_currency = models.CharField(max_length=3, default="USD")
+    # salary_amount in settings.BASE_CURRENCY, see Job.salary_min_base
+    salary_amount_base = models.DecimalField(
+        max_digits=14, decimal_places=2, null=True, blank=True
+    )
     job_type = models.CharField(
         max_length=20,
         choices=[
@@ -249,6 +281,10 @@ class Offer(BaseModel):
     class Meta:
         db_table = "offers"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["salary_amount_base"]),
+            models.Index(fields=["created_at"]),
+        ]
 
     def __str__(self):
         return f"{self.application.applicant.get_full_name()} - {self.position_title}"
@@ -0,0 +1,57 @@
+from django.db import models
+
+from palenso.db.models.base import BaseModel
+
+
+class Notification(BaseModel):
+    """In-app inbox entry, one row per recipient, see
+    palenso.utils.notifications"""
+
+    KIND_CHOICES = (
+        ("application_received", "Application Received"),
+        ("application_status", "Application Status"),
+        ("interview_scheduled", "Interview Scheduled"),
+        ("interview_updated", "Interview Updated"),
+        ("offer_made", "Offer Made"),
+        ("offer_response", "Offer Response"),
+        ("event_reminder", "Event Reminder"),
+    )
+
+    user = models.ForeignKey("User", on_delete=models.CASCADE, related_name="notifications")
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+    # Ids of the objects it is about, e.g. {"application_id": ...}
+    data = models.JSONField(default=dict, blank=True)
+    is_read = models.BooleanField(default=False)
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "notifications"
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["user", "created_at", "id"]),
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.title}"
+
+
+class NotificationCounter(models.Model):
+    """Unread notifications of one user, kept in step with the inbox in the
+    same transactions, so the badge count is a primary key read"""
+
+    user = models.OneToOneField(
+        "User",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="notification_counter",
+    )
+    unread = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "notification_counters"
+
+    def __str__(self):
+        return f"{self.user_id} ({self.unread})"
@@ -0,0 +1,47 @@
+from django.db import models
+
+from palenso.db.models.base import BaseModel
+
+
+class SavedSearch(BaseModel):
+    """Job filters a user saved, matched against new jobs by
+    palenso.utils.saved_search and sent to them in a daily digest"""
+
+    user = models.ForeignKey("User", on_delete=models.CASCADE, related_name="saved_searches")
+    name = models.CharField(max_length=100)
+    # JobFilter parameters in normalized form, usable as /api/jobs?<query>
+    query = models.JSONField(default=dict)
+    # One predicate every matching job satisfies, e.g. "skill:python"; the
+    # matcher only loads searches whose anchor a new job has
+    anchor = models.CharField(max_length=120, editable=False)
+    alerts_enabled = models.BooleanField(default=True)
+
+    class Meta:
+        db_table = "saved_searches"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["anchor", "alerts_enabled"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.name}"
+
+    def save(self, *args, **kwargs):
+        from palenso.utils.saved_search import anchor_key
+
+        self.anchor = anchor_key(self.query)
+        super().save(*args, **kwargs)
+
+
+class SavedSearchMatch(BaseModel):
+    """New job matching a saved search, waiting for the next digest"""
+
+    search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name="matches")
+    job = models.ForeignKey("Job", on_delete=models.CASCADE, related_name="search_matches")
+
+    class Meta:
+        db_table = "saved_search_matches"
+        unique_together = ["search", "job"]
+
+    def __str__(self):
+        return f"{self.search_id} - {self.job_id}"
@@ -0,0 +1,29 @@
+from django.db import models
+
+from palenso.db.models.base import BaseModel
+
+
+class TaskRun(BaseModel):
+    """One run of a periodic background task, see palenso.bgtasks.scheduler"""
+
+    STATUS_CHOICES = (
+        ("succeeded", "Succeeded"),
+        ("failed", "Failed"),
+    )
+
+    task = models.CharField(max_length=100)
+    started_at = models.DateTimeField()
+    duration_ms = models.FloatField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    # Rows affected per table, as returned by the task
+    result = models.JSONField(default=dict)
+    error = models.TextField(blank=True, default="")
+
+    class Meta:
+        db_table = "task_runs"
+        indexes = [
+            models.Index(fields=["task", "-started_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.task} {self.status} at {self.started_at}"
@@ -0,0 +1,95 @@
+from django.db import models
+
+from palenso.db.models.base import BaseModel
+
+
+class Term(BaseModel):
+    """Canonical skill or tag, see palenso.utils.taxonomy
+
+    Jobs, projects and events keep their comma separated text fields; the
+    link tables below mirror them so filters can join on an index instead
+    of scanning the text.
+    """
+
+    KIND_CHOICES = (
+        ("skill", "Skill"),
+        ("tag", "Tag"),
+    )
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    name = models.CharField(max_length=100)
+    # Lowercased with whitespace collapsed, the form lookups match on
+    normalized = models.CharField(max_length=100)
+
+    class Meta:
+        db_table = "terms"
+        unique_together = ["kind", "normalized"]
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+
+class TermAlias(BaseModel):
+    """Alternative spelling that resolves to a canonical term, e.g. "js" to
+    "JavaScript" """
+
+    kind = models.CharField(max_length=20, choices=Term.KIND_CHOICES)
+    normalized = models.CharField(max_length=100)
+    term = models.ForeignKey(Term, on_delete=models.CASCADE, related_name="aliases")
+
+    class Meta:
+        db_table = "term_aliases"
+        unique_together = ["kind", "normalized"]
+
+    def __str__(self):
+        return f"{self.normalized} -> {self.term.name}"
+
+
+class JobSkill(BaseModel):
+    job = models.ForeignKey("Job", on_delete=models.CASCADE, related_name="skill_links")
+    term = models.ForeignKey(Term, on_delete=models.CASCADE, related_name="job_links")
+    # Listed in required_skills rather than only in preferred_skills
+    is_required = models.BooleanField(default=True)
+
+    class Meta:
+        db_table = "job_skills"
+        unique_together = ["job", "term"]
+        indexes = [
+            models.Index(fields=["term", "is_required", "job"]),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id} - {self.term_id}"
+
+
+class ProjectTechnology(BaseModel):
+    project = models.ForeignKey(
+        "Project", on_delete=models.CASCADE, related_name="technology_links"
+    )
+    term = models.ForeignKey(Term, on_delete=models.CASCADE, related_name="project_links")
+
+    class Meta:
+        db_table = "project_technologies"
+        unique_together = ["project", "term"]
+        indexes = [
+            models.Index(fields=["term", "project"]),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} - {self.term_id}"
+
+
+class EventTag(BaseModel):
+    event = models.ForeignKey("Event", on_delete=models.CASCADE, related_name="tag_links")
+    term = models.ForeignKey(Term, on_delete=models.CASCADE, related_name="event_links")
+
+    class Meta:
+        db_table = "event_tags"
+        unique_together = ["event", "term"]
+        indexes = [
+            models.Index(fields=["term", "event"]),
+        ]
+
+    def __str__(self):
+        return f"{self.event_id} - {self.term_id}"
@@ -98,6 +98,12 @@ class User(AbstractBaseUser, BaseModel):
     USERNAME_FIELD = "username"
     REQUIRED_FIELDS = ["email", "first_name", "last_name"]
 
+    class Meta:
+        # Signups per day, see palenso.analytics.timeseries
+        indexes = [
+            models.Index(fields=["date_joined"]),
+        ]
+
     def __str__(self):
         return self.username
 
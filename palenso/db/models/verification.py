@@ -0,0 +1,34 @@
+from django.db import models
+from django.utils import timezone
+
+from palenso.db.models.base import BaseModel
+
+
+class VerificationCode(BaseModel):
+    """Outstanding one time code for a user on one channel, used when no
+    Redis is configured, see palenso.utils.verification"""
+
+    CHANNEL_CHOICES = (
+        ("email", "Email"),
+        ("mobile", "Mobile"),
+    )
+
+    user = models.ForeignKey(
+        "User", on_delete=models.CASCADE, related_name="verification_codes"
+    )
+    channel = models.CharField(max_length=20, choices=CHANNEL_CHOICES)
+    # HMAC of the code, never the code itself
+    digest = models.CharField(max_length=64)
+    attempts = models.PositiveIntegerField(default=0)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "verification_codes"
+        unique_together = ("user", "channel")
+
+    def __str__(self):
+        return f"{self.user_id} - {self.channel}"
+
+    def is_expired(self):
+        return timezone.now() > self.expires_at
+
@@ -0,0 +1,25 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from palenso.analytics.buffer import record
+from palenso.db.models import EventRegistration, JobApplication, SavedJob
+
+# Target type, target field, action and acting user field per model
+ACTIVITY = {
+    SavedJob: ("job", "job_id", "save", "student_id"),
+    JobApplication: ("job", "job_id", "apply", "applicant_id"),
+    EventRegistration: ("event", "event_id", "register", "participant_id"),
+}
+
+
+@receiver(post_save, sender=SavedJob)
+@receiver(post_save, sender=JobApplication)
+@receiver(post_save, sender=EventRegistration)
+def record_activity(sender, instance, created, raw, **kwargs):
+    if raw or not created:
+        return
+    target_type, target_field, action, user_field = ACTIVITY[sender]
+    target_id = getattr(instance, target_field)
+    visitor = str(getattr(instance, user_field))
+    transaction.on_commit(lambda: record(target_type, target_id, action, visitor))
@@ -0,0 +1,72 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from palenso.db.models import Company, Job, Skill
+from palenso.utils.autocomplete import get_autocomplete, tracked_fields
+
+TRACKED = tracked_fields()
+
+
+def _publish(changes):
+    autocomplete = get_autocomplete()
+    for name, value, delta in changes:
+        autocomplete.publish(name, value, delta)
+
+
+@receiver(pre_save, sender=Company)
+@receiver(pre_save, sender=Job)
+@receiver(pre_save, sender=Skill)
+def load_autocomplete_values(sender, instance, raw, update_fields, **kwargs):
+    """Read the stored values an update replaces, in one query, so the save
+    can retract them; loading instances costs nothing extra"""
+    instance._autocomplete_values = {}
+    if raw or instance._state.adding:
+        return
+    fields = [
+        field
+        for field in TRACKED[sender._meta.label]
+        if update_fields is None or field in update_fields
+    ]
+    if fields:
+        instance._autocomplete_values = (
+            sender.objects.filter(pk=instance.pk).values(*fields).first() or {}
+        )
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_save, sender=Job)
+@receiver(post_save, sender=Skill)
+def publish_autocomplete_changes(sender, instance, created, raw, update_fields, **kwargs):
+    if raw:
+        return
+    old = instance._autocomplete_values
+    changes = []
+    for field, names in TRACKED[sender._meta.label].items():
+        if update_fields is not None and field not in update_fields:
+            continue
+        value = getattr(instance, field)
+        if created or field not in old:
+            changes.extend((name, value, 1) for name in names)
+        elif old[field] != value:
+            changes.extend((name, old[field], -1) for name in names)
+            changes.extend((name, value, 1) for name in names)
+    if changes:
+        transaction.on_commit(lambda: _publish(changes))
+
+
+@receiver(post_delete, sender=Company)
+@receiver(post_delete, sender=Job)
+@receiver(post_delete, sender=Skill)
+def retract_autocomplete_values(sender, instance, **kwargs):
+    # A deferred value cannot be loaded from a deleted row; the next
+    # rebuild corrects its count
+    deferred = instance.get_deferred_fields()
+    changes = [
+        (name, getattr(instance, field), -1)
+        for field, names in TRACKED[sender._meta.label].items()
+        if field not in deferred
+        for name in names
+    ]
+    if changes:
+        transaction.on_commit(lambda: _publish(changes))
@@ -0,0 +1,33 @@
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from palenso.db.models import Job
+from palenso.db.models.job import Offer
+from palenso.utils.currency import SALARY_FIELDS, normalize_salaries
+
+
+def _salary_fields(sender):
+    return {"salary_currency", *SALARY_FIELDS[sender._meta.label]}
+
+
+@receiver(pre_save, sender=Job)
+@receiver(pre_save, sender=Offer)
+def set_base_salaries(sender, instance, raw, update_fields, **kwargs):
+    if not raw and update_fields is None:
+        normalize_salaries(instance)
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_save, sender=Offer)
+def update_base_salaries(sender, instance, raw, update_fields, **kwargs):
+    """Saves limited to some fields do not write the base salaries, so
+    write them separately when a salary was among those fields"""
+    if raw or update_fields is None:
+        return
+    base_fields = set(SALARY_FIELDS[sender._meta.label].values())
+    if set(update_fields) & _salary_fields(sender) and not base_fields <= set(update_fields):
+        normalize_salaries(instance)
+        sender.objects.filter(pk=instance.pk).update(
+            **{field: getattr(instance, field) for field in base_fields}
+        )
+
@@ -0,0 +1,40 @@
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from palenso.db.models import Company, Event, Job
+from palenso.utils.geo import geocode
+
+LOCATION_FIELDS = {
+    Job: ("location",),
+    Event: ("location",),
+    Company: ("city", "state", "country"),
+}
+
+
+def _locate(instance):
+    point = geocode(*(getattr(instance, field) for field in LOCATION_FIELDS[type(instance)]))
+    instance.latitude, instance.longitude = point or (None, None)
+
+
+@receiver(pre_save, sender=Company)
+@receiver(pre_save, sender=Event)
+@receiver(pre_save, sender=Job)
+def set_coordinates(sender, instance, raw, update_fields, **kwargs):
+    """Locate the row from its location text on every full save"""
+    if not raw and update_fields is None:
+        _locate(instance)
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=Job)
+def update_coordinates(sender, instance, raw, update_fields, **kwargs):
+    """Saves limited to some fields do not write the coordinates, so write
+    them separately when the location text was among those fields"""
+    if raw or update_fields is None or "latitude" in update_fields:
+        return
+    if set(update_fields) & set(LOCATION_FIELDS[sender]):
+        _locate(instance)
+        sender.objects.filter(pk=instance.pk).update(
+            latitude=instance.latitude, longitude=instance.longitude
+        )
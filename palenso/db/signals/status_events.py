@@ -0,0 +1,42 @@
+from django.db import transaction
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from palenso.db.models import EventRegistration, JobApplication
+from palenso.db.models.job import Interview, Offer
+from palenso.utils.notifications import notify_changes
+from palenso.utils.status_events import publish_changes
+
+
+@receiver(pre_save, sender=JobApplication)
+@receiver(pre_save, sender=Interview)
+@receiver(pre_save, sender=Offer)
+@receiver(pre_save, sender=EventRegistration)
+def load_previous_status(sender, instance, raw, update_fields, **kwargs):
+    """Read the stored status an update replaces, in one query, so the save
+    can tell whether it changed; loading instances costs nothing extra"""
+    instance._previous_status = None
+    if raw or instance._state.adding:
+        return
+    if update_fields is None or "status" in update_fields:
+        instance._previous_status = (
+            sender.objects.filter(pk=instance.pk).values_list("status", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=JobApplication)
+@receiver(post_save, sender=Interview)
+@receiver(post_save, sender=Offer)
+@receiver(post_save, sender=EventRegistration)
+def publish_status_change(sender, instance, created, raw, update_fields, **kwargs):
+    if raw or (update_fields is not None and "status" not in update_fields):
+        return
+    previous = None if created else instance._previous_status
+    if not created and previous == instance.status:
+        return
+    transaction.on_commit(lambda: on_status_change(sender._meta.label, [(instance, previous)]))
+
+
+def on_status_change(label, changes):
+    publish_changes(label, changes)
+    notify_changes(label, changes)
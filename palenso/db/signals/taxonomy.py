@@ -0,0 +1,28 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from palenso.db.models import Event, Job, Project
+from palenso.utils.taxonomy import LINKS, sync_links
+
+
+def _text_changed(name, update_fields):
+    return update_fields is None or bool(set(LINKS[name].fields) & set(update_fields))
+
+
+@receiver(post_save, sender=Job)
+def sync_job_skills(sender, instance, raw, update_fields, **kwargs):
+    """Keep job_skills in step with required_skills and preferred_skills"""
+    if not raw and _text_changed("job", update_fields):
+        sync_links(instance, "job")
+
+
+@receiver(post_save, sender=Project)
+def sync_project_technologies(sender, instance, raw, update_fields, **kwargs):
+    if not raw and _text_changed("project", update_fields):
+        sync_links(instance, "project")
+
+
+@receiver(post_save, sender=Event)
+def sync_event_tags(sender, instance, raw, update_fields, **kwargs):
+    if not raw and _text_changed("event", update_fields):
+        sync_links(instance, "event")
@@ -0,0 +1,146 @@
+import gzip
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Payloads smaller than this do not shrink enough to pay for the CPU
+COMPRESSION_MIN_SIZE = getattr(settings, "COMPRESSION_MIN_SIZE", 1024)
+
+# Only the API is compressed here; whitenoise serves pre-compressed statics
+COMPRESSION_PATH_PREFIXES = getattr(settings, "COMPRESSION_PATH_PREFIXES", ("/api/",))
+
+COMPRESSIBLE_CONTENT_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "text/csv",
+    "text/html",
+    "text/plain",
+)
+
+GZIP_LEVEL = 6
+
+# Quality 5 compresses JSON noticeably better than gzip -6 at similar speed
+BROTLI_QUALITY = 5
+
+
+def parse_accept_encoding(header):
+    """Return ``{coding: qvalue}`` from an Accept-Encoding header"""
+    codings = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        qvalue = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    qvalue = float(value)
+                except ValueError:
+                    qvalue = 0.0
+        codings[coding] = qvalue
+    return codings
+
+
+def choose_encoding(header):
+    """Pick ``br`` or ``gzip`` from what the client accepts, or None"""
+    codings = parse_accept_encoding(header)
+    wildcard = codings.get("*", 0.0)
+
+    available = ["gzip"]
+    if brotli is not None:
+        # Listed first so it wins ties
+        available.insert(0, "br")
+
+    best, best_q = None, 0.0
+    for coding in available:
+        qvalue = codings.get(coding, wildcard)
+        if qvalue > best_q:
+            best, best_q = coding, qvalue
+    return best
+
+
+def compress_bytes(content, encoding):
+    if encoding == "br":
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    return gzip.compress(content, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def compress_stream(chunks, encoding):
+    """Compress a streaming response chunk by chunk, flushing after each so
+    clients see rows as they are produced"""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+
+    # wbits 31 writes the gzip header and trailer
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class CompressionMiddleware:
+    """Compress API responses with brotli or gzip
+
+    Responses are left alone when they are already encoded, too small, not a
+    text-like content type, or outside ``COMPRESSION_PATH_PREFIXES``. Brotli
+    is used when the ``brotli`` package is installed and the client accepts
+    it. Strong ETags are weakened, as the body no longer matches byte for
+    byte.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if not request.path.startswith(COMPRESSION_PATH_PREFIXES):
+            return response
+        if response.has_header("Content-Encoding") or response.status_code == 304:
+            return response
+
+        content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type not in COMPRESSIBLE_CONTENT_TYPES:
+            return response
+        if not response.streaming and len(response.content) < COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        encoding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_stream(
+                response.streaming_content, encoding
+            )
+            del response["Content-Length"]
+        else:
+            compressed = compress_bytes(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = encoding
+        return response
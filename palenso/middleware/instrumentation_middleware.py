@@ -0,0 +1,110 @@
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from palenso.utils import instrumentation
+
+
+def track_queries(stats):
+    """Count the SQL run on every configured database in ``stats``"""
+    stack = ExitStack()
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(stats))
+    return stack
+
+
+class InstrumentedStream:
+    """Streaming content that keeps counting into ``stats`` while it is
+    iterated, and records the request when the server closes the response
+
+    The queries of an export or event stream run after the view returned,
+    outside the middleware; each chunk is produced with the execute
+    wrappers installed again, on whichever thread the server iterates on.
+    """
+
+    def __init__(self, content, stats, finish):
+        self.content = iter(content)
+        self.stats = stats
+        self.finish = finish
+        self.response_bytes = None
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        token = instrumentation.activate(self.stats)
+        try:
+            with track_queries(self.stats):
+                chunk = next(self.content)
+        finally:
+            instrumentation.deactivate(token)
+        self.response_bytes = (self.response_bytes or 0) + len(chunk)
+        return chunk
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.finish(self.response_bytes)
+
+
+class InstrumentationMiddleware:
+    """Record query count, duplicate queries, DB time, serializer time and
+    response size per route
+
+    SQL is counted with ``connection.execute_wrapper`` on every configured
+    database, so the cost per query is two clock reads and a dict update.
+    Set ``REQUEST_METRICS_ENABLED = False`` to remove it from the stack, and
+    ``REQUEST_METRICS_HEADERS = True`` to also report the query count and DB
+    time on each response (used by the HTTP benchmark runner).
+
+    Streaming responses are recorded when the server closes them, with the
+    queries and bytes of the whole stream; they get no headers, which would
+    be sent before most of their queries run.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_METRICS_ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.send_headers = getattr(settings, "REQUEST_METRICS_HEADERS", False)
+        instrumentation.install_serializer_timing()
+
+    def __call__(self, request):
+        stats = instrumentation.RequestStats()
+        token = instrumentation.activate(stats)
+        started = time.perf_counter()
+        try:
+            with track_queries(stats):
+                response = self.get_response(request)
+        finally:
+            instrumentation.deactivate(token)
+
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match else "unmatched"
+
+        def finish(response_bytes):
+            instrumentation.record(
+                stats,
+                route,
+                request.method,
+                response.status_code,
+                time.perf_counter() - started,
+                response_bytes,
+            )
+
+        if response.streaming:
+            # Django closes the new content along with the original
+            response.streaming_content = InstrumentedStream(
+                response.streaming_content, stats, finish
+            )
+            return response
+
+        finish(len(response.content))
+        if self.send_headers:
+            response["X-DB-Queries"] = str(stats.query_count)
+            response["X-DB-Time-Ms"] = "{:.2f}".format(stats.db_time * 1000)
+        return response
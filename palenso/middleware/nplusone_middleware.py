@@ -0,0 +1,38 @@
+import random
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from palenso.utils.nplusone import DEFAULT_THRESHOLD, NPlusOneError, detect, logger
+
+
+class NPlusOneMiddleware:
+    """Flag requests that repeat the same query from the same line
+
+    Off unless ``NPLUSONE_ENABLED`` is set. ``NPLUSONE_MODE`` is ``"log"``
+    (warn and carry on) or ``"raise"``; ``NPLUSONE_SAMPLE_RATE`` is the
+    fraction of requests inspected and ``NPLUSONE_THRESHOLD`` the number of
+    identical queries tolerated per call site.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "NPLUSONE_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.mode = getattr(settings, "NPLUSONE_MODE", "log")
+        self.sample_rate = getattr(settings, "NPLUSONE_SAMPLE_RATE", 1.0)
+        self.threshold = getattr(settings, "NPLUSONE_THRESHOLD", DEFAULT_THRESHOLD)
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        with detect(threshold=self.threshold) as detector:
+            response = self.get_response(request)
+
+        if detector.offenders:
+            message = f"{request.method} {request.path}\n{detector.report()}"
+            if self.mode == "raise":
+                raise NPlusOneError(message)
+            logger.warning(message)
+        return response
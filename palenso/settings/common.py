@@ -26,6 +26,7 @@ INSTALLED_APPS = [
     # Inhouse apps
     "palenso.analytics",
     "palenso.api",
+    "palenso.benchmarks",
     "palenso.bgtasks",
     "palenso.db",
     "palenso.utils",
@@ -42,6 +43,9 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "palenso.middleware.compression_middleware.CompressionMiddleware",
+    "palenso.middleware.instrumentation_middleware.InstrumentationMiddleware",
+    "palenso.middleware.nplusone_middleware.NPlusOneMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -56,7 +60,7 @@ REST_FRAMEWORK = {
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
-    "DEFAULT_RENDERER_CLASSES": ("rest_framework.renderers.JSONRenderer",),
+    "DEFAULT_RENDERER_CLASSES": ("palenso.api.renderers.FastJSONRenderer",),
     "DEFAULT_FILTER_BACKENDS": ("django_filters.rest_framework.DjangoFilterBackend",),
 }
 
@@ -111,6 +115,181 @@ JWT_AUTH = {
 
 WSGI_APPLICATION = "palenso.wsgi.application"
 
+# Route the endpoints that wait on SMTP, Twilio or S3 to their async views.
+# palenso/asgi.py turns this on; under WSGI the async views gain nothing.
+ASYNC_VIEWS = os.environ.get("ASYNC_VIEWS", "0") == "1"
+# Upstream calls from async views that may wait at once, per process
+UPSTREAM_THREADS = int(os.environ.get("UPSTREAM_THREADS", "64"))
+
+# Dashboard sections run concurrently on this many threads per process, each
+# with its own database connection; 0 runs them one after another
+DASHBOARD_SECTION_WORKERS = int(os.environ.get("DASHBOARD_SECTION_WORKERS", "8"))
+# Seconds a section may take before the dashboard is returned without it
+DASHBOARD_SECTION_TIMEOUT = float(os.environ.get("DASHBOARD_SECTION_TIMEOUT", "2"))
+
+# Admin system alert rules, refreshed by the refresh_system_alerts command
+SYSTEM_ALERT_RULES = [
+    "palenso.bgtasks.alerts.PendingApplicationsRule",
+    "palenso.bgtasks.alerts.ExpiredJobsRule",
+    "palenso.bgtasks.alerts.LowEventRegistrationRule",
+    "palenso.bgtasks.alerts.InactiveUsersRule",
+    "palenso.bgtasks.alerts.CompaniesWithoutJobsRule",
+]
+
+# Background tasks run by the run_periodic_tasks command; intervals in seconds
+PERIODIC_TASKS = {
+    "refresh_system_alerts": {
+        "task": "palenso.bgtasks.tasks.refresh_system_alerts",
+        "interval": 60,
+    },
+    "deactivate_expired_jobs": {
+        "task": "palenso.bgtasks.tasks.deactivate_expired_jobs",
+        "interval": 60 * 60,
+    },
+    "sweep_auth_tokens": {
+        "task": "palenso.bgtasks.tasks.sweep_auth_tokens",
+        "interval": 60 * 60,
+    },
+    "sweep_verification_codes": {
+        "task": "palenso.bgtasks.tasks.sweep_verification_codes",
+        "interval": 60 * 60,
+    },
+    "sweep_jwt_tokens": {
+        "task": "palenso.bgtasks.tasks.sweep_jwt_tokens",
+        "interval": 24 * 60 * 60,
+    },
+    "apply_exchange_rates": {
+        "task": "palenso.bgtasks.tasks.apply_exchange_rates",
+        "interval": 5 * 60,
+    },
+    "match_saved_searches": {
+        "task": "palenso.bgtasks.tasks.match_saved_searches",
+        "interval": 5 * 60,
+    },
+    "send_job_alert_digests": {
+        "task": "palenso.bgtasks.tasks.send_job_alert_digests",
+        "interval": 24 * 60 * 60,
+    },
+    "send_event_reminders": {
+        "task": "palenso.bgtasks.tasks.send_event_reminders",
+        "interval": 15 * 60,
+    },
+    "prune_notifications": {
+        "task": "palenso.bgtasks.tasks.prune_notifications",
+        "interval": 24 * 60 * 60,
+    },
+    "flush_activity": {
+        "task": "palenso.bgtasks.tasks.flush_activity",
+        "interval": 60,
+    },
+    "prune_activity": {
+        "task": "palenso.bgtasks.tasks.prune_activity",
+        "interval": 24 * 60 * 60,
+    },
+    "roll_up_metrics": {
+        "task": "palenso.bgtasks.tasks.roll_up_metrics",
+        "interval": 5 * 60,
+    },
+    "prune_task_runs": {
+        "task": "palenso.bgtasks.tasks.prune_task_runs",
+        "interval": 24 * 60 * 60,
+    },
+}
+# Seconds between checks for due tasks
+BGTASKS_POLL_INTERVAL = 30
+# Rows per transaction in batched sweeps, and seconds to pause between batches
+BGTASKS_BATCH_SIZE = 1000
+BGTASKS_BATCH_PAUSE = 0.1
+# Run the scheduler on a thread inside runserver instead of a separate process
+BGTASKS_RUN_LOCALLY = False
+
+# Seconds facet counts for a set of job or event filters stay cached
+FACETS_CACHE_TTL = 30
+
+# Cities with coordinates that job, event and company locations are matched
+# against, as CSV with the columns of palenso/utils/gazetteer.csv; empty for
+# the bundled one
+GEO_GAZETTEER_PATH = os.environ.get("GEO_GAZETTEER_PATH", "")
+# Kilometres around ?near= when ?radius= is not given, and the largest allowed
+GEO_DEFAULT_RADIUS_KM = 25
+GEO_MAX_RADIUS_KM = 500
+
+# Currency job and offer salaries are compared and sorted in, see the
+# ExchangeRate model
+BASE_CURRENCY = os.environ.get("BASE_CURRENCY", "USD")
+
+# Saved job searches per user, new jobs listed per search in a digest and
+# users whose digests are built and sent together
+SAVED_SEARCH_LIMIT = 20
+SAVED_SEARCH_DIGEST_JOBS = 10
+SAVED_SEARCH_DIGEST_BATCH_SIZE = 100
+
+# Autocomplete indexes live in each worker; changes reach the other
+# workers through Redis when a URL is set, otherwise at the next rebuild
+AUTOCOMPLETE_REDIS_URL = os.environ.get("REDIS_URL", "")
+AUTOCOMPLETE_SYNC_INTERVAL = 1
+AUTOCOMPLETE_REBUILD_INTERVAL = 60 * 60
+# Changes kept per source in Redis; a worker further behind rebuilds
+AUTOCOMPLETE_STREAM_LENGTH = 10000
+
+# Verification codes sent by email and SMS. Kept in Redis when a URL is
+# set, in the database otherwise
+VERIFICATION_REDIS_URL = os.environ.get("REDIS_URL", "")
+VERIFICATION_CODE_TTL = 10 * 60
+VERIFICATION_MAX_ATTEMPTS = 5
+
+# Status changes of applications, interviews, offers and event registrations
+# pushed to the users concerned. Published over Redis pub/sub when a URL is
+# set; otherwise only listeners in the publishing process receive them
+STATUS_EVENTS_REDIS_URL = os.environ.get("REDIS_SUB_URL", "")
+# Events kept per user for clients that reconnect, and for how many seconds
+STATUS_EVENTS_BACKLOG = 100
+STATUS_EVENTS_BACKLOG_TTL = 24 * 60 * 60
+# Longest long poll and event stream, in seconds, the interval of keepalive
+# comments in a stream and the reconnect delay given to EventSource clients
+STATUS_EVENTS_POLL_TIMEOUT = 25
+STATUS_EVENTS_STREAM_TIMEOUT = 5 * 60
+STATUS_EVENTS_HEARTBEAT = 15
+STATUS_EVENTS_RETRY_MS = 3000
+
+# In-app notifications: read ones are pruned after the first period, all
+# after the second; event reminders go out this long before the start
+NOTIFICATIONS_READ_RETENTION = timedelta(days=30)
+NOTIFICATIONS_RETENTION = timedelta(days=90)
+EVENT_REMINDER_LEAD = timedelta(hours=24)
+
+# Job and event views, saves, applications and registrations are buffered
+# in each worker and flushed in batches every ANALYTICS_FLUSH_INTERVAL
+# seconds or ANALYTICS_FLUSH_SIZE events. With a Redis URL the batches are
+# queued there for the flush_activity task; otherwise each worker writes them
+ANALYTICS_REDIS_URL = os.environ.get("REDIS_URL", "")
+ANALYTICS_FLUSH_INTERVAL = 5
+ANALYTICS_FLUSH_SIZE = 500
+# Events held per worker while flushes fail; further ones are dropped
+ANALYTICS_BUFFER_LIMIT = 50000
+# Raw events and hourly rollups are pruned after these; daily rollups stay
+ANALYTICS_RAW_RETENTION = timedelta(days=30)
+ANALYTICS_HOURLY_RETENTION = timedelta(days=14)
+
+# Daily metric buckets behind /api/dashboard-analytics/series: days
+# recounted by the roll_up_metrics task, and days per transaction when
+# backfilling with python manage.py backfill_metrics
+METRICS_REFRESH_DAYS = 2
+METRICS_BACKFILL_CHUNK_DAYS = 7
+
+# Sliding window limits for unauthenticated endpoints, per throttle_scope,
+# see palenso.api.throttles; the only request limits, verification codes
+# included. Shared across workers when Redis is configured
+RATE_LIMIT_REDIS_URL = os.environ.get("REDIS_URL", "")
+RATE_LIMITS = {
+    "signin": {"ip": "20/m", "identifier": "10/10m"},
+    "signup": {"ip": "10/h", "identifier": "5/h"},
+    "forgot_password": {"ip": "10/h", "identifier": "5/h"},
+    "check_user": {"ip": "30/m"},
+    "request_verification": {"ip": ["10/m", "20/h"], "identifier": ["3/m", "5/h"]},
+    "verify_medium": {"ip": ["30/m", "60/h"], "identifier": ["10/m", "20/h"]},
+}
+
 # Django Sites
 
 SITE_ID = 1
@@ -39,6 +39,14 @@ DEBUG_TOOLBAR_PATCH_SETTINGS = False
 
 INTERNAL_IPS = ("127.0.0.1",)
 
+BGTASKS_RUN_LOCALLY = True
+
+NPLUSONE_ENABLED = True
+NPLUSONE_MODE = "log"
+
+# Query count and DB time headers for the HTTP benchmark runner
+REQUEST_METRICS_HEADERS = True
+
 CORS_ORIGIN_ALLOW_ALL = True
 
 sentry_sdk.init(
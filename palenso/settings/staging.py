@@ -33,6 +33,11 @@ sentry_sdk.init(
     traces_sample_rate=0.7,
 )
 
+# Log requests repeating the same query from one call site, on a sample
+NPLUSONE_ENABLED = True
+NPLUSONE_MODE = "log"
+NPLUSONE_SAMPLE_RATE = 0.1
+
 # Enable Connection Pooling (if desired)
 # DATABASES['default']['ENGINE'] = 'django_postgrespool'
 
@@ -0,0 +1,52 @@
+import pytest
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from palenso.api.views.event import EventRegistrationExportEndpoint
+from palenso.api.views.job import JobApplicationExportEndpoint
+from palenso.db.models import User
+from palenso.utils.export import iter_csv, iter_ndjson
+
+COLUMNS = [("name", "name"), ("amount", "amount")]
+
+
+def test_csv_escapes_formula_cells():
+    rows = [("=1+1", -5), ("+1 555", None), ("@SUM(A1)", 1), ("-2", 2)]
+    assert "".join(iter_csv(rows, COLUMNS)).splitlines() == [
+        "name,amount",
+        "'=1+1,-5",
+        "'+1 555,",
+        "'@SUM(A1),1",
+        "'-2,2",
+    ]
+
+
+def test_csv_leaves_plain_cells_alone():
+    rows = [("Ada", 3), ("a=b", 4)]
+    assert "".join(iter_csv(rows, COLUMNS)).splitlines() == [
+        "name,amount",
+        "Ada,3",
+        "a=b,4",
+    ]
+
+
+def test_ndjson_is_not_escaped():
+    assert "".join(iter_ndjson([("=1+1", 1)], COLUMNS)) == '{"name":"=1+1","amount":1}\n'
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "view, param",
+    [
+        (EventRegistrationExportEndpoint, "event_id"),
+        (JobApplicationExportEndpoint, "job_id"),
+    ],
+)
+def test_export_rejects_malformed_ids(view, param):
+    admin = User.objects.create(
+        username="admin", email="admin@example.com", role="admin"
+    )
+    request = APIRequestFactory().get("/", {param: "not-a-uuid"})
+    force_authenticate(request, user=admin)
+    response = view.as_view()(request)
+    assert response.status_code == 400
+    assert response.data == {"error": f"{param} must be a UUID"}
@@ -0,0 +1,60 @@
+from unittest import mock
+
+import pytest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+
+from palenso.db.models import User
+from palenso.middleware.instrumentation_middleware import InstrumentationMiddleware
+
+pytestmark = pytest.mark.django_db
+
+
+def rows():
+    for _ in range(3):
+        yield f"{User.objects.count()}\n"
+
+
+@pytest.fixture
+def record():
+    with mock.patch("palenso.utils.instrumentation.record") as record:
+        yield record
+
+
+def test_plain_response_is_recorded_when_returned(record):
+    def view(request):
+        User.objects.count()
+        return HttpResponse("ok")
+
+    InstrumentationMiddleware(view)(RequestFactory().get("/"))
+    stats, route, method, status, duration, response_bytes = record.call_args.args
+    assert (stats.query_count, method, status, response_bytes) == (1, "GET", 200, 2)
+
+
+def test_streaming_response_is_recorded_when_closed(record):
+    def view(request):
+        User.objects.count()
+        return StreamingHttpResponse(rows())
+
+    response = InstrumentationMiddleware(view)(RequestFactory().get("/"))
+    assert not record.called
+
+    assert b"".join(response) == b"0\n0\n0\n"
+    assert not record.called
+    response.close()
+    response.close()
+
+    record.assert_called_once()
+    stats, route, method, status, duration, response_bytes = record.call_args.args
+    assert (stats.query_count, response_bytes) == (4, 6)
+
+
+def test_stream_closed_early_is_recorded(record):
+    response = InstrumentationMiddleware(lambda request: StreamingHttpResponse(rows()))(
+        RequestFactory().get("/")
+    )
+    next(iter(response))
+    response.close()
+
+    stats, *_, response_bytes = record.call_args.args
+    assert (stats.query_count, response_bytes) == (1, 2)
@@ -0,0 +1,33 @@
+import pytest
+from rest_framework.test import APIClient
+
+from palenso.db.models import Company, Job, User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def jobs():
+    employer = User.objects.create(username="employer", email="employer@example.com")
+    company = Company.objects.create(name="Acme", employer=employer)
+    return [
+        Job.objects.create(title=f"Job {index}", company=company, description="Job")
+        for index in range(5)
+    ]
+
+
+def test_job_list(jobs, nplusone):
+    client = APIClient()
+    client.force_authenticate(jobs[0].company.employer)
+    response = client.get("/api/jobs")
+    assert response.status_code == 200
+    assert len(response.data) == len(jobs)
+
+
+@pytest.mark.nplusone(threshold=2)
+def test_lazy_relation_is_reported(jobs, nplusone):
+    for job in Job.objects.all():
+        job.company.name
+    assert len(nplusone.offenders) == 1
+    # Reported above, so the fixture's own check passes
+    nplusone.offenders.clear()
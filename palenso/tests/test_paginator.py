@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from palenso.db.models import Notification, User
+from palenso.utils.paginator import KeysetCursor, KeysetPaginator
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def notifications():
+    """Five notifications, newest first, two sharing a timestamp"""
+    user = User.objects.create(username="user", email="user@example.com")
+    now = timezone.now()
+    created = [now, now - timedelta(minutes=1), now - timedelta(minutes=1)]
+    created += [now - timedelta(minutes=2), now - timedelta(minutes=3)]
+    for index, created_at in enumerate(created):
+        notification = Notification.objects.create(
+            user=user, kind="offer_made", title=str(index)
+        )
+        Notification.objects.filter(pk=notification.pk).update(created_at=created_at)
+    return list(Notification.objects.order_by("-created_at", "-id"))
+
+
+def page(cursor=None, limit=2):
+    result = KeysetPaginator(Notification.objects.all()).get_result(
+        limit=limit, cursor=cursor and KeysetCursor.from_string(str(cursor))
+    )
+    return result, [row.pk for row in result]
+
+
+def ids(rows):
+    return [row.pk for row in rows]
+
+
+def test_first_page(notifications):
+    result, rows = page()
+    assert rows == ids(notifications[:2])
+    assert (result.next.has_results, result.prev.has_results) == (True, False)
+
+
+def test_middle_page(notifications):
+    first, _ = page()
+    result, rows = page(first.next)
+    assert rows == ids(notifications[2:4])
+    assert (result.next.has_results, result.prev.has_results) == (True, True)
+
+    back, rows = page(result.prev)
+    assert rows == ids(notifications[:2])
+    assert (back.next.has_results, back.prev.has_results) == (True, False)
+
+
+def test_last_page(notifications):
+    result, _ = page()
+    result, _ = page(result.next)
+    result, rows = page(result.next)
+    assert rows == ids(notifications[4:])
+    assert (result.next.has_results, result.prev.has_results) == (False, True)
+
+
+def test_exact_last_page(notifications):
+    result, rows = page(limit=5)
+    assert rows == ids(notifications)
+    assert (result.next.has_results, result.prev.has_results) == (False, False)
+
+
+def test_empty_page_after_the_last_row(notifications):
+    cursor = KeysetCursor.from_row(notifications[-1])
+    result, rows = page(cursor)
+    assert rows == []
+    assert (result.next.has_results, result.prev.has_results) == (False, True)
+    assert result.prev.value != cursor.value
+
+    _, rows = page(result.prev)
+    assert rows == ids(notifications[-2:])
+
+
+def test_empty_page_before_the_first_row(notifications):
+    cursor = KeysetCursor.from_row(notifications[0], is_prev=True)
+    result, rows = page(cursor)
+    assert rows == []
+    assert (result.next.has_results, result.prev.has_results) == (True, False)
+
+    _, rows = page(result.next)
+    assert rows == ids(notifications[:2])
+
+
+def test_empty_list():
+    result, rows = page()
+    assert rows == []
+    assert (result.next.has_results, result.prev.has_results) == (False, False)
+
+
+def test_malformed_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        KeysetCursor.from_string("123.not-a-uuid:0:0")
@@ -0,0 +1,146 @@
+from unittest import mock
+
+import pytest
+from django.test import override_settings
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from palenso.api.throttles import AuthRateThrottle
+from palenso.utils.ratelimit import RateLimiter
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class ThrottledView(APIView):
+    authentication_classes = ()
+    permission_classes = (AllowAny,)
+    throttle_classes = (AuthRateThrottle,)
+    throttle_scope = "test"
+
+    def post(self, request):
+        return Response({})
+
+
+@pytest.fixture
+def limiter():
+    limiter = RateLimiter(clock=Clock())
+    with mock.patch("palenso.api.throttles.get_limiter", return_value=limiter):
+        yield limiter
+
+
+def post(email, ip):
+    request = APIRequestFactory().post(
+        "/", {"email": email}, format="json", REMOTE_ADDR=ip
+    )
+    return ThrottledView.as_view()(request).status_code
+
+
+def counts(limiter, key_type):
+    return sorted(
+        count
+        for key, (_, count, _) in limiter.local.windows.items()
+        if key.startswith(f"test:{key_type}:")
+    )
+
+
+@override_settings(RATE_LIMITS={"test": {"ip": "2/m", "identifier": "5/m"}})
+def test_rejected_requests_do_not_count_against_other_keys(limiter):
+    assert [post("victim@example.com", "10.0.0.1") for _ in range(5)] == [
+        200,
+        200,
+        429,
+        429,
+        429,
+    ]
+    assert counts(limiter, "identifier") == [2]
+
+    # The account keeps the rest of its budget from another address
+    assert [post("victim@example.com", "10.0.0.2") for _ in range(2)] == [200, 200]
+    assert [post("victim@example.com", "10.0.0.3") for _ in range(2)] == [200, 429]
+    assert counts(limiter, "identifier") == [5]
+    assert counts(limiter, "ip") == [1, 2, 2]
+
+
+@override_settings(RATE_LIMITS={"test": {"ip": ["3/m", "4/h"]}})
+def test_rejected_requests_do_not_count_against_other_rates(limiter):
+    assert [post("a@example.com", "10.0.0.1") for _ in range(4)] == [200, 200, 200, 429]
+    limiter.clock.now += 60
+    assert [post("a@example.com", "10.0.0.1") for _ in range(3)] == [200, 429, 429]
+    # The minute window only counted the request the hour cap let through
+    minute = [
+        count for key, (_, count, _) in limiter.local.windows.items() if key.endswith(":60")
+    ]
+    assert minute == [1]
+
+
+def test_local_window_rollover():
+    clock = Clock(600.0)
+    limiter = RateLimiter(clock=clock)
+    assert [limiter.hit("key", "2/m")[0] for _ in range(3)] == [True, True, False]
+
+    # Half way into the next window the previous one still weighs 2 * 0.5
+    clock.now += 90
+    assert limiter.hit("key", "2/m") == (True, 0)
+    allowed, wait = limiter.hit("key", "2/m")
+    assert not allowed and wait > 0
+
+    # Two windows later nothing is left of either
+    clock.now += 120
+    assert [limiter.hit("key", "2/m")[0] for _ in range(3)] == [True, True, False]
+
+
+@pytest.fixture(params=["local", "redis"])
+def backend_limiter(request):
+    if request.param == "local":
+        yield RateLimiter(clock=Clock())
+        return
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+    with mock.patch("redis.Redis.from_url", return_value=client):
+        limiter = RateLimiter("redis://", clock=Clock())
+    limiter.client = client
+    yield limiter
+
+
+def test_sliding_window(backend_limiter):
+    clock = backend_limiter.clock
+    clock.now = 600.0
+    assert [backend_limiter.hit("key", "4/m")[0] for _ in range(5)] == [
+        True,
+        True,
+        True,
+        True,
+        False,
+    ]
+    # 40 s into the next window a third of the previous one remains
+    clock.now += 100
+    assert [backend_limiter.hit("key", "4/m")[0] for _ in range(4)] == [True, True, True, False]
+    allowed, wait = backend_limiter.hit("key", "4/m")
+    assert not allowed and wait == 5
+
+
+def test_hit_all_counts_all_or_nothing(backend_limiter):
+    assert backend_limiter.hit_all([("a", "1/m"), ("b", "5/m")]) == (True, [0, 0])
+    allowed, waits = backend_limiter.hit_all([("a", "1/m"), ("b", "5/m")])
+    assert not allowed and waits[0] > 0 and waits[1] == 0
+    if backend_limiter.redis is None:
+        assert backend_limiter.local.windows["b:60"][1] == 1
+    else:
+        assert int(backend_limiter.client.get("ratelimit:b:60:16")) == 1
+
+
+def test_redis_failure_falls_back_to_local(backend_limiter):
+    if backend_limiter.redis is None:
+        pytest.skip("no Redis backend")
+    with mock.patch.object(backend_limiter.redis, "script", side_effect=ConnectionError):
+        assert backend_limiter.hit("key", "1/m") == (True, 0)
+        assert not backend_limiter.hit("key", "1/m")[0]
+    assert backend_limiter.local.windows["key:60"][1] == 1
@@ -0,0 +1,100 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.utils import timezone
+
+from palenso.db.models import User, VerificationCode
+from palenso.utils import verification
+from palenso.utils.verification import (
+    DatabaseStore,
+    RedisStore,
+    code_digest,
+    issue_code,
+    verify_code,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+def expire_database(user, channel):
+    VerificationCode.objects.filter(user=user, channel=channel).update(
+        expires_at=timezone.now() - timedelta(seconds=1)
+    )
+
+
+@pytest.fixture(params=["database", "redis"])
+def store(request, settings):
+    settings.VERIFICATION_MAX_ATTEMPTS = 3
+    if request.param == "database":
+        store = DatabaseStore()
+        store.expire = expire_database
+    else:
+        fakeredis = pytest.importorskip("fakeredis")
+        with mock.patch("redis.Redis.from_url", return_value=fakeredis.FakeRedis()):
+            store = RedisStore("redis://")
+        store.expire = lambda user, channel: store.client.delete(store.code_key(user, channel))
+    with mock.patch.object(verification, "_store", store):
+        yield store
+
+
+@pytest.fixture
+def user():
+    return User.objects.create(username="user", email="user@example.com")
+
+
+def wrong(code):
+    return f"{(int(code) + 1) % 1000000:06d}"
+
+
+def test_code_is_consumed(store, user):
+    code = issue_code(user, "email", user.email)
+    assert verify_code(user, "email", user.email, code)
+    assert not verify_code(user, "email", user.email, code)
+
+
+def test_code_is_bound_to_user_channel_and_address(store, user):
+    other = User.objects.create(username="other", email="other@example.com")
+    code = issue_code(user, "email", user.email)
+    assert not verify_code(other, "email", user.email, code)
+    assert not verify_code(user, "mobile", user.email, code)
+    assert not verify_code(user, "email", "someone@example.com", code)
+
+
+def test_expired_code_does_not_match(store, user):
+    code = issue_code(user, "email", user.email)
+    store.expire(user, "email")
+    assert not verify_code(user, "email", user.email, code)
+
+
+def test_wrong_code_counts_as_an_attempt(store, user):
+    code = issue_code(user, "email", user.email)
+    assert not verify_code(user, "email", user.email, wrong(code))
+    assert not verify_code(user, "email", user.email, wrong(code))
+    assert verify_code(user, "email", user.email, code)
+
+    # Once the attempts are used up the right code stops matching too
+    code = issue_code(user, "email", user.email)
+    for _ in range(3):
+        assert not verify_code(user, "email", user.email, wrong(code))
+    assert not verify_code(user, "email", user.email, code)
+
+
+def test_new_code_replaces_the_old_one(store, user):
+    old = issue_code(user, "email", user.email)
+    new = issue_code(user, "email", user.email)
+    if old != new:
+        assert not verify_code(user, "email", user.email, old)
+    assert verify_code(user, "email", user.email, new)
+
+
+def test_only_the_digest_is_stored(user):
+    code = issue_code(user, "email", user.email)
+    stored = VerificationCode.objects.get(user=user, channel="email")
+    assert stored.digest == code_digest(user, "email", user.email, code)
+    assert code not in stored.digest
+
+
+def test_addresses_are_normalized(store, user):
+    code = issue_code(user, "email", " User@Example.com ")
+    assert verify_code(user, "email", "user@example.com", f" {code} ")
@@ -1,5 +1,5 @@
 import uuid
-import random
+import secrets
 import string
 import logging
 
@@ -8,6 +8,7 @@ from django.utils import timezone
 from django.core.mail import send_mail
 from django.conf import settings
 
+from palenso.bgtasks.batching import delete_in_batches
 from palenso.db.models import Token, User
 
 logger = logging.getLogger(__name__)
@@ -15,7 +16,7 @@ logger = logging.getLogger(__name__)
 
 def generate_otp(length=6):
     """Generate a random OTP of specified length"""
-    return "".join(random.choices(string.digits, k=length))
+    return "".join(secrets.choice(string.digits) for _ in range(length))
 
 
 def generate_token():
@@ -153,9 +154,9 @@ def send_password_reset_email(user, token):
 
 
 def cleanup_expired_tokens():
-    """Clean up expired tokens"""
+    """Clean up expired tokens, in batches; returns the number deleted"""
     expired_tokens = Token.objects.filter(expires_at__lt=timezone.now())
-    expired_tokens.delete()
+    return delete_in_batches(expired_tokens).get(Token._meta.label, 0)
 
 
 def get_user_by_email_or_mobile(identifier):
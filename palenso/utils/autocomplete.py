@@ -0,0 +1,319 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left, bisect_right
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count
+
+from sentry_sdk import capture_exception
+
+from palenso.utils.metrics import REGISTRY
+from palenso.utils.taxonomy import normalize_term
+
+REBUILDS = REGISTRY.counter(
+    "palenso_autocomplete_rebuilds_total",
+    "Autocomplete indexes built from the database, by source",
+    ("source",),
+)
+SYNC_ERRORS = REGISTRY.counter(
+    "palenso_autocomplete_sync_errors_total",
+    "Autocomplete changes not read from or written to Redis",
+)
+
+
+class Source:
+    """A model field whose values are suggested"""
+
+    def __init__(self, model, field):
+        self.model = model
+        self.field = field
+
+
+SOURCES = {
+    "companies": Source("db.Company", "name"),
+    "job_titles": Source("db.Job", "title"),
+    "locations": Source("db.Job", "location"),
+    "categories": Source("db.Job", "category"),
+    "skills": Source("db.Skill", "name"),
+}
+
+# Leading words of a value that a prefix may start at, so "eng" finds
+# "Senior Software Engineer"
+MAX_WORDS = 4
+
+
+def tracked_fields():
+    """``{model label: {field: [source names]}}`` for the signals"""
+    fields = {}
+    for name, source in SOURCES.items():
+        fields.setdefault(source.model, {}).setdefault(source.field, []).append(name)
+    return fields
+
+
+def word_keys(normalized):
+    words = normalized.split(" ")
+    return [" ".join(words[index:]) for index in range(min(len(words), MAX_WORDS))]
+
+
+def prefix_end(prefix):
+    """The smallest string greater than every string starting with ``prefix``"""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class PrefixIndex:
+    """Values of one source, most common first for any prefix
+
+    Each value is stored once per word start in a sorted array, so a
+    prefix is a bisect range. Prefixes with more than ``SCAN_LIMIT`` keys
+    keep a precomputed top list, so a lookup never ranks more than
+    ``SCAN_LIMIT`` candidates. Changes are applied in place; a value whose
+    count drops may stay in a top list it has left until the next build.
+    """
+
+    SCAN_LIMIT = 1000
+    # Suggestions kept per precomputed prefix, and the most a lookup returns
+    TOP = 20
+
+    def __init__(self, counts):
+        self.entries = {}
+        self.displays = []
+        self.counts = []
+        for value, count in counts.items():
+            normalized = normalize_term(value or "")
+            if not normalized:
+                continue
+            entry = self.entries.get(normalized)
+            if entry is None:
+                entry = self.entries[normalized] = len(self.displays)
+                self.displays.append(" ".join(value.split()))
+                self.counts.append(0)
+            self.counts[entry] += count
+
+        keys = sorted(
+            (key, entry)
+            for normalized, entry in self.entries.items()
+            for key in word_keys(normalized)
+        )
+        self.keys = [key for key, _ in keys]
+        self.ids = [entry for _, entry in keys]
+        self.lock = threading.Lock()
+        self.top = {}
+        self._precompute()
+
+    def _rank(self, candidates):
+        candidates = [entry for entry in candidates if self.counts[entry] > 0]
+        best = heapq.nlargest(self.TOP, candidates, key=self.counts.__getitem__)
+        return sorted(best, key=lambda entry: (-self.counts[entry], self.displays[entry]))
+
+    def _precompute(self):
+        pending = [("", 0, len(self.keys))]
+        while pending:
+            parent, lo, hi = pending.pop()
+            length = len(parent) + 1
+            index = lo
+            while index < hi:
+                if len(self.keys[index]) < length:
+                    # The parent prefix itself
+                    index += 1
+                    continue
+                prefix = self.keys[index][:length]
+                end = bisect_left(self.keys, prefix_end(prefix), index, hi)
+                if end - index > self.SCAN_LIMIT:
+                    self.top[prefix] = self._rank(set(self.ids[index:end]))
+                    pending.append((prefix, index, end))
+                index = end
+
+    def lookup(self, prefix, limit=10):
+        """``(value, count)`` pairs for the values with a word starting
+        with ``prefix``"""
+        prefix = normalize_term(prefix)
+        if not prefix:
+            return []
+        ranked = self.top.get(prefix)
+        if ranked is None:
+            lo = bisect_left(self.keys, prefix)
+            hi = bisect_left(self.keys, prefix_end(prefix), lo)
+            ranked = self._rank(set(self.ids[lo:hi]))
+        return [
+            (self.displays[entry], self.counts[entry])
+            for entry in ranked
+            if self.counts[entry] > 0
+        ][:limit]
+
+    def apply(self, value, delta):
+        """Count ``delta`` more rows with ``value``"""
+        normalized = normalize_term(value or "")
+        if not normalized:
+            return
+        with self.lock:
+            entry = self.entries.get(normalized)
+            if entry is None:
+                if delta <= 0:
+                    return
+                entry = len(self.displays)
+                self.displays.append(" ".join(value.split()))
+                self.counts.append(0)
+                self.entries[normalized] = entry
+                for key in word_keys(normalized):
+                    # The new id is the largest, so it goes after equal keys
+                    position = bisect_right(self.keys, key)
+                    self.keys.insert(position, key)
+                    self.ids.insert(position, entry)
+            self.counts[entry] = max(self.counts[entry] + delta, 0)
+
+            for key in word_keys(normalized):
+                for length in range(1, len(key) + 1):
+                    ranked = self.top.get(key[:length])
+                    if ranked is not None and (
+                        entry in ranked
+                        or len(ranked) < self.TOP
+                        or self.counts[entry] > self.counts[ranked[-1]]
+                    ):
+                        self.top[key[:length]] = self._rank(set(ranked) | {entry})
+
+
+def source_counts(source):
+    """Rows per distinct value of ``source``, in one grouped query"""
+    model = apps.get_model(source.model)
+    return dict(
+        model.objects.order_by()
+        .values_list(source.field)
+        .annotate(count=Count("pk"))
+        .values_list(source.field, "count")
+    )
+
+
+class _State:
+    def __init__(self, index, built_at, stream_id):
+        self.index = index
+        self.built_at = built_at
+        self.synced_at = built_at
+        # Last change read from the Redis stream, None for its start
+        self.stream_id = stream_id
+
+
+class Autocomplete:
+    """Prefix indexes for every source, held in each worker's memory
+
+    An index is built from the database on first use and rebuilt in the
+    background every ``AUTOCOMPLETE_REBUILD_INTERVAL``. Model changes are
+    applied in between: with ``AUTOCOMPLETE_REDIS_URL`` set they go
+    through a Redis stream per source that every worker reads at most
+    every ``AUTOCOMPLETE_SYNC_INTERVAL``; without it only the worker that
+    made the change sees it before the next rebuild.
+    """
+
+    def __init__(self, url=None, clock=time.monotonic):
+        self.states = {}
+        self.rebuilding = set()
+        self.lock = threading.Lock()
+        self.clock = clock
+        self.redis = None
+        if url:
+            import redis
+
+            self.redis = redis.Redis.from_url(url, socket_timeout=0.25)
+
+    def suggest(self, name, prefix, limit=10):
+        return self._state(name).index.lookup(prefix, limit)
+
+    def publish(self, name, value, delta):
+        """Record ``delta`` more rows with ``value`` in source ``name``"""
+        if self.redis is not None:
+            try:
+                self.redis.xadd(
+                    f"autocomplete:{name}",
+                    {"value": value, "delta": delta},
+                    maxlen=settings.AUTOCOMPLETE_STREAM_LENGTH,
+                    approximate=True,
+                )
+                return
+            except Exception as e:
+                capture_exception(e)
+                SYNC_ERRORS.inc()
+        state = self.states.get(name)
+        if state is not None:
+            state.index.apply(value, delta)
+
+    def _state(self, name):
+        state = self.states.get(name)
+        if state is None:
+            with self.lock:
+                state = self.states.get(name) or self._build(name)
+            return state
+
+        now = self.clock()
+        if now - state.built_at > settings.AUTOCOMPLETE_REBUILD_INTERVAL:
+            self._rebuild_in_background(name)
+        elif self.redis is not None and now - state.synced_at > settings.AUTOCOMPLETE_SYNC_INTERVAL:
+            self._sync(name, state, now)
+        return state
+
+    def _build(self, name):
+        stream_id = None
+        if self.redis is not None:
+            try:
+                # Changes made while the query runs are applied twice until
+                # the next build; better than missing them
+                latest = self.redis.xrevrange(f"autocomplete:{name}", count=1)
+                stream_id = latest[0][0] if latest else None
+            except Exception as e:
+                capture_exception(e)
+                SYNC_ERRORS.inc()
+        state = _State(PrefixIndex(source_counts(SOURCES[name])), self.clock(), stream_id)
+        self.states[name] = state
+        REBUILDS.inc(source=name)
+        return state
+
+    def _rebuild_in_background(self, name):
+        with self.lock:
+            if name in self.rebuilding:
+                return
+            self.rebuilding.add(name)
+
+        def rebuild():
+            try:
+                self._build(name)
+            except Exception as e:
+                capture_exception(e)
+                # Keep serving the old index and retry after another interval
+                self.states[name].built_at = self.clock()
+            finally:
+                connection.close()
+                self.rebuilding.discard(name)
+
+        threading.Thread(target=rebuild, daemon=True).start()
+
+    def _sync(self, name, state, now):
+        state.synced_at = now
+        try:
+            changes = self.redis.xrange(
+                f"autocomplete:{name}", min=state.stream_id or "-", count=1000
+            )
+        except Exception as e:
+            capture_exception(e)
+            SYNC_ERRORS.inc()
+            return
+
+        if state.stream_id is not None:
+            if not changes or changes[0][0] != state.stream_id:
+                # The stream was trimmed past the last change read
+                self._rebuild_in_background(name)
+                return
+            changes = changes[1:]
+        for stream_id, fields in changes:
+            state.index.apply(fields[b"value"].decode(), int(fields[b"delta"]))
+            state.stream_id = stream_id
+
+
+_autocomplete = None
+
+
+def get_autocomplete():
+    global _autocomplete
+    if _autocomplete is None:
+        _autocomplete = Autocomplete(settings.AUTOCOMPLETE_REDIS_URL)
+    return _autocomplete
@@ -0,0 +1,55 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+
+
+def queryset_etag(request, queryset, timestamps=("updated_at",), aggregates=None):
+    """Compute the ETag of a list response from one aggregate query,
+    without loading any rows
+
+    ``timestamps`` are lookups whose maximum changes whenever a rendered row
+    changes (include those of nested objects, e.g. ``company__updated_at``).
+    The row count catches deletions, and ``aggregates`` can add anything else
+    the response depends on, such as a count of expired rows for computed
+    flags. The request path, user and timezone are part of the ETag since
+    they change the representation of the same rows.
+
+    Lists get no ``Last-Modified``: the latest ``updated_at`` stays the same
+    when rows are deleted or a computed flag flips with time, so
+    ``If-Modified-Since`` alone would return a stale 304.
+    """
+    values = queryset.order_by().aggregate(
+        validator_count=Count("pk", distinct=True),
+        **{f"validator_max_{index}": Max(lookup) for index, lookup in enumerate(timestamps)},
+        **(aggregates or {}),
+    )
+
+    user_id = request.user.pk if request.user.is_authenticated else None
+    key = "|".join(
+        [
+            request.get_full_path(),
+            str(user_id),
+            timezone.get_current_timezone_name(),
+            request.META.get("HTTP_ACCEPT", ""),
+        ]
+        + [f"{name}={values[name]!r}" for name in sorted(values)]
+    )
+    return 'W/"{}"'.format(hashlib.md5(key.encode()).hexdigest())
+
+
+def set_validators(response, etag):
+    response["ETag"] = etag
+    # Per user, and clients must revalidate before reusing a cached copy
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ("Authorization",))
+    return response
+
+
+def not_modified_response(request, etag):
+    """Return a 304 if the client's copy is current, otherwise None"""
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        return None
+    return set_validators(response, etag)
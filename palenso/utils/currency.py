@@ -0,0 +1,96 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.apps import apps as global_apps
+from django.conf import settings
+from django.db.models import DecimalField, F, Func, Q, Value
+
+from palenso.bgtasks.batching import rewrite_in_batches
+
+CENT = Decimal("0.01")
+
+# Salary columns and the columns holding them in the base currency
+SALARY_FIELDS = {
+    "db.Job": {"salary_min": "salary_min_base", "salary_max": "salary_max_base"},
+    "db.Offer": {"salary_amount": "salary_amount_base"},
+}
+
+
+class Round(Func):
+    """``ROUND(expression, places)``, which Django's Round cannot express
+    before 4.0; halves are rounded away from zero"""
+
+    function = "ROUND"
+    arity = 2
+
+    def __init__(self, expression, places=0, **extra):
+        super().__init__(expression, Value(places), **extra)
+
+
+def get_rate(currency, apps=None):
+    """Base currency units per unit of ``currency``, None when unknown"""
+    currency = (currency or "").upper().strip()
+    if currency == settings.BASE_CURRENCY:
+        return Decimal(1)
+    rates = (apps or global_apps).get_model("db", "ExchangeRate")
+    return rates.objects.filter(currency=currency).values_list("rate", flat=True).first()
+
+
+def to_base(amount, rate):
+    """``amount`` converted at ``rate``, None when either is unknown"""
+    if amount is None or rate is None:
+        return None
+    # Rounded like the database's ROUND in convert_salaries
+    return (Decimal(amount) * rate).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def normalize_salaries(instance):
+    """Set a job's or offer's base currency salaries from its own"""
+    rate = get_rate(instance.salary_currency)
+    for field, base_field in SALARY_FIELDS[instance._meta.label].items():
+        setattr(instance, base_field, to_base(getattr(instance, field), rate))
+
+
+def convert_salaries(currency, rate, apps=None, pause=None):
+    """Convert every salary in ``currency`` again at ``rate`` (None clears
+    them), in batches; returns rows updated per table"""
+    apps = apps or global_apps
+    updated = {}
+    for label, fields in SALARY_FIELDS.items():
+        model = apps.get_model(label)
+        if rate is None:
+            values = {base_field: None for base_field in fields.values()}
+        else:
+            values = {
+                base_field: Round(
+                    F(field) * Value(rate),
+                    2,
+                    output_field=DecimalField(max_digits=14, decimal_places=2),
+                )
+                for field, base_field in fields.items()
+            }
+        updated[model._meta.db_table] = rewrite_in_batches(
+            model.objects.filter(salary_currency__iexact=currency), values, pause=pause
+        )
+    return updated
+
+
+def unrated_currencies(apps=None):
+    """Currencies of converted salaries that no longer have a rate, such as
+    after their ``ExchangeRate`` was deleted"""
+    apps = apps or global_apps
+    known = {settings.BASE_CURRENCY}
+    known.update(apps.get_model("db", "ExchangeRate").objects.values_list("currency", flat=True))
+    found = set()
+    for label, fields in SALARY_FIELDS.items():
+        converted = Q()
+        for base_field in fields.values():
+            converted |= Q(**{f"{base_field}__isnull": False})
+        found.update(
+            currency.upper().strip()
+            for currency in apps.get_model(label)
+            .objects.filter(converted)
+            .exclude(salary_currency__in=known)
+            .values_list("salary_currency", flat=True)
+            .distinct()
+        )
+    return found - known
@@ -0,0 +1,209 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F, TextField
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.functions import Cast
+from django_filters import rest_framework as filters
+
+
+class Facet:
+    """Counts of a listing's rows per value of ``field``
+
+    ``filters`` are the filterset filters on the same attribute. They are
+    left out when counting this facet, so every value keeps its count
+    while one is selected. Set ``multi_valued`` when ``field`` crosses a
+    one-to-many relation, and ``limit`` to keep only the largest values.
+    """
+
+    def __init__(self, name, field, filters=None, multi_valued=False, limit=None):
+        self.name = name
+        self.field = field
+        self.filters = tuple(filters) if filters is not None else (name,)
+        self.multi_valued = multi_valued
+        self.limit = limit
+
+    def model_field(self, model):
+        *path, last = self.field.split(LOOKUP_SEP)
+        for part in path:
+            model = model._meta.get_field(part).related_model
+        return model._meta.get_field(last)
+
+
+class FacetError(ValueError):
+    pass
+
+
+def _base_queryset(view, request, queryset, excluded):
+    """The listing's queryset filtered as for ``request``, without the
+    filterset filters in ``excluded``"""
+    data = request.query_params.copy()
+    for name in excluded:
+        data.pop(name, None)
+    filterset = view.filterset_class(data, queryset=queryset, request=request)
+    if not filterset.is_valid():
+        raise FacetError(filterset.errors)
+    queryset = filterset.qs
+    for backend in view.filter_backends:
+        if not issubclass(backend, filters.DjangoFilterBackend):
+            queryset = backend().filter_queryset(request, queryset, view)
+    return queryset.order_by()
+
+
+def _subquery(queryset, facets):
+    """SQL selecting the row id and one text column per facet"""
+    columns = {
+        f"facet_{index}": Cast(F(facet.field), TextField())
+        for index, facet in enumerate(facets)
+    }
+    return (
+        queryset.annotate(facet_pk=F("pk"), **columns)
+        .values("facet_pk", *columns)
+        .query.sql_with_params()
+    )
+
+
+def _grouped_branch(queryset, facet):
+    sql, params = _subquery(queryset, [facet])
+    count = "COUNT(DISTINCT facet_pk)" if facet.multi_valued else "COUNT(*)"
+    return (
+        f"SELECT %s AS facet, facet_0 AS facet_value, {count} AS facet_count "
+        f"FROM ({sql}) facet_base GROUP BY facet_0",
+        (facet.name, *params),
+    )
+
+
+def _total_branch(queryset):
+    sql, params = _subquery(queryset, [])
+    return (
+        f"SELECT %s AS facet, NULL AS facet_value, COUNT(*) AS facet_count "
+        f"FROM ({sql}) facet_base",
+        ("", *params),
+    )
+
+
+def _grouping_sets_branch(queryset, facets, total):
+    """All single valued facets over the same rows in one scan, with the
+    total as the empty grouping set"""
+    sql, params = _subquery(queryset, facets)
+    columns = [f"facet_{index}" for index in range(len(facets))]
+    names = " ".join(f"WHEN GROUPING({column}) = 0 THEN %s" for column in columns)
+    values = ", ".join(
+        f"CASE WHEN GROUPING({column}) = 0 THEN {column} END" for column in columns
+    )
+    sets = [f"({column})" for column in columns] + (["()"] if total else [])
+    return (
+        f"SELECT CASE {names} ELSE %s END AS facet, COALESCE({values}) AS facet_value, "
+        f"COUNT(*) AS facet_count FROM ({sql}) facet_base "
+        f"GROUP BY GROUPING SETS ({', '.join(sets)})",
+        (*[facet.name for facet in facets], "", *params),
+    )
+
+
+def count_facets(view, request, queryset, facets):
+    """Total and per value counts for ``facets`` over ``view``'s listing
+
+    Facets sharing the same filters are counted over the same rows. Every
+    count comes back from a single query: a UNION ALL of grouped
+    subqueries, with one GROUPING SETS query per set of rows on PostgreSQL.
+    """
+    applied = {name for name, value in request.query_params.items() if value}
+    bases = {(): []}
+    for facet in facets:
+        excluded = tuple(sorted(applied.intersection(facet.filters)))
+        bases.setdefault(excluded, []).append(facet)
+
+    branches = []
+    grouping_sets = connection.vendor == "postgresql"
+    for excluded, members in bases.items():
+        base = _base_queryset(view, request, queryset, excluded)
+        total = excluded == ()
+        single = [facet for facet in members if not facet.multi_valued]
+        if grouping_sets and single:
+            branches.append(_grouping_sets_branch(base, single, total))
+            members = [facet for facet in members if facet.multi_valued]
+        elif total:
+            branches.append(_total_branch(base))
+        branches.extend(_grouped_branch(base, facet) for facet in members)
+
+    sql = " UNION ALL ".join(branch for branch, _ in branches)
+    params = [param for _, branch_params in branches for param in branch_params]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    total = 0
+    by_facet = {facet.name: [] for facet in facets}
+    for name, value, count in rows:
+        if name == "":
+            total = count
+        elif value not in (None, ""):
+            by_facet[name].append((value, count))
+
+    return {
+        "total": total,
+        "facets": {
+            facet.name: _format(facet, queryset.model, by_facet[facet.name])
+            for facet in facets
+        },
+    }
+
+
+def _format(facet, model, values):
+    field = facet.model_field(model)
+    choices = dict(field.flatchoices) if field.choices else {}
+    values = sorted(values, key=lambda item: (-item[1], str(item[0])))
+    if facet.limit:
+        values = values[: facet.limit]
+
+    result = []
+    for value, count in values:
+        if field.get_internal_type() == "BooleanField":
+            # SQLite casts booleans to 1/0, PostgreSQL to true/false
+            value = str(value).lower() in ("1", "t", "true")
+        entry = {"value": value, "count": count}
+        if choices:
+            entry["label"] = str(choices.get(value, value))
+        result.append(entry)
+    return result
+
+
+def cache_key(prefix, request, view, facets):
+    """Cache key for the facet counts of a listing request: the filter and
+    search parameters, normalized, and the requested facets"""
+    filter_names = set(view.filterset_class.base_filters)
+    filter_names.update(
+        getattr(backend, "search_param", None) for backend in view.filter_backends
+    )
+    signature = sorted(
+        (name, sorted(value.strip() for value in values if value.strip()))
+        for name, values in request.query_params.lists()
+        if name in filter_names
+    )
+    signature = [(name, values) for name, values in signature if values]
+    payload = json.dumps([signature, [facet.name for facet in facets]])
+    return f"facets:{prefix}:{hashlib.sha1(payload.encode()).hexdigest()}"
+
+
+def cached_facet_counts(prefix, view, request, queryset, available):
+    """Facet counts for the ``facets`` named in the request (all of
+    ``available`` by default), cached for ``FACETS_CACHE_TTL`` seconds"""
+    names = request.query_params.get("facets")
+    if names:
+        names = [name.strip() for name in names.split(",") if name.strip()]
+        unknown = sorted(set(names) - {facet.name for facet in available})
+        if unknown:
+            raise FacetError({"facets": [f"Unknown facets: {', '.join(unknown)}"]})
+        facets = [facet for facet in available if facet.name in names]
+    else:
+        facets = list(available)
+
+    key = cache_key(prefix, request, view, facets)
+    result = cache.get(key)
+    if result is None:
+        result = count_facets(view, request, queryset, facets)
+        cache.set(key, result, settings.FACETS_CACHE_TTL)
+    return result
@@ -0,0 +1,210 @@
+import csv
+import math
+import os
+import re
+from functools import lru_cache
+
+from django.apps import apps as global_apps
+from django.conf import settings
+from django.db.models import Q
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# Parts of a free text location: "Koramangala, Bangalore / Remote"
+SEPARATORS = re.compile(r"[,/;|()\n]|\s[-–]\s")
+# Words ignored when matching, e.g. PIN codes and "Bangalore (Hybrid)"
+NOISE = re.compile(r"\b(\d+|remote|hybrid|onsite|on-site|wfh|city|district)\b")
+# Longest run of words tried inside a part that does not match as a whole
+MAX_WORDS = 3
+
+GEO_MODELS = {
+    "job": ("db.Job", ("location",)),
+    "event": ("db.Event", ("location",)),
+    "company": ("db.Company", ("city", "state", "country")),
+}
+
+
+class Place:
+    def __init__(self, name, state, country, latitude, longitude, population):
+        self.name = name
+        self.state = state
+        self.country = country
+        self.latitude = latitude
+        self.longitude = longitude
+        self.population = population
+
+
+def normalize_place(text):
+    return " ".join(NOISE.sub(" ", (text or "").lower()).split())
+
+
+@lru_cache(maxsize=1)
+def load_gazetteer():
+    """``{normalized name or alias: [Place]}`` from ``GEO_GAZETTEER_PATH``,
+    by default the bundled gazetteer.csv of Indian and major world cities"""
+    path = settings.GEO_GAZETTEER_PATH or os.path.join(
+        os.path.dirname(__file__), "gazetteer.csv"
+    )
+    places = {}
+    with open(path, newline="", encoding="utf-8") as gazetteer:
+        for row in csv.DictReader(gazetteer):
+            place = Place(
+                row["name"],
+                normalize_place(row["state"]),
+                normalize_place(row["country"]),
+                float(row["latitude"]),
+                float(row["longitude"]),
+                int(row["population"] or 0),
+            )
+            for name in [row["name"], *row["aliases"].split("|")]:
+                if normalize_place(name):
+                    places.setdefault(normalize_place(name), []).append(place)
+    return places
+
+
+def _candidates(parts):
+    for part in parts:
+        yield part
+    # Then runs of words, longest first, for "Koramangala Bangalore 560034"
+    for part in parts:
+        words = part.split()
+        for size in range(min(len(words) - 1, MAX_WORDS), 0, -1):
+            for start in range(len(words) - size + 1):
+                yield " ".join(words[start : start + size])
+
+
+def geocode(*texts):
+    """``(latitude, longitude)`` of the first place named in ``texts``, or
+    None; the other parts pick between places sharing a name, the most
+    populous wins otherwise"""
+    parts = [
+        normalize_place(part)
+        for text in texts
+        for part in SEPARATORS.split(text or "")
+        if normalize_place(part)
+    ]
+    gazetteer = load_gazetteer()
+    context = set(parts)
+    for candidate in _candidates(parts):
+        places = gazetteer.get(candidate)
+        if places:
+            place = max(
+                places,
+                key=lambda place: (
+                    place.state in context or place.country in context,
+                    place.population,
+                ),
+            )
+            return place.latitude, place.longitude
+    return None
+
+
+def resolve_point(text):
+    """A ``"lat,lon"`` pair or a place name to ``(latitude, longitude)``"""
+    try:
+        latitude, longitude = (float(value) for value in text.split(","))
+    except ValueError:
+        return geocode(text)
+    if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+        return latitude, longitude
+    return None
+
+
+def haversine_km(latitude, longitude, latitudes, longitudes):
+    """Great circle distances from one point to many, in one pass"""
+    lat1 = math.radians(latitude)
+    cos_lat1 = math.cos(lat1)
+    lon1 = math.radians(longitude)
+    return [
+        2
+        * EARTH_RADIUS_KM
+        * math.asin(
+            math.sqrt(
+                math.sin((lat2 - lat1) / 2) ** 2
+                + cos_lat1 * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+            )
+        )
+        for lat2, lon2 in zip(map(math.radians, latitudes), map(math.radians, longitudes))
+    ]
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """Filter on the (latitude, longitude) index for every point within
+    ``radius_km``, and some outside it"""
+    delta_lat = radius_km / KM_PER_DEGREE
+    south, north = max(latitude - delta_lat, -90), min(latitude + delta_lat, 90)
+    if south == -90 or north == 90:
+        return Q(latitude__range=(south, north))
+
+    # Widest at the edge nearest the pole
+    cos_lat = math.cos(math.radians(max(abs(south), abs(north))))
+    delta_lon = radius_km / (KM_PER_DEGREE * cos_lat) if cos_lat > 0 else 360
+    if delta_lon >= 180:
+        return Q(latitude__range=(south, north))
+    west, east = longitude - delta_lon, longitude + delta_lon
+    box = Q(latitude__range=(south, north))
+    if west < -180:
+        return box & (Q(longitude__gte=west + 360) | Q(longitude__lte=east))
+    if east > 180:
+        return box & (Q(longitude__gte=west) | Q(longitude__lte=east - 360))
+    return box & Q(longitude__range=(west, east))
+
+
+def filter_within(queryset, latitude, longitude, radius_km):
+    """Restrict ``queryset`` to rows within ``radius_km`` of a point
+
+    The bounding box reads the (latitude, longitude) index; the exact
+    distance is then computed for each distinct point in the box, which
+    is one per gazetteer place rather than one per row.
+    """
+    box = bounding_box(latitude, longitude, radius_km)
+    points = list(
+        queryset.filter(box).order_by().values_list("latitude", "longitude").distinct()
+    )
+    if not points:
+        return queryset.none()
+    distances = haversine_km(
+        latitude, longitude, [point[0] for point in points], [point[1] for point in points]
+    )
+
+    inside = {}
+    for (point_latitude, point_longitude), distance in zip(points, distances):
+        if distance <= radius_km:
+            inside.setdefault(point_latitude, []).append(point_longitude)
+    if not inside:
+        return queryset.none()
+    match = Q()
+    for point_latitude, point_longitudes in inside.items():
+        match |= Q(latitude=point_latitude, longitude__in=point_longitudes)
+    return queryset.filter(box, match)
+
+
+def geocode_rows(name, apps=None, batch_size=2000, overwrite=False):
+    """Set the coordinates of every row of a model from its location text;
+    returns how many rows were located. ``overwrite`` redoes rows that
+    already have coordinates, e.g. after a gazetteer update."""
+    label, fields = GEO_MODELS[name]
+    model = (apps or global_apps).get_model(label)
+    rows = model.objects.order_by("pk")
+    if not overwrite:
+        rows = rows.filter(latitude__isnull=True)
+
+    located = 0
+    last_pk = None
+    while True:
+        batch = rows if last_pk is None else rows.filter(pk__gt=last_pk)
+        batch = list(batch.values_list("pk", *fields)[:batch_size])
+        if not batch:
+            return located
+        by_point = {}
+        for pk, *texts in batch:
+            by_point.setdefault(geocode(*texts), []).append(pk)
+        for point, pks in by_point.items():
+            if point is None and not overwrite:
+                continue
+            latitude, longitude = point or (None, None)
+            model.objects.filter(pk__in=pks).update(latitude=latitude, longitude=longitude)
+            if point:
+                located += len(pks)
+        last_pk = batch[-1][0]
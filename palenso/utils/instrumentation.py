@@ -0,0 +1,158 @@
+import functools
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from palenso.utils.metrics import BYTES_BUCKETS, COUNT_BUCKETS, REGISTRY
+
+_current_stats = ContextVar("request_stats", default=None)
+
+# "IN (%s, %s, %s)" and "VALUES (%s, %s), (%s, %s)" vary in length with the
+# number of parameters; collapse them so they share one template
+_IN_LIST = re.compile(r"\bIN \((?:%s, )*%s\)")
+_VALUES_LIST = re.compile(r"\bVALUES \([^()]*\)(?:, \([^()]*\))*")
+
+REQUESTS = REGISTRY.counter(
+    "palenso_http_requests_total",
+    "Requests handled, by route, method and status",
+    ("route", "method", "status"),
+)
+REQUEST_DURATION = REGISTRY.histogram(
+    "palenso_http_request_duration_seconds",
+    "Wall time per request, rendering included",
+    ("route", "method"),
+)
+DB_DURATION = REGISTRY.histogram(
+    "palenso_http_db_duration_seconds",
+    "Time spent executing SQL per request",
+    ("route", "method"),
+)
+SERIALIZER_DURATION = REGISTRY.histogram(
+    "palenso_http_serializer_duration_seconds",
+    "Time spent in serializer .data and row projections per request, SQL excluded",
+    ("route", "method"),
+)
+QUERY_COUNT = REGISTRY.histogram(
+    "palenso_http_queries",
+    "SQL queries per request",
+    ("route", "method"),
+    buckets=COUNT_BUCKETS,
+)
+DUPLICATE_QUERY_COUNT = REGISTRY.histogram(
+    "palenso_http_duplicate_queries",
+    "Queries per request repeating an already seen SQL template",
+    ("route", "method"),
+    buckets=(0,) + COUNT_BUCKETS,
+)
+RESPONSE_SIZE = REGISTRY.histogram(
+    "palenso_http_response_bytes",
+    "Response body size before compression",
+    ("route", "method"),
+    buckets=BYTES_BUCKETS,
+)
+
+
+def sql_template(sql):
+    """Normalize SQL so queries differing only in parameter count match"""
+    if "IN (" in sql:
+        sql = _IN_LIST.sub("IN (...)", sql)
+    if "VALUES (" in sql:
+        sql = _VALUES_LIST.sub("VALUES (...)", sql)
+    return sql
+
+
+class RequestStats:
+    """Counters for a single request, filled by the DB execute wrapper and the
+    serializer timer"""
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.templates = Counter()
+        self._serializer_depth = 0
+        # Dashboard sections run queries for the request on several threads
+        self._lock = threading.Lock()
+
+    @property
+    def duplicate_count(self):
+        return self.query_count - len(self.templates)
+
+    def __call__(self, execute, sql, params, many, context):
+        """``connection.execute_wrapper`` hook"""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            template = sql_template(sql)
+            with self._lock:
+                self.db_time += elapsed
+                self.query_count += 1
+                self.templates[template] += 1
+
+
+def current_stats():
+    return _current_stats.get()
+
+
+def activate(stats):
+    return _current_stats.set(stats)
+
+
+def deactivate(token):
+    _current_stats.reset(token)
+
+
+def timed_serialization(func):
+    """Add the time spent in ``func`` to the current request's serializer
+    time, minus any SQL it issued. Nested calls are only counted once."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        stats = _current_stats.get()
+        if stats is None or stats._serializer_depth:
+            return func(*args, **kwargs)
+
+        stats._serializer_depth += 1
+        db_time = stats.db_time
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stats._serializer_depth -= 1
+            stats.serializer_time += (time.perf_counter() - started) - (
+                stats.db_time - db_time
+            )
+
+    return wrapper
+
+
+_serializer_timing_installed = False
+
+
+def install_serializer_timing():
+    """Time ``BaseSerializer.data``, which every ``.data`` access goes
+    through, so plain ModelSerializers are covered without changes"""
+    global _serializer_timing_installed
+    if _serializer_timing_installed:
+        return
+
+    from rest_framework.serializers import BaseSerializer
+
+    BaseSerializer.data = property(timed_serialization(BaseSerializer.data.fget))
+    _serializer_timing_installed = True
+
+
+def record(stats, route, method, status, duration, response_bytes):
+    labels = {"route": route, "method": method}
+    REQUESTS.inc(status=status, **labels)
+    REQUEST_DURATION.observe(duration, **labels)
+    DB_DURATION.observe(stats.db_time, **labels)
+    SERIALIZER_DURATION.observe(stats.serializer_time, **labels)
+    QUERY_COUNT.observe(stats.query_count, **labels)
+    DUPLICATE_QUERY_COUNT.observe(stats.duplicate_count, **labels)
+    if response_bytes is not None:
+        RESPONSE_SIZE.observe(response_bytes, **labels)
@@ -0,0 +1,290 @@
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from sentry_sdk import capture_exception
+
+from palenso.db.models import (
+    Event,
+    EventRegistration,
+    JobApplication,
+    Notification,
+    NotificationCounter,
+)
+from palenso.db.models.job import Interview, Offer
+
+# Keeps the IN (...) lists of counter updates small
+COUNTER_CHUNK_SIZE = 500
+
+
+def adjust_unread(deltas):
+    """Add ``{user id: delta}`` to the users' unread counters, creating the
+    missing ones; run inside the transaction that changed the inbox"""
+    deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    NotificationCounter.objects.bulk_create(
+        [NotificationCounter(user_id=user_id) for user_id in deltas], ignore_conflicts=True
+    )
+    # One UPDATE per distinct delta; a fan-out adds the same one to everyone
+    by_delta = {}
+    for user_id, delta in sorted(deltas.items()):
+        by_delta.setdefault(delta, []).append(user_id)
+    for delta, user_ids in by_delta.items():
+        for start in range(0, len(user_ids), COUNTER_CHUNK_SIZE):
+            NotificationCounter.objects.filter(
+                user_id__in=user_ids[start : start + COUNTER_CHUNK_SIZE]
+            ).update(unread=Greatest(F("unread") + delta, 0))
+
+
+def notify(items):
+    """Insert ``(user id, kind, title, body, data)`` notifications with one
+    bulk insert and bump the recipients' unread counters in the same
+    transaction; returns how many were created"""
+    if not items:
+        return 0
+    with transaction.atomic():
+        Notification.objects.bulk_create(
+            [
+                Notification(user_id=user_id, kind=kind, title=title[:255], body=body, data=data)
+                for user_id, kind, title, body, data in items
+            ],
+            batch_size=settings.BGTASKS_BATCH_SIZE,
+        )
+        adjust_unread(Counter(user_id for user_id, *_ in items))
+    return len(items)
+
+
+def unread_count(user):
+    return (
+        NotificationCounter.objects.filter(user_id=user.pk)
+        .values_list("unread", flat=True)
+        .first()
+        or 0
+    )
+
+
+def mark_read(user, ids=None):
+    """Mark the user's unread notifications, or only ``ids``, as read;
+    returns how many changed"""
+    notifications = Notification.objects.filter(user=user, is_read=False)
+    if ids is not None:
+        notifications = notifications.filter(pk__in=ids)
+    with transaction.atomic():
+        updated = notifications.update(is_read=True, read_at=timezone.now())
+        adjust_unread({user.pk: -updated})
+    return updated
+
+
+def delete_notification(user, notification_id):
+    """Delete one of the user's notifications; False when it does not exist"""
+    with transaction.atomic():
+        found = (
+            Notification.objects.filter(user=user, pk=notification_id)
+            .values_list("is_read", flat=True)
+            .first()
+        )
+        if found is None:
+            return False
+        deleted, _ = Notification.objects.filter(pk=notification_id).delete()
+        if deleted and not found:
+            adjust_unread({user.pk: -1})
+    return True
+
+
+def _prune(queryset, batch_size, pause):
+    deleted = 0
+    while True:
+        rows = list(queryset.order_by("pk").values_list("pk", "user_id", "is_read")[:batch_size])
+        if not rows:
+            return deleted
+        with transaction.atomic():
+            deleted += Notification.objects.filter(pk__in=[row[0] for row in rows]).delete()[0]
+            unread = Counter(user_id for _, user_id, is_read in rows if not is_read)
+            adjust_unread({user_id: -count for user_id, count in unread.items()})
+        if len(rows) < batch_size:
+            return deleted
+        time.sleep(pause)
+
+
+def prune_notifications(batch_size=None, pause=None):
+    """Delete read notifications older than ``NOTIFICATIONS_READ_RETENTION``
+    and all older than ``NOTIFICATIONS_RETENTION``, in batches, taking
+    deleted unread ones off their counters"""
+    batch_size = batch_size or settings.BGTASKS_BATCH_SIZE
+    pause = settings.BGTASKS_BATCH_PAUSE if pause is None else pause
+    now = timezone.now()
+    deleted = _prune(
+        Notification.objects.filter(
+            is_read=True, created_at__lt=now - settings.NOTIFICATIONS_READ_RETENTION
+        ),
+        batch_size,
+        pause,
+    )
+    deleted += _prune(
+        Notification.objects.filter(created_at__lt=now - settings.NOTIFICATIONS_RETENTION),
+        batch_size,
+        pause,
+    )
+    return deleted
+
+
+def _local(moment):
+    return timezone.localtime(moment).strftime("%d %b %Y, %H:%M")
+
+
+def _application_items(changes):
+    applications = JobApplication.objects.select_related("job__company", "applicant").in_bulk(
+        [instance.pk for instance, _ in changes]
+    )
+    items = []
+    for instance, previous in changes:
+        application = applications.get(instance.pk)
+        if application is None:
+            continue
+        job = application.job
+        data = {"application_id": str(application.pk), "job_id": str(job.pk)}
+        if previous is None:
+            items.append((
+                job.company.employer_id,
+                "application_received",
+                f"New application for {job.title}",
+                f"{application.applicant.get_full_name()} applied.",
+                data,
+            ))
+        elif application.status == "withdrawn":
+            items.append((
+                job.company.employer_id,
+                "application_status",
+                f"Application withdrawn for {job.title}",
+                f"{application.applicant.get_full_name()} withdrew their application.",
+                data,
+            ))
+        else:
+            items.append((
+                application.applicant_id,
+                "application_status",
+                f"Application update: {job.title}",
+                f"Your application is now {application.get_status_display().lower()}.",
+                data,
+            ))
+    return items
+
+
+def _interview_items(changes):
+    interviews = Interview.objects.select_related("application__job").in_bulk(
+        [instance.pk for instance, _ in changes]
+    )
+    items = []
+    for instance, previous in changes:
+        interview = interviews.get(instance.pk)
+        if interview is None:
+            continue
+        job = interview.application.job
+        data = {"interview_id": str(interview.pk), "application_id": str(interview.application_id)}
+        if previous is None:
+            items.append((
+                interview.application.applicant_id,
+                "interview_scheduled",
+                f"Interview scheduled: {job.title}",
+                f"{interview.get_interview_type_display()} on {_local(interview.scheduled_at)}.",
+                data,
+            ))
+        elif interview.status in ("cancelled", "rescheduled"):
+            items.append((
+                interview.application.applicant_id,
+                "interview_updated",
+                f"Interview {interview.status}: {job.title}",
+                f"Your {interview.get_interview_type_display().lower()} was {interview.status}.",
+                data,
+            ))
+    return items
+
+
+def _offer_items(changes):
+    offers = Offer.objects.select_related("application__applicant").in_bulk(
+        [instance.pk for instance, _ in changes]
+    )
+    items = []
+    for instance, previous in changes:
+        offer = offers.get(instance.pk)
+        if offer is None:
+            continue
+        data = {"offer_id": str(offer.pk), "application_id": str(offer.application_id)}
+        if previous is None:
+            items.append((
+                offer.application.applicant_id,
+                "offer_made",
+                f"Offer received: {offer.position_title}",
+                f"Respond by {offer.offer_deadline:%d %b %Y}.",
+                data,
+            ))
+        elif offer.status in ("accepted", "declined"):
+            items.append((
+                offer.offered_by_id,
+                "offer_response",
+                f"Offer {offer.status}: {offer.position_title}",
+                f"{offer.application.applicant.get_full_name()} {offer.status} the offer.",
+                data,
+            ))
+    return items
+
+
+PRODUCERS = {
+    "db.JobApplication": _application_items,
+    "db.Interview": _interview_items,
+    "db.Offer": _offer_items,
+}
+
+
+def notify_changes(label, changes):
+    """Notifications for ``(instance, previous status)`` pairs of one model,
+    previous being None for new rows; failures are reported, not raised,
+    since the changes are already committed"""
+    producer = PRODUCERS.get(label)
+    if producer is None or not changes:
+        return
+    try:
+        notify(producer(changes))
+    except Exception as e:
+        capture_exception(e)
+
+
+def send_event_reminders():
+    """Notify the live registrations of events starting within
+    ``EVENT_REMINDER_LEAD``, once per event; returns notifications sent"""
+    now = timezone.now()
+    events = Event.objects.filter(
+        is_active=True,
+        reminder_sent_at__isnull=True,
+        start_date__gt=now,
+        start_date__lte=now + settings.EVENT_REMINDER_LEAD,
+    ).only("id", "title", "start_date", "location")
+    sent = 0
+    for event in events:
+        participants = EventRegistration.objects.filter(
+            event=event, status__in=("registered", "confirmed")
+        ).values_list("participant_id", flat=True)
+        data = {"event_id": str(event.pk)}
+        with transaction.atomic():
+            # Only one scheduler run sends a given event's reminders
+            if not Event.objects.filter(pk=event.pk, reminder_sent_at__isnull=True).update(
+                reminder_sent_at=now
+            ):
+                continue
+            sent += notify([
+                (
+                    participant_id,
+                    "event_reminder",
+                    f"Reminder: {event.title}",
+                    f"Starts {_local(event.start_date)} at {event.location}.",
+                    data,
+                )
+                for participant_id in participants.iterator()
+            ])
+    return sent
@@ -0,0 +1,121 @@
+import logging
+import os
+import sys
+import traceback
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+
+from palenso.utils.instrumentation import sql_template
+
+logger = logging.getLogger(__name__)
+
+# Queries with the same template from the same line above this count are flagged
+DEFAULT_THRESHOLD = 5
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Frames in these files are plumbing, never the call site of a query
+IGNORED_PATHS = (
+    os.path.join(PACKAGE_DIR, "utils", "nplusone.py"),
+    os.path.join(PACKAGE_DIR, "utils", "instrumentation.py"),
+    os.path.join(PACKAGE_DIR, "middleware") + os.sep,
+)
+
+
+class NPlusOneError(AssertionError):
+    pass
+
+
+def _is_project_frame(filename):
+    return filename.startswith(PACKAGE_DIR) and not filename.startswith(IGNORED_PATHS)
+
+
+def call_site():
+    """Return ``"path:line in function"`` of the innermost project frame
+    that led to the current query"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if _is_project_frame(filename):
+            return "{}:{} in {}".format(
+                os.path.relpath(filename, os.path.dirname(PACKAGE_DIR)),
+                frame.f_lineno,
+                frame.f_code.co_name,
+            )
+        frame = frame.f_back
+    return "<unknown>"
+
+
+def project_stack():
+    """The current stack limited to project frames, outermost first"""
+    frames = [
+        frame
+        for frame in traceback.extract_stack()[:-2]
+        if _is_project_frame(frame.filename)
+    ]
+    return "".join(traceback.format_list(frames))
+
+
+class Offender:
+    def __init__(self, template, site, stack):
+        self.template = template
+        self.site = site
+        self.stack = stack
+        self.count = 0
+
+    def __str__(self):
+        return (
+            f"{self.count} queries from {self.site}\n"
+            f"    {self.template}\n"
+            f"{self.stack}"
+        )
+
+
+class NPlusOneDetector:
+    """Fingerprint SQL by normalized template and call site
+
+    Use as a ``connection.execute_wrapper``. The project stack is captured
+    once per fingerprint, when its count first passes the threshold, so
+    well-behaved code only pays for a frame walk per query.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.counts = {}
+        self.offenders = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        key = (sql_template(sql), call_site())
+        count = self.counts.get(key, 0) + 1
+        self.counts[key] = count
+
+        if count > self.threshold:
+            offender = self.offenders.get(key)
+            if offender is None:
+                offender = self.offenders[key] = Offender(*key, stack=project_stack())
+            offender.count = count
+        return execute(sql, params, many, context)
+
+    def report(self):
+        offenders = sorted(self.offenders.values(), key=lambda offender: -offender.count)
+        return "Possible N+1 queries:\n\n" + "\n".join(str(offender) for offender in offenders)
+
+
+@contextmanager
+def detect(threshold=DEFAULT_THRESHOLD):
+    """Collect repeated queries issued inside the block on every database"""
+    detector = NPlusOneDetector(threshold=threshold)
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(detector))
+        yield detector
+
+
+@contextmanager
+def forbid_nplusone(threshold=DEFAULT_THRESHOLD):
+    """Raise NPlusOneError at the end of the block if any query repeated"""
+    with detect(threshold=threshold) as detector:
+        yield detector
+    if detector.offenders:
+        raise NPlusOneError(detector.report())
@@ -0,0 +1,45 @@
+"""pytest plugin for N+1 detection
+
+Enable it from a conftest.py with ``pytest_plugins = ["palenso.utils.nplusone_pytest"]``
+(or ``-p palenso.utils.nplusone_pytest``), then request the ``nplusone``
+fixture in the tests that should be guarded::
+
+    def test_job_list(client, nplusone):
+        client.get("/api/jobs")
+
+The test fails with the offending templates and stacks if any query
+repeats from the same line more than the threshold. Override the
+threshold per test with ``@pytest.mark.nplusone(threshold=10)`` or for the
+whole run with the ``nplusone_threshold`` ini option.
+"""
+import pytest
+
+from palenso.utils.nplusone import DEFAULT_THRESHOLD, detect
+
+
+def pytest_addoption(parser):
+    parser.addini(
+        "nplusone_threshold",
+        "Identical queries per call site tolerated by the nplusone fixture",
+        default=str(DEFAULT_THRESHOLD),
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "nplusone(threshold): override the nplusone fixture threshold"
+    )
+
+
+@pytest.fixture
+def nplusone(request):
+    threshold = int(request.config.getini("nplusone_threshold"))
+    marker = request.node.get_closest_marker("nplusone")
+    if marker is not None:
+        threshold = marker.kwargs.get("threshold", threshold)
+
+    with detect(threshold=threshold) as detector:
+        yield detector
+
+    if detector.offenders:
+        pytest.fail(detector.report(), pytrace=False)
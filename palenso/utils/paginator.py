@@ -1,7 +1,11 @@
 from rest_framework.response import Response
 from rest_framework.exceptions import ParseError
 from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
 import math
+import uuid
+
+from django.db.models import Q
 
 
 class Cursor:
@@ -141,6 +145,107 @@ class OffsetPaginator:
         )
 
 
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class KeysetCursor(Cursor):
+    """Cursor holding the ``(created_at, id)`` of the row a page starts
+    after, as ``<microseconds since epoch>.<uuid hex>:0:<is_prev>``; an
+    empty position starts at the newest row, or the oldest for ``is_prev``"""
+
+    @classmethod
+    def from_row(cls, row, is_prev=False, has_results=None):
+        micros = (row.created_at - EPOCH) // timedelta(microseconds=1)
+        return cls(f"{micros}.{row.pk.hex}", 0, is_prev, has_results)
+
+    @classmethod
+    def from_string(cls, value):
+        bits = value.split(":")
+        if len(bits) != 3:
+            raise ValueError
+        try:
+            if bits[0]:
+                micros, pk = bits[0].split(".")
+                int(micros), uuid.UUID(pk)
+            int(bits[2])
+        except (TypeError, ValueError):
+            raise ValueError
+        return cls(bits[0], 0, int(bits[2]))
+
+    def position(self):
+        if not self.value:
+            return None
+        micros, pk = self.value.split(".")
+        return EPOCH + timedelta(microseconds=int(micros)), uuid.UUID(pk)
+
+
+def _older(created_at, pk, inclusive=False):
+    same = {"id__lte" if inclusive else "id__lt": pk}
+    return Q(created_at__lt=created_at) | Q(created_at=created_at, **same)
+
+
+def _newer(created_at, pk, inclusive=False):
+    same = {"id__gte" if inclusive else "id__gt": pk}
+    return Q(created_at__gt=created_at) | Q(created_at=created_at, **same)
+
+
+class KeysetPaginator:
+    """Newest first over ``(created_at, id)``; each page starts after a row
+    instead of at an offset, so deep pages read as few rows as the first
+    and rows inserted meanwhile do not shift them. Needs an index on
+    ``(..., created_at, id)`` after the queryset's equality filters.
+
+    A page reads one row past the limit to know whether more follow, and
+    runs an ``exists()`` probe from its cursor for the other direction. An
+    empty page's cursors point at the ends of the list.
+    """
+
+    def __init__(self, queryset, max_limit=MAX_LIMIT):
+        self.queryset = queryset
+        self.max_limit = max_limit
+
+    def get_result(self, limit=100, cursor=None):
+        limit = min(limit, self.max_limit)
+        position = cursor.position() if cursor is not None else None
+        is_prev = cursor is not None and cursor.is_prev
+
+        if is_prev:
+            queryset = self.queryset.order_by("created_at", "id")
+            if position is not None:
+                queryset = queryset.filter(_newer(*position))
+        else:
+            queryset = self.queryset.order_by("-created_at", "-id")
+            if position is not None:
+                queryset = queryset.filter(_older(*position))
+
+        results = list(queryset[: limit + 1])
+        has_more = len(results) > limit
+        results = results[:limit]
+
+        # Rows on the other side of the cursor, its own row included
+        if position is None:
+            has_behind = False
+        elif is_prev:
+            has_behind = self.queryset.filter(_older(*position, inclusive=True)).exists()
+        else:
+            has_behind = self.queryset.filter(_newer(*position, inclusive=True)).exists()
+
+        if is_prev:
+            results.reverse()
+            has_next, has_prev = has_behind, has_more
+        else:
+            has_next, has_prev = has_more, has_behind
+
+        if results:
+            next_cursor = KeysetCursor.from_row(results[-1], False, has_next)
+            prev_cursor = KeysetCursor.from_row(results[0], True, has_prev)
+        else:
+            # Past one end, so everything left is a page from the other
+            next_cursor = KeysetCursor("", 0, False, has_next)
+            prev_cursor = KeysetCursor("", 0, True, has_prev)
+        return CursorResult(results=results, next=next_cursor, prev=prev_cursor)
+
+
 class BasePaginator:
     """BasePaginator class can be inherited by any View to return a paginated view"""
 
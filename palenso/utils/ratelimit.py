@@ -0,0 +1,199 @@
+import math
+import threading
+import time
+
+from django.conf import settings
+
+from sentry_sdk import capture_exception
+
+from palenso.utils.metrics import REGISTRY
+
+DECISIONS = REGISTRY.counter(
+    "palenso_ratelimit_decisions_total",
+    "Rate limit checks, by scope, key type and decision",
+    ("scope", "key", "decision"),
+)
+BACKEND_ERRORS = REGISTRY.counter(
+    "palenso_ratelimit_backend_errors_total",
+    "Rate limit checks answered by the in-memory backend because Redis failed",
+)
+
+PERIODS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+
+# Sliding window counters: the previous window's count, weighted by how
+# much of it still overlaps the sliding window, plus the current window's
+# count. Every limit of a request is checked before any is counted, and a
+# rejected request counts against none of them, so requests rejected by
+# one key (say, the attacker's IP) never use up another (the victim's
+# account). KEYS are the current and previous counters of each limit,
+# ARGV its limit, window and weight.
+SLIDING_WINDOW_SCRIPT = """
+local counts = {}
+local allowed = 1
+for i = 1, #KEYS / 2 do
+    local current = tonumber(redis.call("GET", KEYS[i * 2 - 1]) or "0")
+    local previous = tonumber(redis.call("GET", KEYS[i * 2]) or "0")
+    if previous * tonumber(ARGV[i * 3]) + current >= tonumber(ARGV[i * 3 - 2]) then
+        allowed = 0
+    end
+    counts[i] = {current, previous}
+end
+if allowed == 1 then
+    for i = 1, #KEYS / 2 do
+        counts[i][1] = redis.call("INCR", KEYS[i * 2 - 1])
+        if counts[i][1] == 1 then
+            redis.call("EXPIRE", KEYS[i * 2 - 1], tonumber(ARGV[i * 3 - 1]) * 2)
+        end
+    end
+end
+return {allowed, counts}
+"""
+
+
+def parse_rate(rate):
+    """``"5/m"`` or ``"100/10m"`` to ``(requests, window in seconds)``"""
+    count, period = rate.split("/")
+    multiplier = int(period[:-1]) if len(period) > 1 else 1
+    return int(count), multiplier * PERIODS[period[-1]]
+
+
+def retry_after(limit, window, elapsed, current, previous):
+    """Seconds until the sliding estimate drops below ``limit`` again"""
+    if current >= limit:
+        # Wait for the next window, then for this window's weight to fade
+        return (window - elapsed) + window * (1 - limit / current)
+    if previous:
+        # The previous window's weight must drop to (limit - current) / previous
+        return max(window * (1 - (limit - current) / previous) - elapsed, 0)
+    return 0
+
+
+class LocalBackend:
+    """Counters in this process only, used without Redis; with several
+    workers each one allows the full limit"""
+
+    # Hits between sweeps of keys whose windows have passed
+    SWEEP_EVERY = 10000
+
+    def __init__(self):
+        # key: (window index, count in that window, count in the one before)
+        self.windows = {}
+        self.hits = 0
+        self.lock = threading.Lock()
+
+    def hit(self, checks):
+        """Count a request against every ``(key, limit, window, index,
+        weight)`` check if it is within all of them; returns ``(allowed,
+        [(current, previous)])``"""
+        with self.lock:
+            self.hits += 1
+            if self.hits % self.SWEEP_EVERY == 0:
+                self.sweep(checks[0][2] * checks[0][3])
+
+            allowed = True
+            counts = []
+            for key, limit, window, index, weight in checks:
+                stored_index, current, previous = self.windows.get(key, (index, 0, 0))
+                if stored_index == index - 1:
+                    current, previous = 0, current
+                elif stored_index != index:
+                    current, previous = 0, 0
+                if previous * weight + current >= limit:
+                    allowed = False
+                counts.append((current, previous))
+
+            if allowed:
+                for position, (key, _, _, index, _) in enumerate(checks):
+                    current, previous = counts[position]
+                    self.windows[key] = (index, current + 1, previous)
+                    counts[position] = (current + 1, previous)
+            return allowed, counts
+
+    def sweep(self, now):
+        self.windows = {
+            key: value
+            for key, value in self.windows.items()
+            # Keys end with their window length, see RateLimiter.hit
+            if (value[0] + 2) * int(key.rsplit(":", 1)[1]) > now
+        }
+
+
+class RedisBackend:
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(url, socket_timeout=0.25)
+        self.script = self.client.register_script(SLIDING_WINDOW_SCRIPT)
+
+    def hit(self, checks):
+        keys, args = [], []
+        for key, limit, window, index, weight in checks:
+            keys += [f"ratelimit:{key}:{index}", f"ratelimit:{key}:{index - 1}"]
+            args += [limit, window, weight]
+        allowed, counts = self.script(keys=keys, args=args)
+        return bool(allowed), [tuple(count) for count in counts]
+
+
+class RateLimiter:
+    """Sliding window rate limiter over fixed window counters
+
+    Uses Redis when ``RATE_LIMIT_REDIS_URL`` is set, so limits hold across
+    workers. If Redis fails the check falls back to per-process counters
+    rather than rejecting or failing the request.
+    """
+
+    def __init__(self, url=None, clock=time.time):
+        self.local = LocalBackend()
+        self.redis = RedisBackend(url) if url else None
+        self.clock = clock
+
+    def hit(self, key, rate):
+        """Count one request for ``key``; returns ``(allowed, wait)`` where
+        ``wait`` is the seconds until a rejected request may be retried"""
+        allowed, waits = self.hit_all([(key, rate)])
+        return allowed, waits[0]
+
+    def hit_all(self, limits):
+        """Count one request against every ``(key, rate)`` if it is within
+        all of them, and against none otherwise; returns ``(allowed,
+        waits)`` with the seconds until each limit has room again, 0 for
+        those with room"""
+        now = self.clock()
+        checks, elapsed = [], []
+        for key, rate in limits:
+            limit, window = parse_rate(rate)
+            index = int(now // window)
+            elapsed.append(now - index * window)
+            checks.append((f"{key}:{window}", limit, window, index, 1 - elapsed[-1] / window))
+
+        if self.redis is None:
+            allowed, counts = self.local.hit(checks)
+        else:
+            try:
+                allowed, counts = self.redis.hit(checks)
+            except Exception as e:
+                capture_exception(e)
+                BACKEND_ERRORS.inc()
+                allowed, counts = self.local.hit(checks)
+
+        if allowed:
+            return True, [0] * len(checks)
+        waits = []
+        for (_, limit, window, _, weight), since, (current, previous) in zip(
+            checks, elapsed, counts
+        ):
+            if previous * weight + current >= limit:
+                waits.append(max(math.ceil(retry_after(limit, window, since, current, previous)), 1))
+            else:
+                waits.append(0)
+        return False, waits
+
+
+_limiter = None
+
+
+def get_limiter():
+    global _limiter
+    if _limiter is None:
+        _limiter = RateLimiter(settings.RATE_LIMIT_REDIS_URL)
+    return _limiter
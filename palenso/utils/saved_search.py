@@ -0,0 +1,244 @@
+from decimal import Decimal
+
+from django.apps import apps as global_apps
+from django.conf import settings
+from django.db import transaction
+
+from palenso.api.filters.job import JobFilter
+from palenso.utils.currency import get_rate, to_base
+from palenso.utils.geo import haversine_km, resolve_point
+from palenso.utils.taxonomy import LINKS, TermResolver, parse_terms
+
+# How each JobFilter parameter is stored and compared against a job
+CONTAINS_FIELDS = {
+    "location": "location",
+    "category": "category",
+    "company_name": "company__name",
+    "company_industry": "company__industry",
+}
+EXACT_FIELDS = ("job_type", "experience_level")
+BOOLEAN_FIELDS = ("is_remote", "is_active", "is_featured")
+SKILL_FIELDS = ("skills", "required_skills")
+
+# Parameters that can anchor a search, most selective first
+ANCHOR_FIELDS = ("required_skills", "skills", "job_type", "experience_level", "is_remote", "is_featured")
+# Anchor of searches with none of those; loaded for every batch
+ANY = "*"
+
+JOB_FIELDS = (
+    "pk",
+    *CONTAINS_FIELDS.values(),
+    *EXACT_FIELDS,
+    *BOOLEAN_FIELDS,
+    "salary_min_base",
+    "salary_max_base",
+    "latitude",
+    "longitude",
+)
+
+
+class SavedSearchError(ValueError):
+    pass
+
+
+def _canonical_skills(text):
+    """Skill names as the normalized names of their canonical terms, so
+    "js" and "JavaScript" give the same query"""
+    terms = parse_terms(text)
+    ids = TermResolver(LINKS["job"].kind).lookup(terms)
+    names = dict(
+        global_apps.get_model("db", "Term")
+        .objects.filter(id__in=[term_id for term_id in ids if term_id])
+        .values_list("id", "normalized")
+    )
+    return sorted({names.get(term_id, normalized) for (normalized, _), term_id in zip(terms, ids)})
+
+
+def normalize_query(params):
+    """JobFilter parameters validated and reduced to one form per meaning
+
+    Unknown parameters are dropped; text is lowercased, skills resolved to
+    canonical terms and ``near`` to coordinates. The result still works as
+    the query string of /api/jobs.
+    """
+    if not isinstance(params, dict):
+        raise SavedSearchError({"query": ["Expected an object of job filters"]})
+    data = {
+        name: ",".join(map(str, value)) if isinstance(value, list) else value
+        for name, value in params.items()
+        if name in JobFilter.base_filters
+    }
+    filterset = JobFilter(data=data, queryset=global_apps.get_model("db", "Job").objects.none())
+    if not filterset.is_valid():
+        raise SavedSearchError({"query": filterset.errors})
+    cleaned = filterset.form.cleaned_data
+
+    query = {}
+    for name in (*CONTAINS_FIELDS, *EXACT_FIELDS):
+        value = " ".join((cleaned.get(name) or "").split()).lower()
+        if value:
+            query[name] = value
+    for name in BOOLEAN_FIELDS:
+        if cleaned.get(name) is not None:
+            query[name] = cleaned[name]
+    for name in SKILL_FIELDS:
+        skills = _canonical_skills(cleaned.get(name))
+        if skills:
+            query[name] = ",".join(skills)
+    for name in ("salary_min", "salary_max"):
+        if cleaned.get(name) is not None:
+            query[name] = str(cleaned[name])
+    if "salary_min" in query or "salary_max" in query:
+        query["currency"] = (cleaned.get("currency") or settings.BASE_CURRENCY).upper().strip()
+    if cleaned.get("near"):
+        point = resolve_point(cleaned["near"])
+        if point is None:
+            raise SavedSearchError({"query": {"near": ["Unknown place"]}})
+        query["near"] = f"{point[0]:.6f},{point[1]:.6f}"
+        radius = cleaned.get("radius") or settings.GEO_DEFAULT_RADIUS_KM
+        query["radius"] = min(max(float(radius), 0), settings.GEO_MAX_RADIUS_KM)
+
+    if not query:
+        raise SavedSearchError({"query": ["A saved search needs at least one filter"]})
+    return query
+
+
+def _key(name, value):
+    if isinstance(value, bool):
+        value = "true" if value else "false"
+    return f"{name}:{value}"[:120]
+
+
+def anchor_key(query):
+    """The key of one condition every job matching ``query`` meets"""
+    for name in ANCHOR_FIELDS:
+        if name not in query:
+            continue
+        if name in SKILL_FIELDS:
+            return _key("skill", query[name].split(",")[0])
+        return _key(name, query[name])
+    return ANY
+
+
+def job_keys(job):
+    """Keys of every anchor ``job`` satisfies"""
+    keys = {ANY}
+    keys.update(_key("skill", name) for name in job["skills"])
+    for name in EXACT_FIELDS:
+        keys.add(_key(name, (job[name] or "").lower()))
+    for name in ("is_remote", "is_featured"):
+        keys.add(_key(name, job[name]))
+    return keys
+
+
+class Matcher:
+    """Evaluates saved search queries against jobs in Python, the same way
+    JobFilter does in SQL"""
+
+    def __init__(self):
+        self.rates = {}
+
+    def rate(self, currency):
+        if currency not in self.rates:
+            self.rates[currency] = get_rate(currency)
+        return self.rates[currency]
+
+    def matches(self, query, job):
+        for name, field in CONTAINS_FIELDS.items():
+            if name in query and query[name] not in (job[field] or "").lower():
+                return False
+        for name in EXACT_FIELDS:
+            if name in query and query[name] != (job[name] or "").lower():
+                return False
+        for name in BOOLEAN_FIELDS:
+            if name in query and query[name] != job[name]:
+                return False
+        if "skills" in query and not set(query["skills"].split(",")) <= job["skills"]:
+            return False
+        if "required_skills" in query and not (
+            set(query["required_skills"].split(",")) <= job["required_skills"]
+        ):
+            return False
+        for name, bound in (("salary_min", "salary_min_base"), ("salary_max", "salary_max_base")):
+            if name not in query:
+                continue
+            base = to_base(Decimal(query[name]), self.rate(query["currency"]))
+            if base is None or job[bound] is None:
+                return False
+            if (job[bound] < base) if name == "salary_min" else (job[bound] > base):
+                return False
+        if "near" in query:
+            if job["latitude"] is None or job["longitude"] is None:
+                return False
+            latitude, longitude = (float(value) for value in query["near"].split(","))
+            (distance,) = haversine_km(latitude, longitude, [job["latitude"]], [job["longitude"]])
+            if distance > query["radius"]:
+                return False
+        return True
+
+
+def _load_jobs(ids):
+    jobs = {
+        row["pk"]: dict(row, skills=set(), required_skills=set())
+        for row in global_apps.get_model("db", "Job").objects.filter(pk__in=ids).values(*JOB_FIELDS)
+    }
+    links = global_apps.get_model("db", "JobSkill").objects.filter(job_id__in=ids)
+    for job_id, name, is_required in links.values_list("job_id", "term__normalized", "is_required"):
+        jobs[job_id]["skills"].add(name)
+        if is_required:
+            jobs[job_id]["required_skills"].add(name)
+    return list(jobs.values())
+
+
+def match_jobs(jobs, matcher=None):
+    """``(search id, job id)`` for every alerting saved search each job
+    matches
+
+    Searches are fetched in one query on the anchors the jobs have, then
+    indexed by anchor so each job is only checked against searches whose
+    anchor it meets.
+    """
+    matcher = matcher or Matcher()
+    keys_per_job = [(job, job_keys(job)) for job in jobs]
+    anchors = set().union(*(keys for _, keys in keys_per_job)) if jobs else set()
+    searches = global_apps.get_model("db", "SavedSearch").objects.filter(
+        anchor__in=anchors, alerts_enabled=True, user__is_active=True
+    )
+    index = {}
+    for search_id, anchor, query in searches.values_list("id", "anchor", "query"):
+        index.setdefault(anchor, []).append((search_id, query))
+
+    matched = []
+    for job, keys in keys_per_job:
+        for key in keys:
+            for search_id, query in index.get(key, ()):
+                if matcher.matches(query, job):
+                    matched.append((search_id, job["pk"]))
+    return matched
+
+
+def match_new_jobs(batch_size=None):
+    """Match active jobs not matched yet against the saved searches, a
+    batch at a time; returns the number of jobs and of matches"""
+    batch_size = batch_size or settings.BGTASKS_BATCH_SIZE
+    job_model = global_apps.get_model("db", "Job")
+    match_model = global_apps.get_model("db", "SavedSearchMatch")
+    pending = job_model.objects.filter(search_matched=False, is_active=True).order_by("pk")
+    matcher = Matcher()
+    jobs_matched = matches_found = 0
+    while True:
+        ids = list(pending.values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            break
+        matched = match_jobs(_load_jobs(ids), matcher)
+        with transaction.atomic():
+            match_model.objects.bulk_create(
+                [match_model(search_id=search_id, job_id=job_id) for search_id, job_id in matched],
+                ignore_conflicts=True,
+            )
+            job_model.objects.filter(pk__in=ids).update(search_matched=True)
+        jobs_matched += len(ids)
+        matches_found += len(matched)
+        if len(ids) < batch_size:
+            break
+    return {"jobs": jobs_matched, "matches": matches_found}
@@ -0,0 +1,161 @@
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+from sentry_sdk import capture_exception
+
+from palenso.utils import instrumentation
+from palenso.utils.metrics import REGISTRY
+
+SECTION_DURATION = REGISTRY.histogram(
+    "palenso_dashboard_section_duration_seconds",
+    "Wall time per dashboard section, by outcome",
+    ("section", "status"),
+)
+
+_executor = None
+
+
+def section_executor():
+    """Thread pool shared by every dashboard, sized by
+    ``DASHBOARD_SECTION_WORKERS`` per process"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.DASHBOARD_SECTION_WORKERS, thread_name_prefix="section"
+        )
+    return _executor
+
+
+class Section:
+    """One independent part of a dashboard response
+
+    ``load`` takes no arguments and returns plain data (querysets must be
+    evaluated inside it). When it fails or exceeds ``timeout`` seconds the
+    response carries ``default`` for it instead.
+    """
+
+    def __init__(self, name, load, default=None, timeout=None):
+        self.name = name
+        self.load = load
+        self.default = default
+        self.timeout = timeout or settings.DASHBOARD_SECTION_TIMEOUT
+
+
+class SectionResults(dict):
+    """Section values by name, plus how each one went"""
+
+    def __init__(self):
+        super().__init__()
+        self.timings = {}
+        self.failed = []
+
+    @property
+    def partial(self):
+        return bool(self.failed)
+
+    def server_timing(self):
+        """``Server-Timing`` header value, one metric per section"""
+        return ", ".join(
+            f"{name};dur={elapsed * 1000:.1f}" for name, elapsed in self.timings.items()
+        )
+
+    def annotate(self, response):
+        response["Server-Timing"] = self.server_timing()
+        if self.partial:
+            response.data["partial_sections"] = self.failed
+        return response
+
+
+def _statement_timeout(seconds):
+    """Make the database cancel the section's queries at its timeout, so an
+    abandoned section does not keep a query running"""
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SET statement_timeout = %s", [int(seconds * 1000)])
+
+
+def _reset_statement_timeout():
+    if connection.vendor != "postgresql" or connection.connection is None:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("RESET statement_timeout")
+
+
+def _timed(section):
+    started = time.perf_counter()
+    value = section.load()
+    return value, time.perf_counter() - started
+
+
+def _load(section):
+    """Run one section on a pool thread, which has its own connection"""
+    close_old_connections()
+    stats = instrumentation.current_stats()
+    try:
+        with ExitStack() as stack:
+            if stats is not None:
+                stack.enter_context(connection.execute_wrapper(stats))
+            _statement_timeout(section.timeout)
+            try:
+                return _timed(section)
+            finally:
+                _reset_statement_timeout()
+    finally:
+        # Same lifecycle as a request: honours CONN_MAX_AGE and drops
+        # connections left unusable
+        close_old_connections()
+
+
+def run_sections(sections):
+    """Run ``sections`` concurrently and collect whatever finishes in time
+
+    Sections run inline instead when ``DASHBOARD_SECTION_WORKERS`` is 0 or
+    the caller is inside a transaction, whose writes other connections
+    would not see.
+    """
+    results = SectionResults()
+    concurrent = settings.DASHBOARD_SECTION_WORKERS > 0 and not connection.in_atomic_block
+
+    started = time.perf_counter()
+    futures = {}
+    if concurrent:
+        executor = section_executor()
+        for section in sections:
+            # Copy the context so the request's query stats see the section
+            futures[section.name] = executor.submit(
+                contextvars.copy_context().run, _load, section
+            )
+
+    for section in sections:
+        status = "ok"
+        try:
+            if concurrent:
+                remaining = section.timeout - (time.perf_counter() - started)
+                value, elapsed = futures[section.name].result(timeout=max(remaining, 0))
+            else:
+                value, elapsed = _timed(section)
+        except FutureTimeoutError:
+            futures[section.name].cancel()
+            status = "timeout"
+            elapsed = section.timeout
+        except Exception as e:
+            capture_exception(e)
+            status = "error"
+            elapsed = time.perf_counter() - started
+
+        if status == "ok":
+            results[section.name] = value
+        else:
+            results[section.name] = section.default
+            results.failed.append(section.name)
+        results.timings[section.name] = elapsed
+        SECTION_DURATION.observe(elapsed, section=section.name, status=status)
+
+    return results
@@ -0,0 +1,370 @@
+import asyncio
+import itertools
+import json
+import queue
+import threading
+import time
+from collections import deque
+
+from asgiref.sync import sync_to_async
+from django.apps import apps as global_apps
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from sentry_sdk import capture_exception
+
+# Assign the next id and publish in one step, so events are published and
+# backlogged in id order and a client resuming after id N cannot miss an
+# earlier id published later. ARGV[1] is the event as a JSON object
+# without its id, the rest are the backlog length, its TTL and the users.
+PUBLISH_SCRIPT = """
+local id = redis.call("INCR", KEYS[1])
+local payload = '{"id": ' .. id .. ', ' .. string.sub(ARGV[1], 2)
+for i = 4, #ARGV do
+    local key = KEYS[2] .. ":backlog:" .. ARGV[i]
+    redis.call("LPUSH", key, payload)
+    redis.call("LTRIM", key, 0, tonumber(ARGV[2]) - 1)
+    redis.call("EXPIRE", key, tonumber(ARGV[3]))
+    redis.call("PUBLISH", KEYS[2] .. ":user:" .. ARGV[i], payload)
+end
+return id
+"""
+
+# What a status event says about each model: its type, the id of the
+# object it belongs to, and how to find the users it is pushed to
+SOURCES = {
+    "db.JobApplication": {
+        "type": "job_application",
+        "parent": "job_id",
+        "users": ("applicant_id", ("db.Job", "job_id", "company__employer_id")),
+    },
+    "db.Interview": {
+        "type": "interview",
+        "parent": "application_id",
+        "users": ("interviewer_id", ("db.JobApplication", "application_id", "applicant_id")),
+    },
+    "db.Offer": {
+        "type": "offer",
+        "parent": "application_id",
+        "users": ("offered_by_id", ("db.JobApplication", "application_id", "applicant_id")),
+    },
+    "db.EventRegistration": {
+        "type": "event_registration",
+        "parent": "event_id",
+        "users": ("participant_id", ("db.Event", "event_id", "organizer_id")),
+    },
+}
+
+
+def build_events(label, changes):
+    """``(user ids, event)`` for each ``(instance, previous status)`` of one
+    model, previous being None for new rows; related users are looked up
+    in one query per relation"""
+    source = SOURCES[label]
+    related = {}
+    for user in source["users"]:
+        if isinstance(user, tuple):
+            model, field, lookup = user
+            ids = {getattr(instance, field) for instance, _ in changes}
+            related[field] = dict(
+                global_apps.get_model(model)
+                .objects.filter(pk__in=ids)
+                .values_list("pk", lookup)
+            )
+
+    at = timezone.now().isoformat()
+    events = []
+    for instance, previous in changes:
+        user_ids = set()
+        for user in source["users"]:
+            if isinstance(user, tuple):
+                user_ids.add(related[user[1]].get(getattr(instance, user[1])))
+            else:
+                user_ids.add(getattr(instance, user))
+        user_ids.discard(None)
+        event = {
+            "type": source["type"],
+            "object_id": str(instance.pk),
+            "parent_id": str(getattr(instance, source["parent"])),
+            "status": instance.status,
+            "previous_status": previous,
+            "at": at,
+        }
+        events.append(({str(user_id) for user_id in user_ids}, event))
+    return events
+
+
+def encode_event(event):
+    """Server-sent event frame"""
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+class Listener:
+    """Events for one user, delivered from any thread to a blocking reader,
+    or to a coroutine reader on ``loop``"""
+
+    def __init__(self, user_id, loop=None):
+        self.user_id = str(user_id)
+        self.loop = loop
+        self.queue = asyncio.Queue() if loop is not None else queue.Queue()
+
+    def deliver(self, event):
+        if self.loop is None:
+            self.queue.put(event)
+            return
+        try:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, event)
+        except RuntimeError:
+            # The loop closed under a reader that did not unregister
+            pass
+
+    def get(self, timeout):
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def get_nowait(self):
+        try:
+            return self.queue.get_nowait()
+        except (queue.Empty, asyncio.QueueEmpty):
+            return None
+
+    async def aget(self, timeout):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LocalBackend:
+    """Events and backlogs in this process only, used without Redis; other
+    workers never see them, so run a single process"""
+
+    def __init__(self):
+        self.ids = itertools.count(1)
+        self.last_id = 0
+        self.backlogs = {}
+        self.lock = threading.Lock()
+        self.dispatch = None
+
+    def start(self, dispatch):
+        self.dispatch = dispatch
+
+    def publish(self, user_ids, event):
+        # Dispatching under the lock too keeps listeners receiving events in
+        # id order; delivering only queues them
+        with self.lock:
+            self.last_id = next(self.ids)
+            event = dict(event, id=self.last_id)
+            for user_id in user_ids:
+                self.backlogs.setdefault(
+                    user_id, deque(maxlen=settings.STATUS_EVENTS_BACKLOG)
+                ).append(event)
+            if self.dispatch is not None:
+                for user_id in user_ids:
+                    self.dispatch(user_id, event)
+
+    def latest_id(self):
+        return self.last_id
+
+    def backlog(self, user_id):
+        with self.lock:
+            return list(self.backlogs.get(user_id, ()))
+
+
+class RedisBackend:
+    """Events published on a channel per user, with the last
+    ``STATUS_EVENTS_BACKLOG`` kept in a list per user for clients that
+    reconnect; a single pattern subscription per process hands them to its
+    listeners"""
+
+    PREFIX = "status_events"
+
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.publish_script = self.client.register_script(PUBLISH_SCRIPT)
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def start(self, dispatch):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self.listen, args=(dispatch,), name="status-events", daemon=True
+                )
+                self.thread.start()
+
+    def listen(self, dispatch):
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(f"{self.PREFIX}:user:*")
+                for message in pubsub.listen():
+                    user_id = message["channel"].decode().rsplit(":", 1)[1]
+                    dispatch(user_id, json.loads(message["data"]))
+            except Exception as e:
+                # Events published meanwhile are picked up from the backlog
+                # by clients that reconnect
+                capture_exception(e)
+                time.sleep(1)
+
+    def publish(self, user_ids, event):
+        self.publish_script(
+            keys=[f"{self.PREFIX}:id", self.PREFIX],
+            args=[
+                json.dumps(event),
+                settings.STATUS_EVENTS_BACKLOG,
+                settings.STATUS_EVENTS_BACKLOG_TTL,
+                *user_ids,
+            ],
+        )
+
+    def latest_id(self):
+        return int(self.client.get(f"{self.PREFIX}:id") or 0)
+
+    def backlog(self, user_id):
+        items = self.client.lrange(f"{self.PREFIX}:backlog:{user_id}", 0, -1)
+        return [json.loads(item) for item in reversed(items)]
+
+
+class StatusHub:
+    """Pushes status events to the users they concern
+
+    Uses Redis pub/sub when ``STATUS_EVENTS_REDIS_URL`` is set, so events
+    reach the worker holding each user's connection. Event ids increase, so
+    a client passes the last one it saw to get what it missed.
+    """
+
+    def __init__(self, url=None):
+        self.backend = RedisBackend(url) if url else LocalBackend()
+        self.listeners = {}
+        self.lock = threading.Lock()
+
+    def publish(self, events):
+        """Publish ``(user ids, event)`` pairs; failures are reported, not
+        raised, since the change they describe is already committed"""
+        for user_ids, event in events:
+            if not user_ids:
+                continue
+            try:
+                self.backend.publish(user_ids, event)
+            except Exception as e:
+                capture_exception(e)
+
+    def dispatch(self, user_id, event):
+        with self.lock:
+            listeners = list(self.listeners.get(user_id, ()))
+        for listener in listeners:
+            listener.deliver(event)
+
+    def listen(self, user_id, loop=None):
+        listener = Listener(user_id, loop)
+        with self.lock:
+            self.listeners.setdefault(listener.user_id, set()).add(listener)
+        self.backend.start(self.dispatch)
+        return listener
+
+    def unlisten(self, listener):
+        with self.lock:
+            listeners = self.listeners.get(listener.user_id, set())
+            listeners.discard(listener)
+            if not listeners:
+                self.listeners.pop(listener.user_id, None)
+
+    def latest_id(self):
+        return self.backend.latest_id()
+
+    def events_after(self, user_id, last_id):
+        return [event for event in self.backend.backlog(str(user_id)) if event["id"] > last_id]
+
+
+_hub = None
+
+
+def get_hub():
+    global _hub
+    if _hub is None:
+        _hub = StatusHub(settings.STATUS_EVENTS_REDIS_URL)
+    return _hub
+
+
+def publish_changes(label, changes):
+    """Build and publish the events for ``(instance, previous status)``
+    pairs of one model"""
+    if changes:
+        get_hub().publish(build_events(label, changes))
+
+
+def stream_events(hub, user_id, after):
+    """Server-sent events for ``user_id`` after event ``after``, with a
+    comment every ``STATUS_EVENTS_HEARTBEAT`` seconds so proxies keep the
+    connection open, until ``STATUS_EVENTS_STREAM_TIMEOUT``"""
+    listener = hub.listen(user_id)
+    try:
+        yield f"retry: {settings.STATUS_EVENTS_RETRY_MS}\n\n"
+        # Listening before reading the backlog, so nothing falls in between
+        for event in hub.events_after(user_id, after):
+            after = event["id"]
+            yield encode_event(event)
+        deadline = time.monotonic() + settings.STATUS_EVENTS_STREAM_TIMEOUT
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            event = listener.get(min(remaining, settings.STATUS_EVENTS_HEARTBEAT))
+            if event is None:
+                yield ": keepalive\n\n"
+            elif event["id"] > after:
+                after = event["id"]
+                yield encode_event(event)
+    finally:
+        hub.unlisten(listener)
+
+
+async def astream_events(hub, user_id, after):
+    """``stream_events`` for the ASGI server, waiting on the event loop
+    instead of a thread"""
+    listener = hub.listen(user_id, asyncio.get_running_loop())
+    try:
+        yield f"retry: {settings.STATUS_EVENTS_RETRY_MS}\n\n"
+        for event in await sync_to_async(hub.events_after, thread_sensitive=False)(
+            user_id, after
+        ):
+            after = event["id"]
+            yield encode_event(event)
+        deadline = time.monotonic() + settings.STATUS_EVENTS_STREAM_TIMEOUT
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            event = await listener.aget(min(remaining, settings.STATUS_EVENTS_HEARTBEAT))
+            if event is None:
+                yield ": keepalive\n\n"
+            elif event["id"] > after:
+                after = event["id"]
+                yield encode_event(event)
+    finally:
+        hub.unlisten(listener)
+
+
+def event_stream_response(user_id, after):
+    """``text/event-stream`` response of a user's status events
+
+    Under WSGI the stream holds its worker thread. palenso.asgi serves
+    ``async_streaming_content`` instead, which Django 3.2's own ASGI handler
+    cannot do.
+    """
+    hub = get_hub()
+    user_id = str(user_id)
+    response = StreamingHttpResponse(
+        stream_events(hub, user_id, after), content_type="text/event-stream"
+    )
+    response.async_streaming_content = astream_events(hub, user_id, after)
+    response["Cache-Control"] = "no-cache"
+    # Tell nginx not to buffer the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,244 @@
+import re
+
+from django.apps import apps as global_apps
+from django.db import transaction
+
+# Separators accepted in the comma separated skill and tag fields
+SEPARATORS = re.compile(r"[,;\n]")
+
+# Canonical skill names and spellings that resolve to them; seeded by the
+# taxonomy backfill migration, more can be added in the admin
+SKILL_ALIASES = {
+    "JavaScript": ["js", "java script", "ecmascript"],
+    "TypeScript": ["ts"],
+    "Python": ["python3", "py"],
+    "PostgreSQL": ["postgres", "psql"],
+    "React": ["reactjs", "react.js"],
+    "Vue": ["vuejs", "vue.js"],
+    "Node.js": ["node", "nodejs"],
+    "Go": ["golang"],
+    "Kubernetes": ["k8s"],
+    "C++": ["cpp"],
+    "C#": ["csharp", "c sharp"],
+    "AWS": ["amazon web services"],
+    "GCP": ["google cloud", "google cloud platform"],
+    "Machine Learning": ["ml"],
+    "Artificial Intelligence": ["ai"],
+    "SQL": ["structured query language"],
+}
+
+
+class LinkSpec:
+    """How one model's text fields map to a link table
+
+    ``fields`` maps each text field to extra values stored on its links;
+    a term listed in several fields keeps the first field's values.
+    """
+
+    def __init__(self, model, link, owner, kind, fields):
+        self.model = model
+        self.link = link
+        self.owner = owner
+        self.kind = kind
+        self.fields = fields
+
+
+LINKS = {
+    "job": LinkSpec(
+        "db.Job",
+        "db.JobSkill",
+        "job",
+        "skill",
+        {"required_skills": {"is_required": True}, "preferred_skills": {"is_required": False}},
+    ),
+    "project": LinkSpec(
+        "db.Project", "db.ProjectTechnology", "project", "skill", {"technologies_used": {}}
+    ),
+    "event": LinkSpec("db.Event", "db.EventTag", "event", "tag", {"tags": {}}),
+}
+
+
+def normalize_term(name):
+    return " ".join(name.split()).lower()
+
+
+def parse_terms(text):
+    """Distinct names in a comma separated field, in order, as
+    ``(normalized, display)`` pairs"""
+    terms = {}
+    for part in SEPARATORS.split(text or ""):
+        display = " ".join(part.split())
+        normalized = display.lower()
+        if normalized and len(normalized) <= 100:
+            terms.setdefault(normalized, display)
+    return list(terms.items())
+
+
+class TermResolver:
+    """Maps names to canonical term ids for one kind, through aliases, with
+    a cache so a backfill resolves each distinct name once
+
+    ``apps`` lets migrations pass their historical models.
+    """
+
+    def __init__(self, kind, apps=None):
+        apps = apps or global_apps
+        self.kind = kind
+        self.terms = apps.get_model("db", "Term")
+        self.aliases = apps.get_model("db", "TermAlias")
+        self.cache = {}
+
+    def _load(self, normalized_names):
+        missing = [name for name in normalized_names if name not in self.cache]
+        if not missing:
+            return
+        self.cache.update(
+            self.aliases.objects.filter(kind=self.kind, normalized__in=missing).values_list(
+                "normalized", "term_id"
+            )
+        )
+        missing = [name for name in missing if name not in self.cache]
+        if missing:
+            self.cache.update(
+                self.terms.objects.filter(kind=self.kind, normalized__in=missing).values_list(
+                    "normalized", "id"
+                )
+            )
+
+    def lookup(self, terms):
+        """Ids of the terms that already exist, None for the ones that do not"""
+        self._load([normalized for normalized, _ in terms])
+        return [self.cache.get(normalized) for normalized, _ in terms]
+
+    def resolve(self, terms):
+        """Ids of ``terms``, creating the ones that do not exist yet"""
+        ids = self.lookup(terms)
+        new = [
+            self.terms(kind=self.kind, name=display[:100], normalized=normalized)
+            for (normalized, display), term_id in zip(terms, ids)
+            if term_id is None
+        ]
+        if new:
+            # Another request may create the same terms at the same time
+            self.terms.objects.bulk_create(new, ignore_conflicts=True)
+            self._load([term.normalized for term in new])
+            ids = [self.cache[normalized] for normalized, _ in terms]
+        return ids
+
+
+def desired_links(spec, values, resolver):
+    """Term ids to link, with their extra values, from the text fields'
+    ``values``"""
+    links = {}
+    for field, extra in spec.fields.items():
+        for term_id in resolver.resolve(parse_terms(values[field])):
+            links.setdefault(term_id, extra)
+    return links
+
+
+def sync_links(instance, name):
+    """Make ``instance``'s link rows match its text fields, writing only the
+    difference"""
+    spec = LINKS[name]
+    link_model = global_apps.get_model(spec.link)
+    extra_fields = sorted({field for extra in spec.fields.values() for field in extra})
+    desired = desired_links(
+        spec, {field: getattr(instance, field) for field in spec.fields}, TermResolver(spec.kind)
+    )
+
+    links = link_model.objects.filter(**{spec.owner: instance})
+    current = {
+        row["term_id"]: {field: row[field] for field in extra_fields}
+        for row in links.values("term_id", *extra_fields)
+    }
+    stale = [term_id for term_id, extra in current.items() if desired.get(term_id) != extra]
+    with transaction.atomic():
+        if stale:
+            links.filter(term_id__in=stale).delete()
+        link_model.objects.bulk_create(
+            [
+                link_model(**{spec.owner: instance}, term_id=term_id, **extra)
+                for term_id, extra in desired.items()
+                if term_id not in current or term_id in stale
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def backfill_links(name, apps=None, batch_size=2000):
+    """Create the link rows for every row of a model from its text fields,
+    skipping links that already exist; returns how many links the text
+    fields produced"""
+    apps = apps or global_apps
+    spec = LINKS[name]
+    model = apps.get_model(spec.model)
+    link_model = apps.get_model(spec.link)
+    resolver = TermResolver(spec.kind, apps)
+
+    created = 0
+    last_pk = None
+    fields = list(spec.fields)
+    while True:
+        rows = model.objects.order_by("pk").values("pk", *fields)
+        if last_pk is not None:
+            rows = rows.filter(pk__gt=last_pk)
+        rows = list(rows[:batch_size])
+        if not rows:
+            return created
+        links = [
+            link_model(**{f"{spec.owner}_id": row["pk"]}, term_id=term_id, **extra)
+            for row in rows
+            for term_id, extra in desired_links(spec, row, resolver).items()
+        ]
+        link_model.objects.bulk_create(links, batch_size=5000, ignore_conflicts=True)
+        created += len(links)
+        last_pk = rows[-1]["pk"]
+
+
+def seed_aliases(apps=None):
+    """Create the canonical skills and aliases in ``SKILL_ALIASES``"""
+    apps = apps or global_apps
+    terms = apps.get_model("db", "Term")
+    aliases = apps.get_model("db", "TermAlias")
+    for name, spellings in SKILL_ALIASES.items():
+        term, _ = terms.objects.get_or_create(
+            kind="skill", normalized=normalize_term(name), defaults={"name": name}
+        )
+        for spelling in spellings:
+            aliases.objects.get_or_create(
+                kind="skill", normalized=normalize_term(spelling), defaults={"term": term}
+            )
+
+
+def filter_by_terms(queryset, name, text, **link_filter):
+    """Restrict ``queryset`` to rows linked to every term named in ``text``
+
+    The last term is an inner join on the link table, which is unique per
+    row and term so it adds no duplicates; the others are semi-joins nested
+    inside it. Each one reads the link table's (term, owner) index instead
+    of scanning the text fields. Names that match no term match no rows.
+    """
+    spec = LINKS[name]
+    terms = parse_terms(text)
+    if not terms:
+        return queryset
+    term_ids = TermResolver(spec.kind).lookup(terms)
+    if None in term_ids:
+        return queryset.none()
+
+    link_model = global_apps.get_model(spec.link)
+    owner_id = f"{spec.owner}_id"
+    *others, last = dict.fromkeys(term_ids)
+    owners = None
+    for term_id in others:
+        links = link_model.objects.filter(term_id=term_id, **link_filter)
+        if owners is not None:
+            links = links.filter(**{f"{owner_id}__in": owners})
+        owners = links.values(owner_id)
+
+    related = link_model._meta.get_field(spec.owner).remote_field.related_name
+    lookups = {f"{related}__term_id": last}
+    lookups.update({f"{related}__{field}": value for field, value in link_filter.items()})
+    if owners is not None:
+        lookups[f"{related}__{owner_id}__in"] = owners
+    return queryset.filter(**lookups)
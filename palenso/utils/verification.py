@@ -0,0 +1,143 @@
+import hashlib
+import hmac
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from palenso.db.models import VerificationCode
+from palenso.utils.auth_utils import generate_otp
+
+# Count an attempt and read the digest in one step, without recreating an
+# expired code
+CHECK_SCRIPT = """
+if redis.call("EXISTS", KEYS[1]) == 0 then
+    return false
+end
+local attempts = redis.call("HINCRBY", KEYS[1], "attempts", 1)
+return {redis.call("HGET", KEYS[1], "digest"), attempts}
+"""
+
+
+def normalize_address(channel, address):
+    """An email or mobile number as ``User.save`` stores it"""
+    address = str(address).strip()
+    return address.lower() if channel == "email" else address
+
+
+def code_digest(user, channel, address, code):
+    """HMAC of a code, bound to its user, channel and the address it was
+    sent to, so a stored digest cannot be replayed for anyone or anything
+    else"""
+    message = f"{user.pk}:{channel}:{normalize_address(channel, address)}:{code}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+class DatabaseStore:
+    """Codes in their own table, one row per user and channel, so lookups go
+    through a unique index"""
+
+    def save(self, user, channel, digest, ttl):
+        VerificationCode.objects.update_or_create(
+            user=user,
+            channel=channel,
+            defaults={
+                "digest": digest,
+                "attempts": 0,
+                "expires_at": timezone.now() + timedelta(seconds=ttl),
+            },
+        )
+
+    def check(self, user, channel, digest, max_attempts):
+        codes = VerificationCode.objects.filter(user=user, channel=channel)
+        # Count the attempt before comparing so concurrent guesses cannot
+        # exceed the limit
+        counted = codes.filter(
+            attempts__lt=max_attempts, expires_at__gt=timezone.now()
+        ).update(attempts=F("attempts") + 1)
+        if not counted:
+            return False
+        stored = codes.values_list("digest", flat=True).first()
+        if stored is None or not hmac.compare_digest(stored, digest):
+            return False
+        # Only one of several concurrent correct submissions consumes it
+        deleted, _ = codes.filter(digest=stored).delete()
+        return deleted > 0
+
+
+class RedisStore:
+    """Codes as hashes expiring with their TTL, so nothing needs sweeping"""
+
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.check_script = self.client.register_script(CHECK_SCRIPT)
+
+    def code_key(self, user, channel):
+        return f"verification:code:{user.pk}:{channel}"
+
+    def save(self, user, channel, digest, ttl):
+        key = self.code_key(user, channel)
+        pipeline = self.client.pipeline()
+        pipeline.delete(key)
+        pipeline.hset(key, mapping={"digest": digest, "attempts": 0})
+        pipeline.expire(key, ttl)
+        pipeline.execute()
+
+    def check(self, user, channel, digest, max_attempts):
+        key = self.code_key(user, channel)
+        found = self.check_script(keys=[key])
+        if not found:
+            return False
+        stored, attempts = found
+        if attempts > max_attempts:
+            self.client.delete(key)
+            return False
+        if not hmac.compare_digest(stored.decode(), digest):
+            return False
+        # Only one of several concurrent correct submissions consumes it
+        return self.client.delete(key) > 0
+
+
+_store = None
+
+
+def get_store():
+    """Redis when ``VERIFICATION_REDIS_URL`` is set, the database otherwise"""
+    global _store
+    if _store is None:
+        if settings.VERIFICATION_REDIS_URL:
+            _store = RedisStore(settings.VERIFICATION_REDIS_URL)
+        else:
+            _store = DatabaseStore()
+    return _store
+
+
+def issue_code(user, channel, address):
+    """Create a code for ``user`` on ``channel`` ("email" or "mobile") sent
+    to ``address``, replacing any outstanding one, and return it for
+    sending. The address need not be the user's yet; it only matches once
+    verified."""
+    code = generate_otp()
+    get_store().save(
+        user,
+        channel,
+        code_digest(user, channel, address, code),
+        settings.VERIFICATION_CODE_TTL,
+    )
+    return code
+
+
+def verify_code(user, channel, address, code):
+    """Whether ``code`` is the outstanding code for ``user`` on ``channel``
+    and was sent to ``address``; a matching code is consumed. After
+    ``VERIFICATION_MAX_ATTEMPTS`` wrong guesses the code stops matching and
+    a new one must be requested."""
+    return get_store().check(
+        user,
+        channel,
+        code_digest(user, channel, address, str(code).strip()),
+        settings.VERIFICATION_MAX_ATTEMPTS,
+    )